@@ -0,0 +1,135 @@
+"""
+Benchmark modeli rdzenia: pamięć na obiekt i czas tworzenia Message/Event/TraceEvent
+vs. poprzednia wersja (frozen dataclass z __dict__ i now_iso() przy każdym tworzeniu),
+oraz koszt dopisania correlation_id (przebudowa z kopią meta vs. with_correlation_id).
+
+Uruchomienie (z katalogu repo):
+    PYTHONPATH=src python benchmarks/bench_models.py [--count 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from organizer.core.trace import TraceEvent
+from organizer.core.types import Event, Message, now_iso
+
+
+# ---------- poprzednie modele (odtworzone do porównania) ----------
+
+@dataclass(frozen=True)
+class LegacyMessage:
+    sender: str
+    content: str
+    role: str = "agent"
+    meta: Dict[str, Any] = field(default_factory=dict)
+    timestamp: str = field(default_factory=now_iso)
+    correlation_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class LegacyEvent:
+    type: str
+    actor: str
+    target: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: str = field(default_factory=now_iso)
+    correlation_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class LegacyTraceEvent:
+    actor: str
+    action: str
+    target: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    outcome: str = "ok"
+    error: Optional[str] = None
+    timestamp: str = field(default_factory=now_iso)
+    correlation_id: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+CASES: dict[str, tuple[Callable[[], Any], Callable[[], Any]]] = {
+    "Message": (
+        lambda: LegacyMessage(sender="user", content="plan w Krakowie", correlation_id="CID-1"),
+        lambda: Message(sender="user", content="plan w Krakowie", correlation_id="CID-1"),
+    ),
+    "Event": (
+        lambda: LegacyEvent(type="tool_call", actor="weather", target="open_meteo", correlation_id="CID-1"),
+        lambda: Event(type="tool_call", actor="weather", target="open_meteo", correlation_id="CID-1"),
+    ),
+    "TraceEvent": (
+        lambda: LegacyTraceEvent(actor="weather", action="tool_call", target="open_meteo", outcome="success"),
+        lambda: TraceEvent(actor="weather", action="tool_call", target="open_meteo", outcome="success"),
+    ),
+}
+
+
+_META = {"source": "cli", "lang": "pl", "session": "S-1"}
+_LEGACY_MSG = LegacyMessage(sender="user", content="plan w Krakowie", meta=dict(_META))
+_MSG = Message(sender="user", content="plan w Krakowie", meta=_META)
+
+# jak dawniej Orchestrator._begin_turn/_normalize_agent_output: nowy obiekt + dict(meta)
+PROPAGATION: tuple[Callable[[], Any], Callable[[], Any]] = (
+    lambda: LegacyMessage(
+        sender=_LEGACY_MSG.sender,
+        content=_LEGACY_MSG.content,
+        role=_LEGACY_MSG.role,
+        meta=dict(_LEGACY_MSG.meta),
+        timestamp=_LEGACY_MSG.timestamp,
+        correlation_id="CID-1",
+    ),
+    lambda: _MSG.with_correlation_id("CID-1"),
+)
+
+
+def bytes_per_object(factory: Callable[[], Any], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # lista "keep" to 8 B/wskaźnik — odejmujemy, żeby liczyć tylko obiekty
+    per_object = (after - before) / count - 8
+    del keep
+    return per_object
+
+
+def ns_per_object(factory: Callable[[], Any], count: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            factory()
+        best = min(best, (time.perf_counter_ns() - start) / count)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'model':<12} {'legacy B':>9} {'slots B':>9} {'legacy ns':>10} {'slots ns':>10}")
+    for name, (legacy, current) in CASES.items():
+        print(
+            f"{name:<12} "
+            f"{bytes_per_object(legacy, args.count):>9.0f} {bytes_per_object(current, args.count):>9.0f} "
+            f"{ns_per_object(legacy, args.count):>10.0f} {ns_per_object(current, args.count):>10.0f}"
+        )
+    legacy, current = PROPAGATION
+    print(
+        f"{'+cid':<12} "
+        f"{bytes_per_object(legacy, args.count):>9.0f} {bytes_per_object(current, args.count):>9.0f} "
+        f"{ns_per_object(legacy, args.count):>10.0f} {ns_per_object(current, args.count):>10.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,37 @@
 from __future__ import annotations
 
-import os
 from organizer.core.agent import Agent
 from organizer.core.types import Message
+from organizer.tools.real.llm_client import LlmClient, shared_llm
 
 
 class OpenAIAgent(Agent):
     """
     Agent oparty o OpenAI API.
     Opcjonalny: jeśli brak OPENAI_API_KEY → rzuca czytelny błąd.
+    llm: klient LLM (None -> procesowy shared_llm(), wspólna pula połączeń i limit równoległości).
     """
 
-    def __init__(self, model: str = "gpt-4o-mini", name: str = "llm"):
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        name: str = "llm",
+        *,
+        timeout_seconds: float = 30.0,
+        llm: LlmClient | None = None,
+    ):
         super().__init__(name=name)
         self._model = model
+        self._timeout = timeout_seconds
+        self._llm = llm
 
     def handle(self, message: Message) -> Message:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY not set")
-
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-
-        completion = client.chat.completions.create(
+        completion = (self._llm or shared_llm()).complete(
             model=self._model,
             messages=[
                 {"role": "system", "content": "You are a helpful travel and planning assistant."},
                 {"role": "user", "content": message.content},
             ],
+            timeout_seconds=self._timeout,
         )
-
-        text = completion.choices[0].message.content
-        return Message(sender=self.name, content=text)
+        return Message(sender=self.name, content=completion.content)
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Optional
+import time
+from concurrent.futures import Future
+from typing import Any, Iterable, Iterator, Optional
 
 from organizer.core.agent import Agent
+from organizer.core.concurrency import submit
+from organizer.core.deadline import remaining_seconds
+from organizer.core.prefetch import PlannedToolCall, ToolPrefetch
 from organizer.core.tool import Tool
-from organizer.core.types import Message
+from organizer.core.types import AgentResult, Event, Message
 from organizer.core.preferences import Preferences
 
 
@@ -23,10 +28,13 @@ def _parse_hour(hhmm: str) -> int:
 class PlannerAgent(Agent):
     """
     Agent planista:
-    - pobiera pogodę i listę eventów przez narzędzia (toole),
+    - pobiera pogodę i listę eventów przez narzędzia (toole) — obie gałęzie współbieżnie,
     - wybiera 2–4 punkty (heurystyka),
     - układa prostą oś czasu,
     - unika nakładania się eventów.
+
+    Jeśli events_tool ma iter_events() (np. TicketmasterEventsTool), eventy są czytane
+    strumieniowo w kolejności startu i planista przestaje pobierać strony, gdy ma max_items punktów.
     """
 
     def __init__(
@@ -41,25 +49,88 @@ class PlannerAgent(Agent):
         self._weather_tool = weather_tool
         self._events_tool = events_tool
         self._prefs = preferences or Preferences()
+        self._events_stream = getattr(events_tool, "iter_events", None)
+
+    def prefetch_plan(self, message: Message) -> dict[str, PlannedToolCall]:
+        """
+        Wywołania narzędzi tej rundy (sloty zgodne z CoordinatorDecision.needed_tools).
+        Orchestrator może je wystartować z wyprzedzeniem; handle() użyje wtedy gotowych wyników.
+        Strumieniowych eventów nie prefetchujemy: pierwsza strona i tak startuje na początku handle().
+        """
+        city, date = self._inputs(message)
+        plan = {"weather_tool": PlannedToolCall(self._weather_tool, {"location": city, "date": date})}
+        if self._events_stream is None:
+            plan["events_tool"] = self._events_call(city, date)
+        return plan
+
+    def handle(self, message: Message, *, prefetch: ToolPrefetch | None = None) -> AgentResult:
+        city, date = self._inputs(message)
+        calls = self.prefetch_plan(message)
+
+        # strumień startuje przed fan-outem: pierwsza strona leci równolegle z pogodą
+        stream: _Stream | None = None
+        if self._events_stream is not None:
+            events_call = self._events_call(city, date)
+            stream = _Stream(events_call, self._events_stream(**dict(events_call.params)))
+
+        # strumień zamykamy także przy wyjątku/timeoucie pogody (inaczej prefetch strony wisi)
+        try:
+            # fan-out: pogoda i eventy idą równolegle (koszt rundy = max, nie suma)
+            branches = self._fan_out(calls, prefetch or ToolPrefetch.empty())
+
+            # czekamy najwyżej do końca budżetu rundy (None = bez deadline'u)
+            weather: dict[str, Any] = branches["weather_tool"].future.result(timeout=remaining_seconds())
+            rainy = int(weather.get("precip_prob", 0)) > 60
+
+            if stream is None:
+                events_payload: dict[str, Any] = branches["events_tool"].future.result(timeout=remaining_seconds())
+                events: list[dict[str, Any]] = list(events_payload.get("events", []))
+
+                # 1) Filtr: przy deszczu bierzemy tylko indoor
+                if rainy:
+                    events = [e for e in events if e.get("indoor") is True]
+
+                # 2) Sortujemy po godzinie startu
+                events.sort(key=lambda e: _parse_hour(e["start"]))
+
+                # 3) Wybór bez nakładania (greedy)
+                chosen = self._choose(events)
+                timing_events = [b.to_event(actor=self.name) for b in branches.values()]
+            else:
+                # eventy przychodzą już posortowane po starcie; przerywamy po max_items
+                chosen = self._choose(e for e in stream if not rainy or e.get("indoor") is True)
+                stream.close()
+                timing_events = [b.to_event(actor=self.name) for b in branches.values()]
+                timing_events.append(stream.to_event(actor=self.name))
+        finally:
+            if stream is not None:
+                stream.close()
 
-    def handle(self, message: Message) -> Message:
-        city = _extract_city(message.content) or "Warszawa"
-        date = "tomorrow"  # na razie stałe; później dodamy parser dat/czasu
+        # Heurystyka “2–4”: jeśli mamy >=2, super; jeśli mniej, zwracamy ile jest.
+        if not chosen:
+            content = (
+                f"Nie znalazłem sensownego planu dla {city} ({date}). "
+                f"Pogoda: {weather.get('summary','?')}."
+            )
+            return AgentResult(message=Message(sender=self.name, content=content), events=timing_events)
 
-        weather: dict[str, Any] = self._weather_tool(location=city, date=date)
-        events_payload: dict[str, Any] = self._events_tool(city=city, date=date, category=self._prefs.category)
-        events: list[dict[str, Any]] = list(events_payload.get("events", []))
+        # Budujemy odpowiedź “dla człowieka”
+        lines = []
+        lines.append(f"Plan dla {city} ({date})")
+        lines.append(f"Pogoda: {weather.get('summary','?')}, {weather.get('temp_c','?')}°C, opady {weather.get('precip_prob','?')}%")
+        if weather.get("best_window"):
+            lines.append(f"Najmniej deszczowe okno: {weather['best_window']}")
+        lines.append("Oś czasu:")
 
-        rainy = int(weather.get("precip_prob", 0)) > 60
+        for e in chosen:
+            lines.append(f"- {e['start']} — {e['title']} ({'indoor' if e.get('indoor') else 'outdoor'}, {e.get('price_pln','?')} PLN)")
 
-        # 1) Filtr: przy deszczu bierzemy tylko indoor
         if rainy:
-            events = [e for e in events if e.get("indoor") is True]
+            lines.append("Uwzględniłem tylko wydarzenia indoor, bo wygląda na deszcz.")
 
-        # 2) Sortujemy po godzinie startu
-        events.sort(key=lambda e: _parse_hour(e["start"]))
+        return AgentResult(message=Message(sender=self.name, content="\n".join(lines)), events=timing_events)
 
-        # 3) Wybór bez nakładania (greedy)
+    def _choose(self, events: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
         chosen: list[dict[str, Any]] = []
         last_end_hour: Optional[int] = None
 
@@ -73,26 +144,104 @@ class PlannerAgent(Agent):
 
             if len(chosen) >= self._prefs.max_items:
                 break
+        return chosen
+
+    def _events_call(self, city: str, date: str) -> PlannedToolCall:
+        return PlannedToolCall(self._events_tool, {"city": city, "date": date, "category": self._prefs.category})
+
+    @staticmethod
+    def _fan_out(calls: dict[str, PlannedToolCall], prefetch: ToolPrefetch) -> dict[str, "_Branch"]:
+        started = time.perf_counter()
+        branches: dict[str, _Branch] = {}
+        for slot, call in calls.items():
+            fut = prefetch.future(slot, call)
+            prefetched = fut is not None
+            if fut is None:
+                fut = submit(call.tool, **dict(call.params))
+            branches[slot] = _Branch(slot=slot, call=call, future=fut, prefetched=prefetched, started=started)
+        return branches
+
+    @staticmethod
+    def _inputs(message: Message) -> tuple[str, str]:
+        city = _extract_city(message.content) or "Warszawa"
+        date = "tomorrow"  # na razie stałe; później dodamy parser dat/czasu
+        return city, date
 
-        # Heurystyka “2–4”: jeśli mamy >=2, super; jeśli mniej, zwracamy ile jest.
-        if not chosen:
-            content = (
-                f"Nie znalazłem sensownego planu dla {city} ({date}). "
-                f"Pogoda: {weather.get('summary','?')}."
-            )
-            return Message(sender=self.name, content=content)
-
-        # Budujemy odpowiedź “dla człowieka”
-        lines = []
-        lines.append(f"Plan dla {city} ({date})")
-        lines.append(f"Pogoda: {weather.get('summary','?')}, {weather.get('temp_c','?')}°C, opady {weather.get('precip_prob','?')}%")
-        lines.append("Oś czasu:")
-
-        for e in chosen:
-            lines.append(f"- {e['start']} — {e['title']} ({'indoor' if e.get('indoor') else 'outdoor'}, {e.get('price_pln','?')} PLN)")
 
-        if rainy:
-            lines.append("Uwzględniłem tylko wydarzenia indoor, bo wygląda na deszcz.")
+class _Branch:
+    """
+    Jedna gałąź fan-outu (slot narzędzia) + pomiar czasu do jej zakończenia.
+    Dla gałęzi z prefetchu czas liczymy od startu handle() (ile agent realnie czekał).
+    """
 
-        return Message(sender=self.name, content="\n".join(lines))
+    def __init__(self, *, slot: str, call: PlannedToolCall, future: Future, prefetched: bool, started: float):
+        self.slot = slot
+        self.call = call
+        self.future = future
+        self.prefetched = prefetched
+        self._started = started
+        self._finished: float | None = None
+        future.add_done_callback(self._mark_done)
+
+    def _mark_done(self, _fut: Future) -> None:
+        self._finished = time.perf_counter()
+
+    @property
+    def elapsed_ms(self) -> float:
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return round(max(0.0, end - self._started) * 1000.0, 3)
+
+    def to_event(self, *, actor: str) -> Event:
+        return Event(
+            type="tool_call",
+            actor=actor,
+            target=self.call.tool_name,
+            data={
+                "slot": self.slot,
+                "params": dict(self.call.params),
+                "elapsed_ms": self.elapsed_ms,
+                "prefetched": self.prefetched,
+            },
+        )
+
+
+class _Stream:
+    """
+    Strumień eventów (iter_events) + pomiar: ile eventów przeczytano i ile trwało czytanie.
+    """
 
+    def __init__(self, call: PlannedToolCall, events: Iterator[dict[str, Any]]):
+        self.call = call
+        self._events = events
+        self._started = time.perf_counter()
+        self._finished: float | None = None
+        self.seen = 0
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for e in self._events:
+            self.seen += 1
+            yield e
+
+    def close(self) -> None:
+        if self._finished is not None:
+            return
+        close = getattr(self._events, "close", None)
+        if close is not None:
+            close()  # anuluje prefetch kolejnej strony
+        self._finished = time.perf_counter()
+
+    def to_event(self, *, actor: str) -> Event:
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return Event(
+            type="tool_call",
+            actor=actor,
+            target=self.call.tool_name,
+            data={
+                "slot": "events_tool",
+                "params": dict(self.call.params),
+                "elapsed_ms": round(max(0.0, end - self._started) * 1000.0, 3),
+                "prefetched": False,
+                "streamed": True,
+                "events_seen": self.seen,
+            },
+        )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Mapping
 
 from organizer.core.errors import ToolError
@@ -9,6 +9,11 @@ from organizer.core.fixplan import FixPlan
 from organizer.core.task import Task
 from organizer.tools.real.openai_recovery import OpenAIRecoveryTool
 
+# provider -> narzędzie zapasowe (reszta: "fallback_<provider>")
+DEFAULT_FALLBACK_TOOLS: dict[str, str] = {
+    "open_meteo_geocoding": "fallback_geocoder",
+}
+
 
 @dataclass(frozen=True)
 class RecoveryAgent:
@@ -21,8 +26,26 @@ class RecoveryAgent:
     """
     name: str = "recovery"
     llm_recovery_tool: OpenAIRecoveryTool | None = None
+    fallback_tools: Mapping[str, str] = field(default_factory=lambda: dict(DEFAULT_FALLBACK_TOOLS))
 
     def propose_fix(self, *, error: ToolError, last_task: Task, last_inputs: Mapping[str, Any]) -> FixPlan:
+        # 0) Budżet ponowień providera wyczerpany -> nie dokładamy ruchu (ani retry, ani LLM)
+        if error.type == "RETRY_BUDGET_EXHAUSTED":
+            return FixPlan(
+                action="fail",
+                reason="Retry budget for this provider is exhausted; not retrying.",
+                params_patch=None,
+            )
+
+        # 0.1) Otwarty circuit breaker -> provider leży, od razu narzędzie zapasowe
+        if error.type == "CIRCUIT_OPEN":
+            return FixPlan(
+                action="fallback_tool",
+                reason="Circuit breaker is open for this provider; use fallback tool.",
+                fallback_tool_name=self.fallback_tool_for(error.provider),
+                params_patch=dict(last_inputs),
+            )
+
         # 1) Typowe przypadki "no results" (np. geocoding)
         if self._looks_like_no_results(error):
             patch: dict[str, Any] = {}
@@ -77,6 +100,9 @@ class RecoveryAgent:
         )
         return self._maybe_llm(plan=plan, error=error, last_task=last_task, last_inputs=last_inputs)
 
+    def fallback_tool_for(self, provider: str) -> str:
+        return self.fallback_tools.get(provider, f"fallback_{provider}")
+
     def _maybe_llm(self, *, plan: FixPlan, error: ToolError, last_task: Task, last_inputs: Mapping[str, Any]) -> FixPlan:
         if plan.action not in {"fail", "fallback_tool"}:
             return plan
@@ -2,6 +2,7 @@ import re
 from typing import Optional
 
 from organizer.core.agent import Agent
+from organizer.core.prefetch import PlannedToolCall, ToolPrefetch
 from organizer.core.types import Message
 from organizer.core.tool import Tool
 
@@ -16,11 +17,15 @@ class StayAgent(Agent):
         super().__init__(name=name)
         self._tool = tool
 
-    def handle(self, message: Message) -> Message:
+    def prefetch_plan(self, message: Message) -> dict[str, PlannedToolCall]:
         city = _extract_city(message.content) or "Kraków"
         checkin, checkout = "2026-01-10", "2026-01-12"
+        params = {"city": city, "checkin": checkin, "checkout": checkout, "budget_pln_per_night": 300}
+        return {"housing_tool": PlannedToolCall(self._tool, params)}
 
-        data = self._tool(city=city, checkin=checkin, checkout=checkout, budget_pln_per_night=300)
+    def handle(self, message: Message, *, prefetch: ToolPrefetch | None = None) -> Message:
+        call = self.prefetch_plan(message)["housing_tool"]
+        data = (prefetch or ToolPrefetch.empty()).result("housing_tool", call)
         stays = data["stays"]
 
         top = stays[0]
@@ -2,6 +2,7 @@ import re
 from typing import Optional
 
 from organizer.core.agent import Agent
+from organizer.core.prefetch import PlannedToolCall, ToolPrefetch
 from organizer.core.types import Message
 from organizer.core.tool import Tool
 
@@ -21,23 +22,51 @@ class WeatherAgent(Agent):
         self._tool = tool
         self._city_normalizer = city_normalizer
 
-    def handle(self, message: Message) -> Message:
-        raw_location = _extract_location(message.content) or "Warszawa"
+    def prefetch_plan(self, message: Message) -> dict[str, PlannedToolCall]:
+        raw_location = self._raw_location(message)
+        if self._city_normalizer is None:
+            return {"weather_tool": self._weather_call(raw_location)}
 
-        # Jeśli mamy normalizator (np. OpenAI) → zamień na mianownik
+        # z normalizatorem lokalizacja znana jest dopiero po jego wywołaniu -> prefetch tylko,
+        # gdy normalizator rozpozna ją lokalnie (resolve_local: bez sieci, mikrosekundy)
+        resolve_local = getattr(self._city_normalizer, "resolve_local", None)
+        place = resolve_local(raw_location) if resolve_local is not None else None
+        if place is None:
+            return {}
+        return {"weather_tool": self._weather_call(place.name)}
+
+    def handle(self, message: Message, *, prefetch: ToolPrefetch | None = None) -> Message:
+        raw_location = self._raw_location(message)
+
+        # Jeśli mamy normalizator (lokalny albo OpenAI) → zamień na mianownik
         if self._city_normalizer is not None:
             norm = self._city_normalizer(text=raw_location)
             location = norm.get("nominative", raw_location)
         else:
             location = raw_location
 
-        date = "tomorrow"
-        data = self._tool(location=location, date=date)
+        data = (prefetch or ToolPrefetch.empty()).result("weather_tool", self._weather_call(location))
 
         content = (
             f"Pogoda dla {data['location']} ({data['date']}): "
             f"{data['summary']}, {data['temp_c']}°C, "
             f"opady: {data['precip_prob']}%."
         )
+        # realne narzędzie (HourlySeries) daje też zakres dnia i najlepsze okno
+        if "temp_min_c" in data and "temp_max_c" in data:
+            content += f" W ciągu dnia {data['temp_min_c']}–{data['temp_max_c']}°C"
+            if "precip_max" in data:
+                content += f", opady maks. {data['precip_max']}%"
+            content += "."
+        if data.get("best_window"):
+            content += f" Najlepsze okno na wyjście: {data['best_window']}."
 
         return Message(sender=self.name, content=content)
+
+    @staticmethod
+    def _raw_location(message: Message) -> str:
+        return _extract_location(message.content) or "Warszawa"
+
+    def _weather_call(self, location: str) -> PlannedToolCall:
+        date = "tomorrow"
+        return PlannedToolCall(self._tool, {"location": location, "date": date})
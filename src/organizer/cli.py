@@ -6,25 +6,66 @@ from organizer.core.types import Message
 from organizer.core import AgentRegistry, Orchestrator, RoutingRule
 from organizer.agents import WeatherAgent, StayAgent, PlannerAgent, CoordinatorAgent
 from organizer.tools.fake_apis import FakeWeatherAPI, FakeEventsAPI, FakeHousingAPI
+from organizer.core.concurrency import shutdown_shared_executor
 from organizer.core.history_logger import HistoryLogger
+from organizer.core.session import SessionManager
+from organizer.core.singleflight import CoalescedTool
+from organizer.core.tool_cache import CachedTool, ToolResultCache
 from organizer.core.trace_logger import write_trace_jsonl
 
 
-def build_orchestrator(*, use_llm: bool = False, use_real_apis: bool = False):
+# budżet czasu jednej rundy w CLI (koordynator + agent + narzędzia)
+TURN_SLO_SECONDS = 20.0
+
+
+def build_registry(
+    *,
+    use_llm: bool = False,
+    use_real_apis: bool = False,
+    tool_cache: ToolResultCache | None = None,
+) -> tuple[AgentRegistry, list[RoutingRule]]:
+    """
+    Składa współdzielone elementy systemu: registry (agenci + narzędzia) i legacy routing rules.
+    tool_cache: jeśli podany, narzędzia są opakowane w CachedTool (wspólny cache wyników).
+    """
     registry = AgentRegistry()
 
     # 1) Wybór narzędzi (FAKE vs REAL)
+    city_normalizer = None
     if use_real_apis:
-        from organizer.tools.real.open_meteo import OpenMeteoWeatherTool
-        weather_tool = OpenMeteoWeatherTool()
+        from organizer.tools.real.forecast_cache import ForecastCache
+        from organizer.tools.offline_geocoder import OfflineGeocoderTool
+        from organizer.tools.real.open_meteo import OpenMeteoGeocodingTool, OpenMeteoWeatherTool
+        # polskie miasta geokodujemy lokalnie (gazetteer); Open-Meteo tylko dla miejsc spoza niego
+        geocoding = OfflineGeocoderTool(name="offline_geocoder", fallback=OpenMeteoGeocodingTool())
+        # CoalescedTool: wiele sesji pytających naraz o to samo miasto -> jedno wywołanie Open-Meteo;
+        # with_batching: różne miasta w tym samym oknie kilku ms -> jedno żądanie forecast
+        weather_tool = CoalescedTool(
+            OpenMeteoWeatherTool(
+                geocoding=geocoding, geocode_cache=build_geocode_cache(), forecast_cache=ForecastCache()
+            ).with_batching()
+        )
+        # geokoder potrzebuje mianownika ("Krakowie" -> "Kraków"): najpierw lokalnie, LLM tylko dla nieznanych form
+        from organizer.tools.city_normalizer import LocalCityNormalizerTool
+        fallback = None
+        if use_llm:
+            from organizer.tools.real.openai_city_normalizer import OpenAICityNormalizerTool
+            # równoległe sesje z nieznanymi formami -> jedno zapytanie do LLM
+            fallback = OpenAICityNormalizerTool().with_batching()
+        city_normalizer = LocalCityNormalizerTool(fallback=fallback)
     else:
         weather_tool = FakeWeatherAPI()
 
     events_tool = FakeEventsAPI()
     housing_tool = FakeHousingAPI()
 
+    if tool_cache is not None:
+        weather_tool = CachedTool(weather_tool, tool_cache)
+        events_tool = CachedTool(events_tool, tool_cache)
+        housing_tool = CachedTool(housing_tool, tool_cache)
+
     # 2) Agenci (workers)
-    registry.register(WeatherAgent(tool=weather_tool))
+    registry.register(WeatherAgent(tool=weather_tool, city_normalizer=city_normalizer))
     registry.register(StayAgent(tool=housing_tool))
 
     # PlannerAgent wymaga keyword-only: events_tool ORAZ weather_tool
@@ -47,12 +88,83 @@ def build_orchestrator(*, use_llm: bool = False, use_real_apis: bool = False):
         RoutingRule("plan", "planner"),
         RoutingRule("zaplanuj", "planner"),
     ]
+    return registry, rules
+
+
+def build_geocode_cache(history_dir: Path = Path("history")):
+    """
+    Trwały cache geokodowania (history/geocode_cache.sqlite3), rozgrzany z history/*.jsonl.
+    """
+    from organizer.tools.real.geocoding_cache import GeocodingCache
+
+    cache = GeocodingCache(history_dir / "geocode_cache.sqlite3")
+    cache.preload_jsonl(*sorted(history_dir.glob("*.jsonl")))
+    return cache
+
+
+def build_llm_cache(history_dir: Path = Path("history")):
+    """
+    Trwały cache odpowiedzi LLM (history/llm_cache.sqlite3) dla deterministycznych zapytań.
+    """
+    from organizer.tools.real.llm_cache import LlmResponseCache
+
+    return LlmResponseCache(history_dir / "llm_cache.sqlite3")
+
+
+def build_tool_cache() -> ToolResultCache:
+    """
+    Domyślny cache wyników narzędzi: pogoda 10 min, wydarzenia/noclegi 5 min,
+    do 1 min po wygaśnięciu oddajemy starą wartość i odświeżamy w tle.
+    """
+    return ToolResultCache(
+        default_ttl_seconds=300,
+        ttl_seconds={
+            "open_meteo_weather": 600,
+            "fake_weather_api": 600,
+        },
+        stale_seconds=60,
+        max_entries=2048,
+    )
+
+
+def build_orchestrator(
+    *,
+    use_llm: bool = False,
+    use_real_apis: bool = False,
+    tool_cache: ToolResultCache | None = None,
+    turn_timeout_seconds: float | None = None,
+):
+    registry, rules = build_registry(use_llm=use_llm, use_real_apis=use_real_apis, tool_cache=tool_cache)
 
     # Od iteracji 16: routing robi CoordinatorAgent (nie Orchestrator)
     return Orchestrator(
         registry,
         rules,  # legacy fallback
         coordinator_name="coordinator",
+        turn_timeout_seconds=turn_timeout_seconds,
+    )
+
+
+def build_session_manager(
+    *,
+    use_llm: bool = False,
+    use_real_apis: bool = False,
+    max_sessions: int = 10_000,
+    idle_timeout_seconds: float | None = 30 * 60,
+    tool_cache: ToolResultCache | None = None,
+    turn_timeout_seconds: float | None = None,
+) -> SessionManager:
+    """
+    Wariant dla procesu serwerowego: jedno registry (agenci + narzędzia) dla wielu użytkowników.
+    """
+    registry, rules = build_registry(use_llm=use_llm, use_real_apis=use_real_apis, tool_cache=tool_cache)
+    return SessionManager(
+        registry,
+        rules,
+        coordinator_name="coordinator",
+        max_sessions=max_sessions,
+        idle_timeout_seconds=idle_timeout_seconds,
+        turn_timeout_seconds=turn_timeout_seconds,
     )
 
 
@@ -61,7 +173,15 @@ def run_cli():
     print("Multi-Agent Organizer (CLI)")
     print("Napisz 'exit' aby zakończyć.\n")
 
-    orch = build_orchestrator(use_llm=True, use_real_apis=True)
+    from organizer.tools.real.llm_client import configure_shared_llm
+    configure_shared_llm(cache=build_llm_cache())
+
+    orch = build_orchestrator(
+        use_llm=True,
+        use_real_apis=True,
+        tool_cache=build_tool_cache(),
+        turn_timeout_seconds=TURN_SLO_SECONDS,
+    )
 
     logger = HistoryLogger.create_default()
     print(f"(log) zapisuję historię do: {logger.file_path}\n")
@@ -70,23 +190,37 @@ def run_cli():
         f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
     )
 
-    while True:
-        user_input = input("> ").strip()
-        if user_input.lower() in {"exit", "quit"}:
-            break
+    try:
+        while True:
+            user_input = input("> ").strip()
+            if user_input.lower() in {"exit", "quit"}:
+                break
+
+            try:
+                user_msg = Message(sender="user", content=user_input)
+                logger.append(user_msg)
+
+                reply = orch.handle_user_text(user_input)
+                logger.append(reply)
 
-        try:
-            user_msg = Message(sender="user", content=user_input)
-            logger.append(user_msg)
+                write_trace_jsonl(orch.team_conversation, trace_path)
 
-            reply = orch.handle_user_text(user_input)
-            logger.append(reply)
+                print(f"\n[{reply.sender}] {reply.content}\n")
 
-            write_trace_jsonl(orch.team_conversation, trace_path)
+            except Exception as e:
+                err_msg = Message(sender="error", content=str(e))
+                logger.append(err_msg)
+                print(f"\n[error] {e}\n")
+    finally:
+        shutdown()
 
-            print(f"\n[{reply.sender}] {reply.content}\n")
 
-        except Exception as e:
-            err_msg = Message(sender="error", content=str(e))
-            logger.append(err_msg)
-            print(f"\n[error] {e}\n")
+def shutdown() -> None:
+    """
+    Hook zamknięcia procesu (CLI/serwer): zamyka pulę HTTP, klienta LLM i współdzieloną pulę wątków.
+    """
+    from organizer.tools.real.http import close_shared_http
+    from organizer.tools.real.llm_client import close_shared_llm
+    close_shared_http()
+    close_shared_llm()
+    shutdown_shared_executor()
@@ -1,14 +1,22 @@
 from .hello import say_hello
 from .types import Message, ToolResult
-from .agent import Agent
+from .agent import Agent, AsyncAgent
 from .registry import AgentRegistry
 from .orchestrator import Orchestrator, RoutingRule
+from .session import SessionManager
 from .preferences import Preferences
 from .preferences_store import PreferencesStore
 from .errors import ToolError
 from .trace import TraceEvent
-from .tool_runner import call_tool_with_trace
-from .retry import RetryPolicy, RetryExceededError, call_tool_with_retry
+from .stack_traces import StackTraceStore, stack_trace_of
+from .tool_runner import call_tool_with_trace, call_tool_with_trace_async
+from .tool_cache import CachedTool, ToolResultCache
+from .singleflight import SingleFlight, CoalescedTool
+from .circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitBreakerRegistry
+from .rate_limit import RateLimiter, RateLimitConfig, RateLimiterRegistry, RateLimitExceeded
+from .retry import RetryPolicy, RetryBudget, RetryExceededError, call_tool_with_retry
+from .hedging import Hedger, HedgePolicy, call_tool_with_hedging, call_tool_with_hedging_async
+from .batching import MicroBatcher
 from .task import Task
 from .fixplan import FixPlan
 
@@ -17,17 +25,39 @@ __all__ = [
     "Message",
     "ToolResult",
     "Agent",
+    "AsyncAgent",
     "AgentRegistry",
     "Orchestrator",
     "RoutingRule",
+    "SessionManager",
     "Preferences",
     "PreferencesStore",
     "ToolError",
     "TraceEvent",
+    "StackTraceStore",
+    "stack_trace_of",
     "call_tool_with_trace",
+    "call_tool_with_trace_async",
+    "CachedTool",
+    "ToolResultCache",
+    "SingleFlight",
+    "CoalescedTool",
+    "CircuitBreaker",
+    "CircuitBreakerConfig",
+    "CircuitBreakerRegistry",
+    "RateLimiter",
+    "RateLimitConfig",
+    "RateLimiterRegistry",
+    "RateLimitExceeded",
     "RetryPolicy",
+    "RetryBudget",
     "RetryExceededError",
     "call_tool_with_retry",
+    "Hedger",
+    "HedgePolicy",
+    "call_tool_with_hedging",
+    "call_tool_with_hedging_async",
+    "MicroBatcher",
     "Task",
     "FixPlan",
 ]
@@ -1,5 +1,11 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
-from organizer.core.types import Message
+from typing import Any
+
+from organizer.core.types import Message, AgentOutput
 
 
 class Agent(ABC):
@@ -20,3 +26,43 @@ class Agent(ABC):
         Agent przyjmuje wiadomość i zwraca odpowiedź.
         """
         raise NotImplementedError
+
+    async def handle_async(self, message: Message, **kwargs: Any) -> AgentOutput:
+        """
+        Asynchroniczny wariant handle().
+
+        Domyślnie adapter: synchroniczne handle() idzie do wątku roboczego,
+        więc blokujące I/O agenta nie zatrzymuje pętli zdarzeń.
+        Agenci z natywnym I/O async nadpisują tę metodę (albo dziedziczą po AsyncAgent).
+        """
+        return await asyncio.to_thread(self.handle, message, **kwargs)
+
+
+class AsyncAgent(Agent):
+    """
+    Agent natywnie asynchroniczny: implementuje tylko handle_async().
+
+    handle() to adapter async -> sync dla CLI/testów bez pętli zdarzeń.
+    Uwaga: nie wołać handle() z wnętrza działającej pętli (asyncio.run tego nie pozwala).
+    """
+
+    def handle(self, message: Message, **kwargs: Any) -> AgentOutput:  # type: ignore[override]
+        return asyncio.run(self.handle_async(message, **kwargs))
+
+    @abstractmethod
+    async def handle_async(self, message: Message, **kwargs: Any) -> AgentOutput:
+        raise NotImplementedError
+
+
+async def run_agent_async(agent: Any, message: Message, **kwargs: Any) -> AgentOutput:
+    """
+    Uruchamia dowolnego agenta w trybie async.
+
+    - agent ma korutynę handle_async -> await
+    - agent ma tylko handle (duck typing, bez dziedziczenia po Agent) -> wątek roboczy
+    kwargs (np. prefetch=...) trafiają do handle/handle_async bez zmian.
+    """
+    handle_async = getattr(agent, "handle_async", None)
+    if handle_async is not None and inspect.iscoroutinefunction(handle_async):
+        return await handle_async(message, **kwargs)
+    return await asyncio.to_thread(agent.handle, message, **kwargs)
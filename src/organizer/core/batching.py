@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Callable, Hashable, Sequence
+
+BatchFn = Callable[[list[Any]], Sequence[Any]]
+SingleFn = Callable[[Any], Any]
+
+
+class _Batch:
+    __slots__ = ("items", "index", "full", "done", "results", "error")
+
+    def __init__(self) -> None:
+        self.items: list[Any] = []
+        self.index: dict[Hashable, int] = {}
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Sequence[Any] = ()
+        self.error: BaseException | None = None
+
+
+class MicroBatcher:
+    """
+    Zbiera równoległe pojedyncze żądania przez max_delay_seconds i wykonuje je jednym batch_fn.
+
+    batch_fn(items) zwraca wyniki w tej samej kolejności co items; element będący wyjątkiem
+    trafia tylko do swojego wywołującego. Gdy batch_fn rzuci (albo zwróci złą liczbę wyników),
+    każdy wywołujący pobiera swój element osobno — single_fn(item), domyślnie batch_fn([item]) —
+    więc jeden zły element albo chwilowy błąd zbiorczego żądania nie wywraca wszystkich.
+    Pierwszy wywołujący batcha (lider) czeka okno (albo do max_batch_size) i wykonuje batch
+    w swoim wątku — bez dodatkowego timera. Gdy nikt inny nie jest w trakcie call(), lider
+    nie czeka: samotne wywołanie nie płaci max_delay_seconds. Identyczne elementy w jednym
+    batchu są wysyłane raz.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        *,
+        single_fn: SingleFn | None = None,
+        max_batch_size: int = 50,
+        max_delay_seconds: float = 0.005,
+    ):
+        self._batch_fn = batch_fn
+        self._single_fn = single_fn
+        self._max_size = max(1, max_batch_size)
+        self._max_delay = max(0.0, max_delay_seconds)
+        self._lock = threading.Lock()
+        self._pending: _Batch | None = None
+        self._active = 0  # wywołujący w trakcie call() (czekający albo wykonujący batch)
+
+        self.batches = 0
+        self.items = 0
+        self.fallbacks = 0
+
+    def call(self, item: Hashable) -> Any:
+        with self._lock:
+            self._active += 1
+            batch = self._pending
+            leader = batch is None
+            if batch is None:
+                batch = self._pending = _Batch()
+            i = batch.index.get(item)
+            if i is None:
+                i = batch.index[item] = len(batch.items)
+                batch.items.append(item)
+            self.items += 1
+            if len(batch.items) >= self._max_size:
+                self._pending = None
+                batch.full.set()
+            alone = self._active == 1
+
+        try:
+            if leader:
+                if not alone:
+                    batch.full.wait(self._max_delay)
+                with self._lock:
+                    if self._pending is batch:
+                        self._pending = None
+                    self.batches += 1
+                self._run(batch)
+            else:
+                batch.done.wait()
+
+            if batch.error is not None:
+                if isinstance(batch.error, Exception) and len(batch.items) > 1:
+                    with self._lock:
+                        self.fallbacks += 1
+                    return self._call_single(item)
+                raise batch.error
+            result = batch.results[i]
+            if isinstance(result, BaseException):
+                raise result
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    async def call_async(self, item: Hashable) -> Any:
+        return await asyncio.to_thread(self.call, item)
+
+    def _call_single(self, item: Any) -> Any:
+        if self._single_fn is not None:
+            return self._single_fn(item)
+        results = list(self._batch_fn([item]))
+        if len(results) != 1:
+            raise RuntimeError(f"Batch returned {len(results)} results for 1 item")
+        if isinstance(results[0], BaseException):
+            raise results[0]
+        return results[0]
+
+    def _run(self, batch: _Batch) -> None:
+        try:
+            results = list(self._batch_fn(list(batch.items)))
+            if len(results) != len(batch.items):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(batch.items)} items")
+            batch.results = results
+        except BaseException as exc:
+            batch.error = exc
+        finally:
+            batch.done.set()
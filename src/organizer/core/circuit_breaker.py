@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Literal
+
+from organizer.core.errors import ToolError
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    """
+    Progi circuit breakera (okno = ostatnie window_size wywołań providera).
+
+    failure_rate_threshold: udział błędów w oknie, od którego otwieramy obwód
+    slow_call_seconds / slow_call_rate_threshold: udział wolnych wywołań, od którego otwieramy obwód
+    min_calls: poniżej tylu wywołań w oknie nie oceniamy (mało danych)
+    open_seconds: jak długo obwód jest otwarty, zanim wpuścimy próbę (half-open)
+    half_open_probes: ile równoległych prób w half-open; tyle samo sukcesów zamyka obwód
+    """
+    failure_rate_threshold: float = 0.5
+    slow_call_seconds: float = 5.0
+    slow_call_rate_threshold: float = 0.8
+    min_calls: int = 5
+    window_size: int = 20
+    open_seconds: float = 30.0
+    half_open_probes: int = 1
+
+
+def counts_as_failure(err: ToolError) -> bool:
+    """
+    Czy błąd świadczy o problemie providera (a nie o złym zapytaniu).
+    4xx (poza 429) to błąd wywołującego — nie otwiera obwodu.
+    """
+    if err.type == "CIRCUIT_OPEN":
+        return False
+    if err.code.isdigit():
+        status = int(err.code)
+        return status == 429 or status >= 500
+    return True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker jednego providera: closed -> open -> half_open -> closed/open.
+
+    - closed: wywołania przechodzą; po przekroczeniu progu błędów/wolnych wywołań -> open
+    - open: wywołania od razu odrzucane (bez czekania na timeout HTTP) przez open_seconds
+    - half_open: wpuszczamy half_open_probes prób; sukcesy zamykają obwód, błąd otwiera ponownie
+    """
+
+    def __init__(self, provider: str, config: CircuitBreakerConfig | None = None, *, clock: Callable[[], float] = time.monotonic):
+        self.provider = provider
+        self._config = config or CircuitBreakerConfig()
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._state: BreakerState = "closed"
+        self._opened_at = 0.0
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=max(1, self._config.window_size))  # (błąd, wolne)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def retry_in(self) -> float:
+        """
+        Sekundy do najbliższej próby (0, jeśli obwód nie jest otwarty).
+        """
+        with self._lock:
+            if self._state != "open":
+                return 0.0
+            return max(0.0, self._opened_at + self._config.open_seconds - self._clock())
+
+    def allow(self) -> bool:
+        """
+        Czy wpuścić wywołanie. Każde wpuszczone wywołanie musi zakończyć się record().
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == "closed":
+                return True
+            if self._state == "half_open" and self._probes_in_flight < self._config.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """
+        Zamyka wpuszczone wywołanie bez wyniku dla obwodu (provider nie był wołany, np. trafienie
+        w cache albo cudzy wynik single-flight) — zwalnia próbę half-open, nie zmienia stanu.
+        """
+        with self._lock:
+            if self._state == "half_open":
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record(self, *, failure: bool, elapsed_seconds: float) -> None:
+        slow = elapsed_seconds >= self._config.slow_call_seconds
+        with self._lock:
+            if self._state == "half_open":
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failure or slow:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self._config.half_open_probes:
+                    self._close()
+                return
+
+            if self._state == "open":
+                # wywołanie wpuszczone przed otwarciem — nie zmienia stanu
+                return
+
+            self._window.append((failure, slow))
+            if len(self._window) < self._config.min_calls:
+                return
+            n = len(self._window)
+            failures = sum(1 for f, _ in self._window if f)
+            slows = sum(1 for _, s in self._window if s)
+            if failures / n >= self._config.failure_rate_threshold or slows / n >= self._config.slow_call_rate_threshold:
+                self._open()
+
+    # ---------- internal ----------
+
+    def _maybe_half_open(self) -> None:
+        if self._state == "open" and self._clock() >= self._opened_at + self._config.open_seconds:
+            self._state = "half_open"
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+
+    def _open(self) -> None:
+        self._state = "open"
+        self._opened_at = self._clock()
+        self._window.clear()
+        self.opened += 1
+
+    def _close(self) -> None:
+        self._state = "closed"
+        self._window.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+
+class CircuitBreakerRegistry:
+    """
+    Breakery per provider (klucz = ToolError.provider, czyli nazwa narzędzia), tworzone leniwie.
+    """
+
+    def __init__(
+        self,
+        config: CircuitBreakerConfig | None = None,
+        *,
+        overrides: dict[str, CircuitBreakerConfig] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._config = config or CircuitBreakerConfig()
+        self._overrides = dict(overrides or {})
+        self._clock = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> CircuitBreaker:
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(provider)
+                if breaker is None:
+                    config = self._overrides.get(provider, self._config)
+                    breaker = self._breakers[provider] = CircuitBreaker(provider, config, clock=self._clock)
+        return breaker
+
+    def states(self) -> dict[str, BreakerState]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.provider: b.state for b in breakers}
+
+
+_shared: CircuitBreakerRegistry | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_circuit_breakers() -> CircuitBreakerRegistry:
+    """
+    Procesowy rejestr breakerów (wspólny dla wszystkich sesji).
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = CircuitBreakerRegistry()
+    return _shared
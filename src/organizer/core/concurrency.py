@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+_executor: ThreadPoolExecutor | None = None
+_agent_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _default_max_workers() -> int:
+    # I/O-bound (HTTP/LLM): więcej wątków niż rdzeni
+    return min(64, (os.cpu_count() or 1) * 8)
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """
+    Współdzielona (procesowa) pula wątków dla blokującego I/O narzędzi.
+    Tworzona leniwie; zamykana przez shutdown_shared_executor().
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_default_max_workers(),
+                    thread_name_prefix="organizer-io",
+                )
+    return _executor
+
+
+def agent_executor() -> ThreadPoolExecutor:
+    """
+    Osobna pula na ciała agentów/koordynatora uruchamiane z limitem czasu rundy.
+    Agent czeka na gałęzie (narzędzia) w shared_executor(); gdyby sam zajmował wątek tej puli,
+    przy pełnym obciążeniu czekałby na gałęzie stojące w kolejce za nim (zakleszczenie do timeoutu).
+    """
+    global _agent_executor
+    if _agent_executor is None:
+        with _executor_lock:
+            if _agent_executor is None:
+                _agent_executor = ThreadPoolExecutor(
+                    max_workers=_default_max_workers(),
+                    thread_name_prefix="organizer-agent",
+                )
+    return _agent_executor
+
+
+def submit(fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+    """
+    Jak executor.submit, ale z kopią contextvars wywołującego
+    (żeby kontekst rundy, np. deadline, trafiał też do wątku roboczego).
+    """
+    ctx = contextvars.copy_context()
+    return shared_executor().submit(ctx.run, fn, *args, **kwargs)
+
+
+def submit_agent(fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+    """
+    Jak submit(), ale do agent_executor() — dla kodu, który sam czeka na zadania z shared_executor().
+    """
+    ctx = contextvars.copy_context()
+    return agent_executor().submit(ctx.run, fn, *args, **kwargs)
+
+
+def shutdown_shared_executor(*, wait: bool = True) -> None:
+    """
+    Hook zamknięcia dla CLI/serwera. Kolejne submit() utworzy nową pulę.
+    """
+    global _executor, _agent_executor
+    with _executor_lock:
+        pools = (_agent_executor, _executor)
+        _agent_executor = _executor = None
+    for ex in pools:
+        if ex is not None:
+            ex.shutdown(wait=wait, cancel_futures=not wait)
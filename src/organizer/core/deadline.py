@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator
+
+from organizer.core.concurrency import submit, submit_agent
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Budżet czasu rundy (albo wywołania) się skończył.
+    Dziedziczy po TimeoutError, więc tool_runner raportuje go jako ToolError(type="TIMEOUT").
+    """
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Moment (time.monotonic), do którego musi się zakończyć bieżąca runda.
+    """
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(expires_at=time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+# contextvar: przechodzi do wątków roboczych przez concurrency.submit i do asyncio.to_thread
+_current: contextvars.ContextVar[Deadline | None] = contextvars.ContextVar("organizer_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _current.get()
+
+
+def remaining_seconds() -> float | None:
+    """
+    Pozostały budżet bieżącej rundy (None = brak deadline'u).
+    """
+    deadline = _current.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def request_timeout(default: float | None) -> float | None:
+    """
+    Timeout dla pojedynczego żądania (HTTP/LLM): mniejszy z domyślnego i pozostałego budżetu.
+    Rzuca DeadlineExceeded, jeśli budżet już się skończył.
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline exceeded before request was sent")
+    return remaining if default is None else min(default, remaining)
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[Deadline | None]:
+    """
+    Ustawia deadline za `seconds` sekund (None = bez zmian). Zagnieżdżony scope
+    nie może wydłużyć budżetu rodzica — obowiązuje wcześniejszy z deadline'ów.
+    """
+    parent = _current.get()
+    if seconds is None:
+        yield parent
+        return
+
+    deadline = Deadline.after(seconds)
+    if parent is not None and parent.expires_at < deadline.expires_at:
+        deadline = parent
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def without_deadline(fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    """
+    Wywołuje fn bez deadline'u rundy — dla pracy w tle (np. odświeżenie cache), która trwa dłużej
+    niż runda, która ją zleciła. submit() kopiuje contextvars, więc bez tego dziedziczyłaby jej deadline.
+    """
+    token = _current.set(None)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _current.reset(token)
+
+
+def effective_timeout(timeout_seconds: float | None = None) -> float | None:
+    """
+    Limit dla jednego wywołania: mniejszy z jawnego timeoutu i pozostałego budżetu rundy.
+    """
+    remaining = remaining_seconds()
+    if timeout_seconds is None:
+        return remaining
+    if remaining is None:
+        return timeout_seconds
+    return min(timeout_seconds, remaining)
+
+
+def call_with_timeout(timeout_seconds: float | None, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    """
+    Wywołuje fn z limitem czasu (None = bez limitu, wprost w bieżącym wątku).
+
+    Z limitem fn idzie do wspólnej puli; po przekroczeniu wywołujący dostaje DeadlineExceeded
+    od razu (nie czeka na fn). Wątku nie da się przerwać — jego wynik jest porzucany.
+    Dla agentów (które same zlecają narzędzia do tej puli) -> call_agent_with_timeout.
+    """
+    return _call_on(submit, timeout_seconds, fn, *args, **kwargs)
+
+
+def call_agent_with_timeout(timeout_seconds: float | None, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    """
+    call_with_timeout dla ciał agentów/koordynatora: osobna pula (concurrency.agent_executor),
+    żeby agent czekający na swoje gałęzie nie blokował wątku, którego te gałęzie potrzebują.
+    """
+    return _call_on(submit_agent, timeout_seconds, fn, *args, **kwargs)
+
+
+def _call_on(
+    submit_fn: Callable[..., concurrent.futures.Future],
+    timeout_seconds: float | None,
+    fn: Callable[..., Any],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    if timeout_seconds is None:
+        return fn(*args, **kwargs)
+    if timeout_seconds <= 0:
+        raise DeadlineExceeded("Deadline exceeded before call started")
+
+    fut = submit_fn(fn, *args, **kwargs)
+    try:
+        return fut.result(timeout=timeout_seconds)
+    except concurrent.futures.TimeoutError:
+        fut.cancel()
+        raise DeadlineExceeded(f"Call exceeded its time budget ({timeout_seconds:.3f}s)") from None
+
+
+async def await_with_timeout(timeout_seconds: float | None, awaitable: Awaitable[Any]) -> Any:
+    """
+    Async wariant call_with_timeout: po przekroczeniu korutyna jest anulowana.
+    """
+    if timeout_seconds is None:
+        return await awaitable
+    if timeout_seconds <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Deadline exceeded before call started")
+    try:
+        return await asyncio.wait_for(awaitable, timeout=timeout_seconds)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"Call exceeded its time budget ({timeout_seconds:.3f}s)") from None
@@ -16,7 +16,9 @@ class ToolError:
     request_params: parametry wywołania tool-a
     raw_response: surowa odpowiedź (opcjonalnie; np. body błędu HTTP)
     stack_trace_id: identyfikator stack trace (żeby log był krótki, a trace dało się skorelować)
-    stack_trace: pełny stack trace (opcjonalnie; do diagnozy / LLM)
+    stack_trace: pełny stack trace (opcjonalnie; tool_runner go nie wypełnia — treść leży
+        w StackTraceStore pod stack_trace_id, patrz core.stack_traces.stack_trace_of)
+    retry_after_seconds: wartość nagłówka Retry-After (HTTP 429/503), jeśli provider ją podał
     """
     code: str
     type: str
@@ -26,3 +28,4 @@ class ToolError:
     raw_response: str | None
     stack_trace_id: str
     stack_trace: str | None = None
+    retry_after_seconds: float | None = None
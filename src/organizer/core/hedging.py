@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from organizer.core.concurrency import submit
+from organizer.core.retry import RetryBudget
+from organizer.core.tool_runner import call_tool_with_trace, call_tool_with_trace_async
+from organizer.core.trace import TraceEvent
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    Kiedy wysłać duplikat wolnego wywołania (hedged request).
+
+    percentile: po jakim percentylu obserwowanej latencji providera wysyłamy duplikat (0.95 = p95)
+    min_samples: poniżej tylu pomiarów nie hedgujemy (brak wiarygodnego p95)
+    min_delay_seconds / max_delay_seconds: granice opóźnienia duplikatu
+    budget_ratio / budget_max_tokens: budżet duplikatów per provider (0.05 = ~5% wywołań)
+    window_size: ile ostatnich pomiarów latencji trzymamy per provider
+    """
+    percentile: float = 0.95
+    min_samples: int = 20
+    min_delay_seconds: float = 0.01
+    max_delay_seconds: float = 10.0
+    budget_ratio: float = 0.05
+    budget_max_tokens: float = 5.0
+    window_size: int = 200
+
+
+class LatencyTracker:
+    """
+    Okno ostatnich latencji wywołań per provider (do wyznaczania p95).
+    """
+
+    def __init__(self, window_size: int = 200):
+        self._window_size = max(1, window_size)
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(provider)
+            if samples is None:
+                samples = self._samples[provider] = deque(maxlen=self._window_size)
+            samples.append(seconds)
+
+    def count(self, provider: str) -> int:
+        with self._lock:
+            return len(self._samples.get(provider, ()))
+
+    def percentile(self, provider: str, q: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        i = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[i]
+
+
+class Hedger:
+    """
+    Stan hedgingu współdzielony przez wywołania: latencje providerów + budżet duplikatów.
+
+    Tracker dostaje latencję każdej zakończonej próby — także przegranej i nieudanej; anulowana
+    próba async zapisuje czas do anulowania (dolne ograniczenie). Same zwycięskie próby dawałyby
+    zaniżone p95 (wolny ogon zawsze przegrywa z duplikatem).
+    """
+
+    def __init__(
+        self,
+        policy: HedgePolicy | None = None,
+        *,
+        tracker: LatencyTracker | None = None,
+        budget: RetryBudget | None = None,
+    ):
+        self.policy = policy or HedgePolicy()
+        self.tracker = tracker or LatencyTracker(self.policy.window_size)
+        # ten sam token bucket co budżet retry: wywołanie dokłada ratio, duplikat zabiera 1
+        self.budget = budget or RetryBudget(
+            ratio=self.policy.budget_ratio,
+            max_tokens=self.policy.budget_max_tokens,
+            initial_tokens=1.0,
+        )
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()  # liczniki zmieniane z wielu wątków/wywołań
+
+    def _count(self, *, hedge: bool = False, win: bool = False) -> None:
+        with self._lock:
+            self.hedges += hedge
+            self.hedge_wins += win
+
+    def hedge_delay(self, provider: str) -> float | None:
+        """
+        Po ilu sekundach wysłać duplikat (None = nie hedgujemy, za mało pomiarów).
+        """
+        if self.tracker.count(provider) < self.policy.min_samples:
+            return None
+        p = self.tracker.percentile(provider, self.policy.percentile)
+        if p is None:
+            return None
+        return min(self.policy.max_delay_seconds, max(self.policy.min_delay_seconds, p))
+
+
+def _mark(trace: TraceEvent, *, attempt: int, hedge: bool, **extra: Any) -> TraceEvent:
+    return trace.replace(meta={**trace.meta, "attempt": attempt, "hedge": hedge, **extra})
+
+
+def _cancelled_trace(*, actor: str, tool_name: str, params: Mapping[str, Any], cid: str, attempt: int) -> TraceEvent:
+    # przegrany wyścigu: wynik (jeśli przyjdzie) jest odrzucany
+    return TraceEvent(
+        actor=actor,
+        action="tool_call",
+        target=tool_name,
+        params=params,
+        outcome="cancelled",
+        error=None,
+        correlation_id=cid,
+        meta={"attempt": attempt, "hedge": attempt > 1},
+    )
+
+
+def call_tool_with_hedging(
+    *,
+    tool_name: str,
+    tool_callable: Any,
+    params: Mapping[str, Any],
+    hedger: Hedger,
+    actor: str = "tool_runner",
+    correlation_id: str | None = None,
+) -> tuple[Any | None, list[TraceEvent]]:
+    """
+    Wywołanie z hedgingiem (opt-in, dla narzędzi krytycznych dla latencji).
+
+    Jeśli pierwsza próba nie skończy się w czasie p95 providera (i budżet pozwala),
+    wysyłamy duplikat i bierzemy pierwszy sukces. Każda próba ma własny TraceEvent
+    z tym samym correlation_id (meta: attempt, hedge); próba, na którą nie czekamy,
+    dostaje outcome="cancelled".
+    Zwraca (wynik albo None, lista TraceEvent w kolejności prób).
+    """
+    cid = correlation_id or uuid.uuid4().hex
+    hedger.budget.record_call(tool_name)
+
+    def attempt() -> tuple[Any | None, TraceEvent]:
+        # latencję zapisuje każda zakończona próba (także przegrana, która skończy się po zwycięzcy)
+        started = time.perf_counter()
+        result, trace = call_tool_with_trace(
+            tool_name=tool_name, tool_callable=tool_callable, params=params, actor=actor, correlation_id=cid
+        )
+        hedger.tracker.record(tool_name, time.perf_counter() - started)
+        return result, trace
+
+    futures: list[Future] = [submit(attempt)]
+    delay = hedger.hedge_delay(tool_name)
+    if delay is not None:
+        wait(futures, timeout=delay)
+        if not futures[0].done() and hedger.budget.try_acquire(tool_name):
+            hedger._count(hedge=True)
+            futures.append(submit(attempt))
+
+    traces: dict[int, TraceEvent] = {}
+    winner: tuple[int, Any] | None = None
+    pending = set(futures)
+    while pending and winner is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            i = futures.index(fut)
+            result, trace = fut.result()
+            traces[i] = _mark(trace, attempt=i + 1, hedge=i > 0)
+            if trace.succeeded and winner is None:
+                winner = (i, result)
+
+    for fut in pending:
+        fut.cancel()
+        i = futures.index(fut)
+        traces[i] = _cancelled_trace(actor=actor, tool_name=tool_name, params=params, cid=cid, attempt=i + 1)
+
+    ordered = [traces[i] for i in range(len(futures))]
+    if winner is None:
+        return None, ordered
+    if winner[0] > 0:
+        hedger._count(win=True)
+    return winner[1], ordered
+
+
+async def call_tool_with_hedging_async(
+    *,
+    tool_name: str,
+    tool_callable: Any,
+    params: Mapping[str, Any],
+    hedger: Hedger,
+    actor: str = "tool_runner",
+    correlation_id: str | None = None,
+) -> tuple[Any | None, list[TraceEvent]]:
+    """
+    Async wariant call_tool_with_hedging; przegrana próba jest anulowana (task.cancel()).
+    """
+    cid = correlation_id or uuid.uuid4().hex
+    hedger.budget.record_call(tool_name)
+
+    async def attempt() -> tuple[Any | None, TraceEvent]:
+        started = time.perf_counter()
+        try:
+            result, trace = await call_tool_with_trace_async(
+                tool_name=tool_name, tool_callable=tool_callable, params=params, actor=actor, correlation_id=cid
+            )
+        finally:
+            # także anulowana przegrana: czas do anulowania (dolne ograniczenie jej latencji)
+            hedger.tracker.record(tool_name, time.perf_counter() - started)
+        return result, trace
+
+    tasks: list[asyncio.Task] = [asyncio.ensure_future(attempt())]
+    delay = hedger.hedge_delay(tool_name)
+    if delay is not None:
+        await asyncio.wait(tasks, timeout=delay)
+        if not tasks[0].done() and hedger.budget.try_acquire(tool_name):
+            hedger._count(hedge=True)
+            tasks.append(asyncio.ensure_future(attempt()))
+
+    traces: dict[int, TraceEvent] = {}
+    winner: tuple[int, Any] | None = None
+    pending = set(tasks)
+    while pending and winner is None:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            i = tasks.index(task)
+            result, trace = task.result()
+            traces[i] = _mark(trace, attempt=i + 1, hedge=i > 0)
+            if trace.succeeded and winner is None:
+                winner = (i, result)
+
+    for task in pending:
+        task.cancel()
+        i = tasks.index(task)
+        traces[i] = _cancelled_trace(actor=actor, tool_name=tool_name, params=params, cid=cid, attempt=i + 1)
+
+    ordered = [traces[i] for i in range(len(tasks))]
+    if winner is None:
+        return None, ordered
+    if winner[0] > 0:
+        hedger._count(win=True)
+    return winner[1], ordered
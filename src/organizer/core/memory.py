@@ -88,8 +88,8 @@ class TeamMemory:
         return TeamMemoryContext(
             rolling_summary=self.summary.text,
             facts=list(self.facts),
-            scratchpad=list(self.scratchpad[-self.keep_scratchpad :]),
-            recent_events=list(recent),
+            scratchpad=self.scratchpad[-self.keep_scratchpad :],  # wycinek to już kopia
+            recent_events=recent,  # eventy są niemutowalne — współdzielone, bez kopiowania
         )
 
     # ---------- internal ----------
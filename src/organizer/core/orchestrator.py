@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 from dataclasses import dataclass
-from typing import Iterable, List, Tuple
+from typing import Any, Callable, Iterable, List, Tuple
 import uuid
 
+from organizer.core.agent import run_agent_async
+from organizer.core.deadline import (
+    DeadlineExceeded,
+    await_with_timeout,
+    call_agent_with_timeout,
+    deadline_scope,
+    remaining_seconds,
+)
+from organizer.core.tool_runner import tool_error_from_exception
 from organizer.core.registry import AgentRegistry
-from organizer.core.types import Message, AgentResult, AgentOutput, Event, now_iso
+from organizer.core.types import Message, AgentResult, AgentOutput, Event
 from organizer.core.trace import TraceEvent
 from organizer.core.memory import TeamMemory, TeamMemoryContext
 from organizer.core.decision import CoordinatorDecision
+from organizer.core.prefetch import ToolPrefetch, select_calls
 
 
 @dataclass(frozen=True)
@@ -58,10 +70,15 @@ class Orchestrator:
         summarize_every: int = 12,
         keep_recent_events: int = 20,
         keep_scratchpad: int = 12,
+        prefetch_tools: bool = True,
+        turn_timeout_seconds: float | None = None,
     ):
         self._registry = registry
         self._rules = list(rules)
         self._coordinator_name = coordinator_name
+        self._prefetch_tools = prefetch_tools
+        # SLO rundy: deadline ustawiany w handle(); koordynator, agent i narzędzia dostają resztę budżetu
+        self._turn_timeout = turn_timeout_seconds
 
         self._user_history: List[Message] = []
         self._team_conversation: List[TraceEvent] = []
@@ -99,33 +116,135 @@ class Orchestrator:
         self._team_memory.clear()
 
     def handle(self, message: Message) -> Message:
-        cid = message.correlation_id or f"CID-{uuid.uuid4().hex[:12]}"
-        user_msg = Message(
-            sender=message.sender,
-            content=message.content,
-            role=message.role,
-            meta=dict(message.meta),
-            timestamp=message.timestamp,
-            correlation_id=cid,
-        )
-        self._user_history.append(user_msg)
+        with deadline_scope(self._turn_timeout):
+            return self._handle(message)
+
+    def _handle(self, message: Message) -> Message:
+        user_msg = self._begin_turn(message)
+        cid = user_msg.correlation_id
 
         # --- coordinator decision (agent z registry albo fallback DefaultCoordinator) ---
-        team_ctx = self.team_context()
-        caps = self._registry.list_capabilities()
+        coordinator_obj, coordinator_from_registry = self._resolve_coordinator()
+        decide_fn = self._decide_fn(coordinator_obj)
+        try:
+            raw_decision = call_agent_with_timeout(remaining_seconds(), decide_fn, **self._decide_kwargs(user_msg))
+        except DeadlineExceeded as exc:
+            return self._finish_timeout(getattr(coordinator_obj, "name", self._coordinator_name), exc, cid)
+        decision = self._accept_decision(raw_decision, coordinator_obj, coordinator_from_registry, cid)
+
+        if decision.stop:
+            return self._finish_stop(coordinator_obj, cid)
+
+        # --- route ---
+        agent = self._route(decision, user_msg)
+
+        # --- prefetch: needed_tools z decyzji startują równolegle, zanim agent zacznie pracę ---
+        prefetch = self._start_prefetch(agent, decision, user_msg)
+        try:
+            if prefetch is None:
+                raw_out: AgentOutput = call_agent_with_timeout(remaining_seconds(), agent.handle, user_msg)
+            else:
+                raw_out = call_agent_with_timeout(remaining_seconds(), agent.handle, user_msg, prefetch=prefetch)
+        except DeadlineExceeded as exc:
+            return self._finish_timeout(getattr(agent, "name", agent.__class__.__name__), exc, cid)
+        finally:
+            if prefetch is not None:
+                prefetch.cancel_pending()
+        return self._finish_turn(raw_out, cid)
+
+    async def handle_async(self, message: Message) -> Message:
+        """
+        Async wariant handle(): ten sam przebieg rundy i ten sam zapis śladu,
+        ale decyzja koordynatora i praca agenta nie blokują pętli zdarzeń.
+
+        - coordinator z korutyną decide_async -> await, w przeciwnym razie decide() w wątku,
+        - agent z handle_async -> await, sync agent -> adapter (wątek roboczy).
+
+        Uwaga: jedna instancja Orchestrator = jedna rozmowa; współbieżne rozmowy
+        to osobne instancje (historia nie jest współdzielona).
+        """
+        with deadline_scope(self._turn_timeout):
+            return await self._handle_async(message)
+
+    async def _handle_async(self, message: Message) -> Message:
+        user_msg = self._begin_turn(message)
+        cid = user_msg.correlation_id
+
+        coordinator_obj, coordinator_from_registry = self._resolve_coordinator()
+        try:
+            raw_decision = await await_with_timeout(remaining_seconds(), self._decide_async(coordinator_obj, user_msg))
+        except DeadlineExceeded as exc:
+            return self._finish_timeout(getattr(coordinator_obj, "name", self._coordinator_name), exc, cid)
+        decision = self._accept_decision(raw_decision, coordinator_obj, coordinator_from_registry, cid)
+
+        if decision.stop:
+            return self._finish_stop(coordinator_obj, cid)
+
+        agent = self._route(decision, user_msg)
 
-        coordinator_from_registry = True
+        prefetch = self._start_prefetch(agent, decision, user_msg)
         try:
-            coordinator_obj = self._registry.get(self._coordinator_name)
+            if prefetch is None:
+                raw_out: AgentOutput = await await_with_timeout(remaining_seconds(), run_agent_async(agent, user_msg))
+            else:
+                raw_out = await await_with_timeout(
+                    remaining_seconds(), run_agent_async(agent, user_msg, prefetch=prefetch)
+                )
+        except DeadlineExceeded as exc:
+            return self._finish_timeout(getattr(agent, "name", agent.__class__.__name__), exc, cid)
+        finally:
+            if prefetch is not None:
+                prefetch.cancel_pending()
+        return self._finish_turn(raw_out, cid)
+
+    def handle_user_text(self, user_text: str) -> Message:
+        return self.handle(Message(sender="user", content=user_text))
+
+    async def handle_user_text_async(self, user_text: str) -> Message:
+        return await self.handle_async(Message(sender="user", content=user_text))
+
+    # ---------- kroki rundy (wspólne dla handle i handle_async) ----------
+
+    def _begin_turn(self, message: Message) -> Message:
+        user_msg = message.with_correlation_id(message.correlation_id or f"CID-{uuid.uuid4().hex[:12]}")
+        self._user_history.append(user_msg)
+        return user_msg
+
+    def _resolve_coordinator(self) -> Tuple[Any, bool]:
+        try:
+            return self._registry.get(self._coordinator_name), True
         except KeyError:
-            coordinator_obj = DefaultCoordinator(self._rules)
-            coordinator_from_registry = False
+            return DefaultCoordinator(self._rules), False
 
+    @staticmethod
+    def _decide_fn(coordinator_obj: Any) -> Callable[..., Any]:
         decide_fn = getattr(coordinator_obj, "decide", None)
         if decide_fn is None or not callable(decide_fn):
             raise TypeError("Coordinator agent must implement decide(...)")
+        return decide_fn
+
+    def _decide_kwargs(self, user_msg: Message) -> dict:
+        return {
+            "user_goal": user_msg.content,
+            "team_ctx": self.team_context(),
+            "agents": self._registry.list_capabilities(),
+        }
 
-        decision = decide_fn(user_goal=user_msg.content, team_ctx=team_ctx, agents=caps)
+    async def _decide_async(self, coordinator_obj: Any, user_msg: Message) -> Any:
+        decide_async = getattr(coordinator_obj, "decide_async", None)
+        if decide_async is not None and inspect.iscoroutinefunction(decide_async):
+            return await decide_async(**self._decide_kwargs(user_msg))
+
+        decide_fn = self._decide_fn(coordinator_obj)
+        return await asyncio.to_thread(decide_fn, **self._decide_kwargs(user_msg))
+
+    def _accept_decision(
+        self,
+        decision: Any,
+        coordinator_obj: Any,
+        coordinator_from_registry: bool,
+        cid: str,
+    ) -> CoordinatorDecision:
         if isinstance(decision, dict):
             decision = CoordinatorDecision.from_dict(decision)
         if not isinstance(decision, CoordinatorDecision):
@@ -139,7 +258,6 @@ class Orchestrator:
             actor=getattr(coordinator_obj, "name", self._coordinator_name),
             target=decision.next_agent,
             data=decision.to_dict(),
-            timestamp=now_iso(),
             correlation_id=cid,
         )
         self._team_events.append(decision_event)
@@ -155,36 +273,54 @@ class Orchestrator:
                     params=decision.to_dict(),
                     outcome="ok",
                     error=None,
-                    timestamp=now_iso(),
                     correlation_id=cid,
                 )
             )
 
-        if decision.stop:
-            reply = Message(
-                sender=getattr(coordinator_obj, "name", self._coordinator_name),
-                content="OK, kończę.",
-                correlation_id=cid,
-            )
-            self._user_history.append(reply)
-
-            respond_trace = TraceEvent(
-                actor=reply.sender,
-                action="respond",
-                target="user",
-                params={"content": reply.content},
-                outcome="ok",
-                error=None,
-                timestamp=now_iso(),
-                correlation_id=cid,
-            )
-            self._team_conversation.append(respond_trace)
-            respond_event = respond_trace.to_event()
-            self._team_events.append(respond_event)
-            self._team_memory.add_event(respond_event)
-            return reply
+        return decision
 
-        # --- route ---
+    def _finish_stop(self, coordinator_obj: Any, cid: str) -> Message:
+        reply = Message(
+            sender=getattr(coordinator_obj, "name", self._coordinator_name),
+            content="OK, kończę.",
+            correlation_id=cid,
+        )
+        self._user_history.append(reply)
+        self._record_respond(reply, cid)
+        return reply
+
+    def _finish_timeout(self, actor: str, exc: DeadlineExceeded, cid: str) -> Message:
+        """
+        Runda przekroczyła budżet czasu: zapisujemy błąd TIMEOUT i odpowiadamy od razu,
+        zamiast czekać na spóźnionego koordynatora/agenta.
+        Wołane z bloku except (stack trace wyjątku trafia do ToolError).
+        """
+        terr = tool_error_from_exception(provider=actor, request_params={}, exc=exc)
+
+        timeout_trace = TraceEvent(
+            actor="orchestrator",
+            action="error",
+            target=actor,
+            params={"turn_timeout_seconds": self._turn_timeout},
+            outcome="error",
+            error=terr,
+            correlation_id=cid,
+        )
+        self._team_conversation.append(timeout_trace)
+        timeout_event = timeout_trace.to_event()
+        self._team_events.append(timeout_event)
+        self._team_memory.add_event(timeout_event)
+
+        reply = Message(
+            sender="orchestrator",
+            content="Przepraszam, nie zdążyłem przygotować odpowiedzi w limicie czasu. Spróbuj ponownie.",
+            correlation_id=cid,
+        )
+        self._user_history.append(reply)
+        self._record_respond(reply, cid)
+        return reply
+
+    def _route(self, decision: CoordinatorDecision, user_msg: Message) -> Any:
         agent = self._registry.get(decision.next_agent)
 
         route_trace = TraceEvent(
@@ -194,40 +330,66 @@ class Orchestrator:
             params={"text": user_msg.content, "task": decision.task},
             outcome="ok",
             error=None,
-            timestamp=now_iso(),
-            correlation_id=cid,
+            correlation_id=user_msg.correlation_id,
         )
         self._team_conversation.append(route_trace)
         route_event = route_trace.to_event()
         self._team_events.append(route_event)
         self._team_memory.add_event(route_event)
+        return agent
+
+    def _start_prefetch(self, agent: Any, decision: CoordinatorDecision, user_msg: Message) -> ToolPrefetch | None:
+        """
+        Jeśli agent deklaruje prefetch_plan(message) (slot -> PlannedToolCall),
+        uruchamiamy współbieżnie te sloty, które koordynator wskazał w needed_tools.
+        """
+        if not self._prefetch_tools or not decision.needed_tools:
+            return None
+
+        plan_fn = getattr(agent, "prefetch_plan", None)
+        if plan_fn is None or not callable(plan_fn):
+            return None
+
+        calls = select_calls(plan_fn(user_msg), decision.needed_tools)
+        if not calls:
+            return None
+
+        prefetch = ToolPrefetch.start(calls)
+
+        for slot, call in calls.items():
+            ev = Event(
+                type="tool_call",
+                actor="orchestrator",
+                target=call.tool_name,
+                data={"slot": slot, "params": dict(call.params), "prefetch": True},
+                correlation_id=user_msg.correlation_id,
+            )
+            self._team_events.append(ev)
+            self._team_memory.add_event(ev)
 
-        raw_out: AgentOutput = agent.handle(user_msg)
+        return prefetch
+
+    def _finish_turn(self, raw_out: AgentOutput, cid: str) -> Message:
         result = self._normalize_agent_output(raw_out, cid)
 
         for ev in result.events:
             if ev.correlation_id is None:
-                ev = Event(
-                    type=ev.type,
-                    actor=ev.actor,
-                    target=ev.target,
-                    data=dict(ev.data),
-                    timestamp=ev.timestamp,
-                    correlation_id=cid,
-                )
+                ev = ev.with_correlation_id(cid)
             self._team_events.append(ev)
             self._team_memory.add_event(ev)
 
         self._user_history.append(result.message)
+        self._record_respond(result.message, cid)
+        return result.message
 
+    def _record_respond(self, reply: Message, cid: str) -> None:
         respond_trace = TraceEvent(
-            actor=result.message.sender,
+            actor=reply.sender,
             action="respond",
             target="user",
-            params={"content": result.message.content},
+            params={"content": reply.content},
             outcome="ok",
             error=None,
-            timestamp=now_iso(),
             correlation_id=cid,
         )
         self._team_conversation.append(respond_trace)
@@ -235,33 +397,14 @@ class Orchestrator:
         self._team_events.append(respond_event)
         self._team_memory.add_event(respond_event)
 
-        return result.message
-
-    def handle_user_text(self, user_text: str) -> Message:
-        return self.handle(Message(sender="user", content=user_text))
-
     def _normalize_agent_output(self, out: AgentOutput, cid: str) -> AgentResult:
+        # correlation_id dokładamy tylko, gdy agent go nie ustawił; meta/eventy bez kopiowania
         if isinstance(out, AgentResult):
-            msg = out.message
-            if msg.correlation_id is None:
-                msg = Message(
-                    sender=msg.sender,
-                    content=msg.content,
-                    role=msg.role,
-                    meta=dict(msg.meta),
-                    timestamp=msg.timestamp,
-                    correlation_id=cid,
-                )
-            return AgentResult(message=msg, payload=out.payload, events=list(out.events))
+            if out.message.correlation_id is not None:
+                return out
+            return AgentResult(message=out.message.with_correlation_id(cid), payload=out.payload, events=out.events)
 
         msg = out
         if msg.correlation_id is None:
-            msg = Message(
-                sender=msg.sender,
-                content=msg.content,
-                role=msg.role,
-                meta=dict(msg.meta),
-                timestamp=msg.timestamp,
-                correlation_id=cid,
-            )
+            msg = msg.with_correlation_id(cid)
         return AgentResult(message=msg)
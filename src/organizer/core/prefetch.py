@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping
+
+from organizer.core.concurrency import submit
+from organizer.core.deadline import DeadlineExceeded, call_with_timeout, remaining_seconds
+from organizer.core.tool import Tool
+
+
+@dataclass(frozen=True)
+class PlannedToolCall:
+    """
+    Wywołanie narzędzia, które agent wykona w tej rundzie (slot -> tool + params).
+    Slot to nazwa z CoordinatorDecision.needed_tools (np. "weather_tool").
+    """
+    tool: Tool
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def tool_name(self) -> str:
+        return getattr(self.tool, "name", self.tool.__class__.__name__)
+
+
+class ToolPrefetch:
+    """
+    Wyniki narzędzi uruchomionych z wyprzedzeniem (futures), przekazywane agentowi.
+
+    Agent pyta o slot przez result(slot, call):
+    - jeśli slot był prefetchowany z tymi samymi params -> czeka na gotowy future,
+    - w przeciwnym razie woła narzędzie sam (zachowanie jak bez prefetchu).
+    Wyjątek narzędzia wychodzi z result() tak samo jak przy bezpośrednim wywołaniu.
+    """
+
+    def __init__(self, calls: Mapping[str, PlannedToolCall], futures: Mapping[str, Future]):
+        self._calls = dict(calls)
+        self._futures = dict(futures)
+
+    @classmethod
+    def start(cls, calls: Mapping[str, PlannedToolCall]) -> "ToolPrefetch":
+        futures = {slot: submit(call.tool, **dict(call.params)) for slot, call in calls.items()}
+        return cls(calls, futures)
+
+    @classmethod
+    def empty(cls) -> "ToolPrefetch":
+        return cls({}, {})
+
+    @property
+    def slots(self) -> tuple[str, ...]:
+        return tuple(self._futures.keys())
+
+    def calls(self) -> Dict[str, PlannedToolCall]:
+        return dict(self._calls)
+
+    def future(self, slot: str, call: PlannedToolCall) -> Future | None:
+        """
+        Future dla slotu, o ile prefetch dotyczył tego samego narzędzia i params.
+        """
+        planned = self._calls.get(slot)
+        if planned is None or planned.tool is not call.tool or dict(planned.params) != dict(call.params):
+            return None
+        return self._futures.get(slot)
+
+    def result(self, slot: str, call: PlannedToolCall) -> Any:
+        """
+        Czeka najwyżej tyle, ile zostało z budżetu rundy (DeadlineExceeded po przekroczeniu).
+        """
+        fut = self.future(slot, call)
+        if fut is None:
+            return call_with_timeout(remaining_seconds(), call.tool, **dict(call.params))
+        try:
+            return fut.result(timeout=remaining_seconds())
+        except FutureTimeoutError:
+            raise DeadlineExceeded(f"Prefetched call '{call.tool_name}' exceeded the turn deadline") from None
+
+    def cancel_pending(self) -> None:
+        # best-effort: nieużyte, jeszcze niewystartowane wywołania nie obciążają providera
+        for fut in self._futures.values():
+            fut.cancel()
+
+
+def select_calls(plan: Mapping[str, PlannedToolCall], needed_tools: Iterable[str]) -> Dict[str, PlannedToolCall]:
+    needed = set(needed_tools)
+    return {slot: call for slot, call in plan.items() if slot in needed}
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from organizer.core.deadline import remaining_seconds
+
+
+class RateLimitExceeded(Exception):
+    """
+    Limiter nie wydał tokenu w dopuszczalnym czasie (fail fast albo koniec budżetu rundy).
+    """
+
+    def __init__(self, provider: str, wait_seconds: float):
+        super().__init__(f"Rate limit for provider '{provider}': next slot in {wait_seconds:.3f}s")
+        self.provider = provider
+        self.wait_seconds = wait_seconds
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    """
+    Token bucket jednego providera.
+
+    rate_per_second / burst: docelowe tempo i pojemność kubełka
+    max_wait_seconds: ile najdłużej czekamy w kolejce (0 = fail fast, None = do końca budżetu rundy)
+    min_rate_per_second: dolna granica tempa po adaptacji do 429
+    decrease_factor: mnożnik tempa po 429 (AIMD: szybko w dół)
+    increase_per_success: o ile (ułamek rate_per_second) rośnie tempo po sukcesie (powoli w górę)
+    """
+    rate_per_second: float = 10.0
+    burst: float = 10.0
+    max_wait_seconds: float | None = 5.0
+    min_rate_per_second: float = 0.1
+    decrease_factor: float = 0.5
+    increase_per_success: float = 0.05
+
+
+class RateLimiter:
+    """
+    Kliencki limiter per provider (token bucket) z adaptacją tempa.
+
+    - acquire()/acquire_async(): czekają na token (kolejka) albo rzucają RateLimitExceeded,
+      gdy czekanie przekroczyłoby max_wait_seconds / pozostały budżet rundy,
+    - on_throttled(retry_after): po 429 tempo spada (decrease_factor), a Retry-After wstrzymuje
+      wydawanie tokenów do wskazanego momentu,
+    - on_success(): tempo wraca stopniowo do rate_per_second.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        config: RateLimitConfig | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.provider = provider
+        self._config = config or RateLimitConfig()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+        self._rate = self._config.rate_per_second
+        self._tokens = self._config.burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+        self.throttled = 0
+        self.rejected = 0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def acquire(self, *, max_wait_seconds: float | None = None) -> float:
+        """
+        Pobiera token. Zwraca czas oczekiwania w kolejce (sekundy).
+        """
+        wait = self._reserve(self._max_wait(max_wait_seconds))
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self, *, max_wait_seconds: float | None = None) -> float:
+        wait = self._reserve(self._max_wait(max_wait_seconds))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_throttled(self, retry_after_seconds: float | None = None) -> None:
+        with self._lock:
+            self.throttled += 1
+            self._rate = max(self._config.min_rate_per_second, self._rate * self._config.decrease_factor)
+            if retry_after_seconds is not None:
+                self._blocked_until = max(self._blocked_until, self._clock() + retry_after_seconds)
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self._rate < self._config.rate_per_second:
+                step = self._config.rate_per_second * self._config.increase_per_success
+                self._rate = min(self._config.rate_per_second, self._rate + step)
+
+    # ---------- internal ----------
+
+    def _max_wait(self, override: float | None) -> float | None:
+        limits = [w for w in (override, self._config.max_wait_seconds, remaining_seconds()) if w is not None]
+        return min(limits) if limits else None
+
+    def _reserve(self, max_wait: float | None) -> float:
+        """
+        Rezerwuje token (saldo może zejść poniżej zera — kolejni czekają dłużej).
+        Jeśli czekanie przekroczyłoby max_wait, nic nie rezerwuje i rzuca RateLimitExceeded.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._config.burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+            wait = 0.0 if self._tokens >= 1.0 else (1.0 - self._tokens) / self._rate
+            wait = max(wait, self._blocked_until - now)
+
+            if max_wait is not None and wait > max_wait:
+                self.rejected += 1
+                raise RateLimitExceeded(self.provider, wait)
+
+            self._tokens -= 1.0
+            return wait
+
+
+class RateLimiterRegistry:
+    """
+    Limitery per provider (klucz = nazwa narzędzia, jak ToolError.provider), tworzone leniwie.
+    Providery bez wpisu w configs nie są limitowane (get() zwraca None).
+    """
+
+    def __init__(
+        self,
+        configs: dict[str, RateLimitConfig] | None = None,
+        *,
+        default: RateLimitConfig | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._configs = dict(configs or {})
+        self._default = default
+        self._clock = clock
+        self._sleep = sleep
+        self._limiters: dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> RateLimiter | None:
+        limiter = self._limiters.get(provider)
+        if limiter is not None:
+            return limiter
+        config = self._configs.get(provider, self._default)
+        if config is None:
+            return None
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                limiter = self._limiters[provider] = RateLimiter(
+                    provider, config, clock=self._clock, sleep=self._sleep
+                )
+        return limiter
+
+
+# Publiczne limity providerów (z zapasem): Ticketmaster Discovery ~5 req/s, OpenAI zależnie od planu
+DEFAULT_RATE_LIMITS: dict[str, RateLimitConfig] = {
+    "ticketmaster_events": RateLimitConfig(rate_per_second=4.0, burst=4.0),
+    "openai_city_normalizer": RateLimitConfig(rate_per_second=5.0, burst=10.0),
+    "openai_recovery": RateLimitConfig(rate_per_second=2.0, burst=4.0),
+}
+
+_shared: RateLimiterRegistry | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiters() -> RateLimiterRegistry:
+    """
+    Procesowy rejestr limiterów (DEFAULT_RATE_LIMITS), wspólny dla wszystkich sesji.
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = RateLimiterRegistry(DEFAULT_RATE_LIMITS)
+    return _shared
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Iterable, Type, Any
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Literal, Any
 
+from organizer.core.circuit_breaker import CircuitBreakerRegistry
+from organizer.core.deadline import remaining_seconds
 from organizer.core.errors import ToolError
+from organizer.core.rate_limit import RateLimiterRegistry
+from organizer.core.singleflight import SingleFlight
 from organizer.core.trace import TraceEvent
 from organizer.core.tool_runner import call_tool_with_trace
 
+Jitter = Literal["none", "full", "decorrelated"]
+
 
 @dataclass(frozen=True)
 class RetryPolicy:
@@ -14,12 +23,26 @@ class RetryPolicy:
     Polityka ponowień dla narzędzi.
 
     max_attempts: ile łącznie prób (1 = bez retry)
-    backoff_seconds: stały backoff (0 dla testów/szybkiego działania)
-    retryable_statuses: na przyszłość (np. HTTP 429/500); na razie ToolError.code jest stringiem
-    retryable_exceptions: typy wyjątków, które uznajemy za retryable (na razie ToolError.type="EXCEPTION")
+    backoff_seconds: bazowy backoff (0 dla testów/szybkiego działania); przy domyślnych
+        backoff_multiplier=1.0 i jitter="none" — stały backoff, jak dotąd
+    backoff_multiplier: backoff wykładniczy: base * multiplier^(próba-1) (1.0 = stały)
+    max_backoff_seconds: górny limit pojedynczego oczekiwania
+    jitter: "none" | "full" (losowo 0..backoff) | "decorrelated" (losowo base..3*poprzedni);
+        przy wielu klientach zalecane backoff_multiplier=2.0 + "full"
+    respect_retry_after: Retry-After z 429/503 wydłuża oczekiwanie; dłuższy niż max_backoff_seconds -> bez retry
+    use_retry_budget: ponowienia ograniczone procesowym shared_retry_budget() (per provider, wspólnym
+        dla wszystkich sesji — przy awarii providera retry nie mnoży ruchu przez max_attempts);
+        własny budżet (np. w testach): retry_budget= w call_tool_with_retry
+    retryable_statuses: HTTP statusy (ToolError.code), które ponawiamy
+    retryable_error_types: typy błędów (ToolError.type), które ponawiamy
     """
     max_attempts: int = 3
     backoff_seconds: float = 0.0
+    backoff_multiplier: float = 1.0
+    max_backoff_seconds: float = 30.0
+    jitter: Jitter = "none"
+    respect_retry_after: bool = True
+    use_retry_budget: bool = True
     retryable_statuses: tuple[str, ...] = ("429", "500", "502", "503", "504")
     retryable_error_types: tuple[str, ...] = ("EXCEPTION", "TIMEOUT", "HTTP_ERROR")
 
@@ -30,6 +53,11 @@ class RetryPolicy:
         if attempt_no >= self.max_attempts:
             return False
 
+        # Provider każe czekać dłużej, niż jesteśmy gotowi -> nie ma sensu ponawiać
+        retry_after = self._retry_after(err)
+        if retry_after is not None and retry_after > self.max_backoff_seconds:
+            return False
+
         # Jeśli code wygląda jak HTTP status i jest na liście retryable
         if err.code in self.retryable_statuses:
             return True
@@ -40,6 +68,100 @@ class RetryPolicy:
 
         return False
 
+    def backoff(
+        self,
+        attempt_no: int,
+        *,
+        previous: float | None = None,
+        err: ToolError | None = None,
+        rng: random.Random | None = None,
+    ) -> float:
+        """
+        Czas oczekiwania przed próbą attempt_no + 1 (w sekundach).
+        previous: poprzednie oczekiwanie (dla jitter="decorrelated").
+        """
+        rng = rng or random
+        base = max(0.0, self.backoff_seconds)
+        cap = self.max_backoff_seconds
+        exp = min(cap, base * (self.backoff_multiplier ** max(0, attempt_no - 1)))
+
+        if self.jitter == "full":
+            delay = rng.uniform(0.0, exp)
+        elif self.jitter == "decorrelated":
+            delay = min(cap, rng.uniform(base, max(base, (previous or base) * 3)))
+        else:
+            delay = exp
+
+        retry_after = self._retry_after(err) if err is not None else None
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _retry_after(self, err: ToolError) -> float | None:
+        if not self.respect_retry_after or err.retry_after_seconds is None:
+            return None
+        if err.code not in {"429", "503"}:
+            return None
+        return err.retry_after_seconds
+
+
+class RetryBudget:
+    """
+    Procesowy budżet ponowień per provider (token bucket).
+
+    Każde wywołanie dokłada `ratio` tokenu (do max_tokens), każde ponowienie zabiera 1.
+    Przy ratio=0.1 ponowienia to w długim okresie najwyżej ~10% wywołań danego providera,
+    więc przy awarii providera retry nie mnoży ruchu przez max_attempts we wszystkich sesjach.
+    initial_tokens: rezerwa na start (pojedyncze błędy tuż po starcie procesu też są ponawiane).
+    """
+
+    def __init__(self, *, ratio: float = 0.1, max_tokens: float = 10.0, initial_tokens: float | None = None):
+        if ratio < 0:
+            raise ValueError("ratio must be >= 0")
+        self._ratio = ratio
+        self._max = max(1.0, max_tokens)
+        self._initial = self._max if initial_tokens is None else min(self._max, initial_tokens)
+        self._tokens: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.exhausted = 0
+
+    def record_call(self, provider: str) -> None:
+        with self._lock:
+            self._tokens[provider] = min(self._max, self._tokens.get(provider, self._initial) + self._ratio)
+
+    def try_acquire(self, provider: str) -> bool:
+        """
+        Zabiera token na jedno ponowienie. False = budżet wyczerpany (nie ponawiamy).
+        """
+        with self._lock:
+            tokens = self._tokens.get(provider, self._initial)
+            if tokens < 1.0:
+                self.exhausted += 1
+                return False
+            self._tokens[provider] = tokens - 1.0
+            return True
+
+    def tokens(self, provider: str) -> float:
+        with self._lock:
+            return self._tokens.get(provider, self._initial)
+
+
+_shared_budget: RetryBudget | None = None
+_shared_budget_lock = threading.Lock()
+
+
+def shared_retry_budget() -> RetryBudget:
+    """
+    Procesowy RetryBudget używany domyślnie przez call_tool_with_retry.
+    """
+    global _shared_budget
+    if _shared_budget is None:
+        with _shared_budget_lock:
+            if _shared_budget is None:
+                _shared_budget = RetryBudget()
+    return _shared_budget
+
 
 class RetryExceededError(RuntimeError):
     """
@@ -51,6 +173,14 @@ class RetryExceededError(RuntimeError):
         self.last_error = last_error
 
 
+def _budget_exhausted(err: ToolError) -> ToolError:
+    return replace(
+        err,
+        type="RETRY_BUDGET_EXHAUSTED",
+        message=f"{err.message} (retry budget exhausted for provider '{err.provider}')",
+    )
+
+
 def call_tool_with_retry(
     *,
     tool_name: str,
@@ -60,17 +190,33 @@ def call_tool_with_retry(
     correlation_id: str,
     policy: RetryPolicy,
     sleep_fn: Callable[[float], None] | None = None,
+    singleflight: SingleFlight | None = None,
+    retry_budget: RetryBudget | None = None,
+    rng: random.Random | None = None,
+    breakers: CircuitBreakerRegistry | None = None,
+    rate_limiters: RateLimiterRegistry | None = None,
 ) -> tuple[Any, list[TraceEvent]]:
     """
     Wywołuje tool z retry. Zwraca:
     - wynik (jeśli finalnie sukces)
     - listę TraceEvent (każda próba osobny trace)
     Gdy retry się skończy -> rzuca RetryExceededError (kontrolowany).
+    singleflight: każda próba koalescowana z identycznymi wywołaniami w locie (patrz call_tool_with_trace).
+    retry_budget: budżet ponowień; None -> procesowy shared_retry_budget() (chyba że
+    policy.use_retry_budget=False). Wyczerpany budżet kończy ponawianie; last_error ma wtedy
+    type="RETRY_BUDGET_EXHAUSTED".
+    Deadline rundy: backoff nie przekracza pozostałego budżetu; gdy budżet się skończył (także TIMEOUT
+    z DeadlineExceeded) albo backoff by go wyczerpał, nie ponawiamy (i nie zabieramy tokenu).
+    breakers: circuit breaker per provider; CIRCUIT_OPEN nie jest ponawiany.
+    rate_limiters: każda próba (także ponowienie) pobiera token; po 429 z Retry-After limiter
+    sam wstrzymuje kolejną próbę do wskazanego momentu.
     """
     traces: list[TraceEvent] = []
-    sleep = sleep_fn or (lambda _: None)
+    sleep = sleep_fn or time.sleep
+    budget = retry_budget or (shared_retry_budget() if policy.use_retry_budget else None)
 
     last_err: ToolError | None = None
+    delay: float | None = None
 
     for attempt in range(1, policy.max_attempts + 1):
         result, trace = call_tool_with_trace(
@@ -79,10 +225,15 @@ def call_tool_with_retry(
             params=params,
             actor=actor,
             correlation_id=correlation_id,
+            singleflight=singleflight,
+            breakers=breakers,
+            rate_limiters=rate_limiters,
         )
         traces.append(trace)
+        if budget is not None and attempt == 1:
+            budget.record_call(tool_name)
 
-        if trace.outcome == "success":
+        if trace.succeeded:
             return result, traces
 
         # błąd
@@ -90,8 +241,16 @@ def call_tool_with_retry(
         assert last_err is not None
 
         if policy.should_retry(last_err, attempt_no=attempt):
-            if policy.backoff_seconds > 0:
-                sleep(policy.backoff_seconds)
+            delay = policy.backoff(attempt, previous=delay, err=last_err, rng=rng)
+            remaining = remaining_seconds()
+            if remaining is not None and delay >= remaining:
+                # po backoffie (albo już teraz) budżet rundy pusty — kolejna próba i tak by nie wystartowała
+                break
+            if budget is not None and not budget.try_acquire(tool_name):
+                last_err = _budget_exhausted(last_err)
+                break
+            if delay > 0:
+                sleep(delay)
             continue
 
         break
@@ -99,6 +258,6 @@ def call_tool_with_retry(
     # jeśli tu jesteśmy, retry się skończyło albo błąd nie-retryable
     assert last_err is not None
     raise RetryExceededError(
-        f"Retry exceeded for tool '{tool_name}' after {policy.max_attempts} attempts.",
+        f"Retry exceeded for tool '{tool_name}' after {len(traces)} attempts.",
         last_error=last_err,
     )
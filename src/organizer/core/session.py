@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List
+
+from organizer.core.orchestrator import Orchestrator, RoutingRule
+from organizer.core.registry import AgentRegistry
+from organizer.core.types import Message
+
+
+@dataclass
+class _Session:
+    """
+    Stan jednej rozmowy: lekki Orchestrator (historia + team trace + TeamMemory)
+    oraz blokada, żeby dwie równoległe rundy tej samej sesji się nie przeplatały.
+    Jedna blokada dla ścieżki sync i async (asyncio.Lock należałby do jednej pętli
+    i nie wykluczałby rundy sync).
+    active: rundy w toku + czekające na blokadę — takiej sesji nie ewikujemy, bo kolejna runda
+    dostałaby nową sesję z nową blokadą i biegłaby równolegle.
+    """
+    orchestrator: Orchestrator
+    last_used: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    active: int = 0
+
+
+async def _acquire_async(lock: threading.Lock) -> None:
+    # bez rywalizacji bez skoku do wątku; inaczej czekamy w wątku, nie blokując pętli
+    if lock.acquire(blocking=False):
+        return
+    waiting = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+    try:
+        await asyncio.shield(waiting)
+    except asyncio.CancelledError:
+        # wątek i tak weźmie blokadę — oddajemy ją, gdy to nastąpi
+        waiting.add_done_callback(lambda f: lock.release() if not f.cancelled() and f.result() else None)
+        raise
+
+
+class SessionManager:
+    """
+    Wiele rozmów na jednym registry.
+
+    Registry, agenci i narzędzia są współdzieleni (tworzeni raz),
+    a każda sesja (klucz: session_id / user_id) ma własną historię,
+    team_conversation, team_events i TeamMemory.
+
+    Ewikcja:
+    - LRU: po przekroczeniu max_sessions wypada najdawniej używana sesja,
+    - idle: sesje nieużywane dłużej niż idle_timeout_seconds są usuwane
+      (przy każdym get() oraz jawnie przez evict_idle()).
+    Sesje z rundą w toku są pomijane (przy samych zajętych sesjach limit może chwilowo zostać przekroczony).
+    """
+
+    def __init__(
+        self,
+        registry: AgentRegistry,
+        rules: Iterable[RoutingRule],
+        *,
+        coordinator_name: str = "coordinator",
+        summarize_every: int = 12,
+        keep_recent_events: int = 20,
+        keep_scratchpad: int = 12,
+        max_sessions: int = 10_000,
+        idle_timeout_seconds: float | None = 30 * 60,
+        turn_timeout_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be >= 1")
+
+        self._registry = registry
+        self._rules = list(rules)
+        self._coordinator_name = coordinator_name
+        self._summarize_every = summarize_every
+        self._keep_recent_events = keep_recent_events
+        self._keep_scratchpad = keep_scratchpad
+        self._turn_timeout = turn_timeout_seconds
+
+        self._max_sessions = max_sessions
+        self._idle_timeout = idle_timeout_seconds
+        self._clock = clock
+
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.evicted_lru = 0
+        self.evicted_idle = 0
+
+    @property
+    def registry(self) -> AgentRegistry:
+        return self._registry
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._sessions
+
+    def session_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def get(self, session_id: str) -> Orchestrator:
+        """
+        Zwraca orchestrator sesji (tworzy nowy, jeśli sesji nie ma).
+        """
+        return self._touch(session_id).orchestrator
+
+    def handle(self, session_id: str, message: Message) -> Message:
+        session = self._touch(session_id, enter=True)
+        try:
+            with session.lock:
+                return session.orchestrator.handle(message)
+        finally:
+            self._leave(session)
+
+    async def handle_async(self, session_id: str, message: Message) -> Message:
+        session = self._touch(session_id, enter=True)
+        try:
+            await _acquire_async(session.lock)
+            try:
+                return await session.orchestrator.handle_async(message)
+            finally:
+                session.lock.release()
+        finally:
+            self._leave(session)
+
+    def handle_user_text(self, session_id: str, user_text: str) -> Message:
+        return self.handle(session_id, Message(sender="user", content=user_text))
+
+    async def handle_user_text_async(self, session_id: str, user_text: str) -> Message:
+        return await self.handle_async(session_id, Message(sender="user", content=user_text))
+
+    def close(self, session_id: str) -> bool:
+        """
+        Jawnie kończy sesję (np. logout). Zwraca True, jeśli sesja istniała.
+        """
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def evict_idle(self) -> int:
+        """
+        Usuwa sesje bezczynne dłużej niż idle_timeout_seconds. Zwraca liczbę usuniętych.
+        """
+        with self._lock:
+            return self._evict_idle_locked(self._clock())
+
+    # ---------- internal ----------
+
+    def _touch(self, session_id: str, *, enter: bool = False) -> _Session:
+        now = self._clock()
+        with self._lock:
+            self._evict_idle_locked(now)
+
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = _Session(orchestrator=self._new_orchestrator(), last_used=now)
+                self._sessions[session_id] = session
+            else:
+                session.last_used = now
+                self._sessions.move_to_end(session_id)
+            if enter:
+                session.active += 1
+
+            # LRU od najstarszych; zajęte (i bieżącą) pomijamy
+            excess = len(self._sessions) - self._max_sessions
+            victims: list[str] = []
+            for sid, other in self._sessions.items():
+                if len(victims) >= excess:
+                    break
+                if sid != session_id and not other.active:
+                    victims.append(sid)
+            for sid in victims:
+                del self._sessions[sid]
+            self.evicted_lru += len(victims)
+
+            return session
+
+    def _leave(self, session: _Session) -> None:
+        with self._lock:
+            session.active -= 1
+            session.last_used = self._clock()  # bezczynność liczymy od końca rundy
+
+    def _evict_idle_locked(self, now: float) -> int:
+        if self._idle_timeout is None:
+            return 0
+
+        # OrderedDict jest w kolejności ostatniego użycia -> bezczynne są na początku
+        idle: list[str] = []
+        for sid, session in self._sessions.items():
+            if now - session.last_used < self._idle_timeout:
+                break
+            if not session.active:
+                idle.append(sid)
+        for sid in idle:
+            del self._sessions[sid]
+        removed = len(idle)
+
+        self.evicted_idle += removed
+        return removed
+
+    def _new_orchestrator(self) -> Orchestrator:
+        return Orchestrator(
+            self._registry,
+            self._rules,
+            coordinator_name=self._coordinator_name,
+            summarize_every=self._summarize_every,
+            keep_recent_events=self._keep_recent_events,
+            keep_scratchpad=self._keep_scratchpad,
+            turn_timeout_seconds=self._turn_timeout,
+        )
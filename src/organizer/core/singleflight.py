@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+from organizer.core.tool import Tool
+from organizer.core.tool_cache import canonical_params, tool_name_of
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+def _follower_error(exc: BaseException) -> BaseException:
+    """
+    Kopia wyjątku lidera dla followera: ten sam typ, args i atrybuty (np. response), ale własny
+    __traceback__ — jeden obiekt podnoszony w wielu wątkach zbierałby ramki wszystkich naraz.
+    Oryginał trafia do __cause__ (raise ... from).
+    """
+    try:
+        clone = exc.__class__.__new__(exc.__class__, *exc.args)
+        clone.__dict__.update(getattr(exc, "__dict__", {}))
+        clone.args = exc.args
+    except Exception:
+        clone = RuntimeError(f"{exc.__class__.__name__}: {exc}")
+    return clone
+
+
+class SingleFlight:
+    """
+    Koalescencja identycznych, równoległych wywołań (wzorzec "single-flight").
+
+    Pierwszy wywołujący dany klucz (lider) wykonuje funkcję; pozostali czekają
+    na jego wynik i dostają ten sam obiekt (albo własną kopię jego wyjątku).
+    Po zakończeniu klucz znika — to nie jest cache, tylko deduplikacja wywołań w locie.
+
+    Uwaga: wynik jest współdzielony między wywołującymi, więc nie wolno go mutować.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._async_calls: dict[tuple[asyncio.AbstractEventLoop, Hashable], _AsyncCall] = {}
+
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> tuple[Any, bool]:
+        """
+        Zwraca (wynik, shared): shared=True, jeśli wynik pochodzi z cudzego wywołania.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise _follower_error(call.error) from call.error
+            return call.value, True
+
+        try:
+            call.value = fn(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value, False
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[Any]],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> tuple[Any, bool]:
+        """
+        Async wariant do(): koalescencja w obrębie jednej pętli zdarzeń.
+
+        Wspólne wywołanie to osobny task (z kontekstem lidera); każdy czekający, także lider,
+        czeka na nie przez shield. Anulowanie czekającego anuluje tylko jego — task jest anulowany
+        dopiero, gdy zrezygnuje ostatni czekający.
+        """
+        loop = asyncio.get_running_loop()
+        k = (loop, key)
+
+        call = self._async_calls.get(k)
+        shared = call is not None
+        if call is None:
+            call = self._async_calls[k] = _AsyncCall(loop.create_task(fn(*args, **kwargs)))
+            call.task.add_done_callback(lambda task, k=k, call=call: self._async_done(k, call))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            value = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            call.waiters -= 1
+            if call.waiters == 0:
+                call.task.cancel()
+            raise
+        except BaseException as exc:
+            call.waiters -= 1
+            if shared:
+                raise _follower_error(exc) from exc
+            raise
+        call.waiters -= 1
+        return value, shared
+
+    def _async_done(self, k: tuple[asyncio.AbstractEventLoop, Hashable], call: _AsyncCall) -> None:
+        if self._async_calls.get(k) is call:
+            del self._async_calls[k]
+        if not call.task.cancelled():
+            call.task.exception()  # oznaczamy jako odebrany (wszyscy czekający mogli zrezygnować)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+
+def call_key(tool_name: str, params: Any) -> tuple[str, str]:
+    # ten sam klucz co w ToolResultCache: nazwa narzędzia + kanoniczne kwargs
+    return tool_name, canonical_params(params)
+
+
+class CoalescedTool:
+    """
+    Wrapper Tool -> Tool: równoległe wywołania z tymi samymi kwargs idą do providera raz.
+
+    Zachowuje name opakowanego narzędzia. call_tool_with_trace rozpoznaje CoalescedTool
+    i oznacza TraceEvent współdzielonego wywołania jako coalesced.
+    """
+
+    def __init__(self, tool: Tool, flight: SingleFlight | None = None):
+        self._tool = tool
+        self._flight = flight or shared_singleflight()
+        self.name = tool_name_of(tool)
+
+    @property
+    def wrapped(self) -> Tool:
+        return self._tool
+
+    @property
+    def flight(self) -> SingleFlight:
+        return self._flight
+
+    def call_with_status(self, **kwargs: Any) -> tuple[Any, bool]:
+        return self._flight.do(call_key(self.name, kwargs), self._tool, **kwargs)
+
+    def __call__(self, **kwargs: Any) -> Any:
+        return self.call_with_status(**kwargs)[0]
+
+
+_shared: SingleFlight | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_singleflight() -> SingleFlight:
+    """
+    Procesowa instancja SingleFlight (wspólna dla wszystkich sesji).
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = SingleFlight()
+    return _shared
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import traceback
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from organizer.core.errors import ToolError
+
+
+def frame_signature(exc: BaseException) -> str:
+    """
+    Tani identyfikator stack trace: typ wyjątku + (plik, funkcja, linia) kolejnych ramek.
+    Nie formatuje trace'a ani nie czyta źródeł; ten sam błąd z różnym komunikatem ma ten sam id.
+    """
+    parts = [type(exc).__qualname__]
+    tb = exc.__traceback__
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        parts.append(f"{code.co_filename}:{code.co_name}:{tb.tb_lineno}")
+        tb = tb.tb_next
+    return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=6).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("summary", "text", "count")
+
+    def __init__(self, summary: traceback.TracebackException):
+        self.summary = summary
+        self.text: str | None = None
+        self.count = 1
+
+
+class StackTraceStore:
+    """
+    Ograniczony, deduplikowany magazyn stack trace'ów (klucz = stack_trace_id).
+
+    capture(exc) zapisuje tylko pierwsze wystąpienie danej sygnatury — jako TracebackException
+    bez odczytu linii źródła (ramki nie są trzymane). Tekst trace'a powstaje dopiero w get(),
+    czyli gdy ktoś go faktycznie potrzebuje (RecoveryAgent / OpenAIRecoveryTool).
+    Najdawniej używane wpisy wypadają po przekroczeniu max_entries.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._max = max(1, max_entries)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.captured = 0
+        self.deduplicated = 0
+        self.evictions = 0
+
+    def capture(self, exc: BaseException) -> str:
+        stid = frame_signature(exc)
+        with self._lock:
+            entry = self._entries.get(stid)
+            if entry is not None:
+                entry.count += 1
+                self._entries.move_to_end(stid)
+                self.deduplicated += 1
+                return stid
+
+        summary = traceback.TracebackException.from_exception(exc, lookup_lines=False)
+        with self._lock:
+            entry = self._entries.get(stid)
+            if entry is not None:  # inny wątek zdążył zapisać tę samą sygnaturę
+                entry.count += 1
+                self.deduplicated += 1
+                return stid
+            self._entries[stid] = _Entry(summary)
+            self.captured += 1
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return stid
+
+    def get(self, stack_trace_id: str) -> str | None:
+        """
+        Pełny tekst stack trace (formatowany przy pierwszym odczycie) albo None.
+        """
+        with self._lock:
+            entry = self._entries.get(stack_trace_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(stack_trace_id)
+            if entry.text is not None:
+                return entry.text
+            summary = entry.summary
+
+        text = "".join(summary.format())
+        with self._lock:
+            entry.text = text
+            entry.summary = None  # type: ignore[assignment]  # tekst już jest, podsumowanie zbędne
+        return text
+
+    def count(self, stack_trace_id: str) -> int:
+        with self._lock:
+            entry = self._entries.get(stack_trace_id)
+            return 0 if entry is None else entry.count
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_shared: StackTraceStore | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_stack_traces() -> StackTraceStore:
+    """
+    Procesowy magazyn stack trace'ów używany domyślnie przez tool_runner.
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = StackTraceStore()
+    return _shared
+
+
+def stack_trace_of(error: "ToolError", store: StackTraceStore | None = None) -> str | None:
+    """
+    Stack trace błędu: pole ToolError.stack_trace (jeśli ustawione) albo wpis z magazynu.
+    """
+    if error.stack_trace is not None:
+        return error.stack_trace
+    return (store or shared_stack_traces()).get(error.stack_trace_id)
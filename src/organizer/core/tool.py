@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Protocol
+import asyncio
+import inspect
+from typing import Any, Awaitable, Protocol
 
 
 class Tool(Protocol):
@@ -12,3 +14,49 @@ class Tool(Protocol):
 
     def __call__(self, **kwargs: Any) -> Any:
         ...
+
+
+class AsyncTool(Protocol):
+    """
+    Asynchroniczny odpowiednik Tool: wywołanie zwraca awaitable z payloadem.
+    """
+    name: str
+
+    def __call__(self, **kwargs: Any) -> Awaitable[Any]:
+        ...
+
+
+def is_async_tool(tool: Any) -> bool:
+    """
+    True, jeśli narzędzie jest natywnie async (funkcja async albo obiekt z async __call__).
+    """
+    if inspect.iscoroutinefunction(tool):
+        return True
+    return inspect.iscoroutinefunction(getattr(tool, "__call__", None))
+
+
+class AsyncToolAdapter:
+    """
+    Adapter Tool -> AsyncTool: synchroniczne narzędzie wołane w wątku roboczym,
+    dzięki czemu blokujące HTTP nie zatrzymuje pętli zdarzeń.
+    """
+
+    def __init__(self, tool: Tool):
+        self._tool = tool
+        self.name = getattr(tool, "name", tool.__class__.__name__)
+
+    @property
+    def wrapped(self) -> Tool:
+        return self._tool
+
+    async def __call__(self, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(self._tool, **kwargs)
+
+
+def as_async_tool(tool: Any) -> AsyncTool:
+    """
+    Zwraca narzędzie w wersji async (natywne zostawiamy bez zmian).
+    """
+    if is_async_tool(tool):
+        return tool
+    return AsyncToolAdapter(tool)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, Mapping
+
+from organizer.core.concurrency import submit
+from organizer.core.deadline import without_deadline
+from organizer.core.tool import Tool
+
+CacheStatus = Literal["hit", "stale", "miss"]
+CacheKey = tuple[str, str]
+
+
+def canonical_params(params: Mapping[str, Any]) -> str:
+    """
+    Kanoniczna postać kwargs narzędzia: ta sama dla {"a": 1, "b": 2} i {"b": 2, "a": 1}.
+    Wartości nie-JSON (np. date) są serializowane przez str().
+    """
+    return json.dumps(dict(params), sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def tool_name_of(tool: Any) -> str:
+    return getattr(tool, "name", tool.__class__.__name__)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    stale_until: float
+    refreshing: bool = False
+
+
+class ToolResultCache:
+    """
+    Współdzielony cache wyników narzędzi: TTL per narzędzie + LRU z limitem wpisów.
+
+    Klucz: (nazwa narzędzia, kanoniczne kwargs). Błędy narzędzi nie są cache'owane.
+
+    Stale-while-revalidate: przez stale_seconds po wygaśnięciu TTL oddajemy starą wartość
+    i zlecamy odświeżenie w tle (jedno na klucz). Po tym oknie wpis jest zwykłym missem.
+
+    Liczniki: hits, stale_hits, misses, evictions, refreshes.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_ttl_seconds: float = 60.0,
+        ttl_seconds: Mapping[str, float] | None = None,
+        stale_seconds: float = 0.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        submit_fn: Callable[..., Any] = submit,
+    ):
+        self._default_ttl = default_ttl_seconds
+        self._ttls = dict(ttl_seconds or {})
+        self._stale = max(0.0, stale_seconds)
+        self._max_entries = max(1, max_entries)
+        self._clock = clock
+        self._submit = submit_fn
+
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+
+    def ttl_for(self, tool_name: str) -> float:
+        return self._ttls.get(tool_name, self._default_ttl)
+
+    def set_ttl(self, tool_name: str, ttl_seconds: float) -> None:
+        self._ttls[tool_name] = ttl_seconds
+
+    def get_or_call(self, tool: Tool, params: Mapping[str, Any]) -> tuple[Any, CacheStatus]:
+        """
+        Zwraca (wynik, status): "hit" (świeży), "stale" (stary + odświeżenie w tle) albo "miss" (wywołanie).
+        Wyjątek narzędzia przy missie wychodzi bez zmian.
+        """
+        name = tool_name_of(tool)
+        key = (name, canonical_params(params))
+        now = self._clock()
+
+        refresh = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                if now < entry.expires_at:
+                    self.hits += 1
+                    return entry.value, "hit"
+                self.stale_hits += 1
+                if not entry.refreshing:
+                    entry.refreshing = refresh = True
+                value = entry.value
+            else:
+                self.misses += 1
+                entry = None
+
+        if entry is not None:
+            # odświeżenie zlecamy poza blokadą (narzędzie robi I/O)
+            if refresh:
+                # bez deadline'u rundy: runda, która trafiła na stale, zaraz się kończy
+                self._submit(without_deadline, self._refresh, key, tool, dict(params))
+            return value, "stale"
+
+        value = tool(**dict(params))
+        self._store(key, value)
+        return value, "miss"
+
+    def invalidate(self, tool_name: str | None = None) -> int:
+        """
+        Usuwa wpisy jednego narzędzia (albo wszystkie). Zwraca liczbę usuniętych.
+        """
+        with self._lock:
+            keys = [k for k in self._entries if tool_name is None or k[0] == tool_name]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------- internal ----------
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        now = self._clock()
+        expires_at = now + self.ttl_for(key[0])
+        with self._lock:
+            self._entries[key] = _Entry(value=value, expires_at=expires_at, stale_until=expires_at + self._stale)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _refresh(self, key: CacheKey, tool: Tool, params: dict[str, Any]) -> None:
+        try:
+            value = tool(**params)
+        except Exception:
+            # odświeżenie w tle nie może wysadzić ruchu; stary wpis dożyje do stale_until
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+
+        self._store(key, value)
+        with self._lock:
+            self.refreshes += 1
+
+
+class CachedTool:
+    """
+    Wrapper Tool -> Tool z cache wyników (ToolResultCache).
+
+    Zachowuje name opakowanego narzędzia, więc trace/prefetch widzą to samo narzędzie.
+    ttl_seconds nadpisuje TTL tego narzędzia w cache.
+    call_tool_with_trace rozpoznaje CachedTool i zapisuje trafienie jako outcome="cache_hit".
+    """
+
+    def __init__(self, tool: Tool, cache: ToolResultCache, *, ttl_seconds: float | None = None):
+        self._tool = tool
+        self._cache = cache
+        self.name = tool_name_of(tool)
+        if ttl_seconds is not None:
+            cache.set_ttl(self.name, ttl_seconds)
+
+    @property
+    def wrapped(self) -> Tool:
+        return self._tool
+
+    @property
+    def cache(self) -> ToolResultCache:
+        return self._cache
+
+    def call_with_status(self, **kwargs: Any) -> tuple[Any, CacheStatus]:
+        return self._cache.get_or_call(self._tool, kwargs)
+
+    def __call__(self, **kwargs: Any) -> Any:
+        return self.call_with_status(**kwargs)[0]
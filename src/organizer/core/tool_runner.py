@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import traceback
+import time
 import uuid
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any, Mapping
 
+from organizer.core.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, counts_as_failure
+from organizer.core.deadline import DeadlineExceeded, await_with_timeout, call_with_timeout, effective_timeout
 from organizer.core.errors import ToolError
+from organizer.core.rate_limit import RateLimitExceeded, RateLimiter, RateLimiterRegistry
+from organizer.core.stack_traces import StackTraceStore, shared_stack_traces
+from organizer.core.tool import as_async_tool
+from organizer.core.singleflight import CoalescedTool, SingleFlight, call_key
+from organizer.core.tool_cache import CacheStatus, CachedTool
 from organizer.core.trace import TraceEvent
 
 
@@ -14,21 +24,65 @@ def _stack_trace_id(tb: str) -> str:
     return hashlib.sha256(tb.encode("utf-8")).hexdigest()[:12]
 
 
-def _make_tool_error(
+def parse_retry_after(value: str | None, *, now: datetime | None = None) -> float | None:
+    """
+    Retry-After: liczba sekund albo data HTTP (RFC 7231). Zwraca sekundy (>= 0) albo None.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+def tool_error_from_exception(
     *,
     provider: str,
     request_params: Mapping[str, Any],
     exc: Exception,
+    stack_traces: StackTraceStore | None = None,
 ) -> ToolError:
-    tb = traceback.format_exc()
-    stid = _stack_trace_id(tb)
+    # Bez format_exc(): id z sygnatury ramek, treść trace'a leniwie w magazynie (stack_trace_of)
+    stid = (stack_traces or shared_stack_traces()).capture(exc)
 
-    # Bez zależności od konkretnego HTTP klienta:
+    # Bez zależności od konkretnego HTTP klienta (duck typing: exc.response.status_code):
     code = "EXCEPTION"
     err_type = "EXCEPTION"
     message = str(exc).strip() or exc.__class__.__name__
 
     raw_response = None
+    retry_after = None
+
+    try:
+        response = getattr(exc, "response", None)
+    except Exception:  # np. właściwość klienta HTTP rzucająca, gdy brak odpowiedzi
+        response = None
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        code = str(status)
+        err_type = "HTTP_ERROR"
+        try:
+            raw_response = str(response.text)[:2000]
+        except Exception:
+            raw_response = None
+        headers = getattr(response, "headers", None) or {}
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+    elif isinstance(exc, RateLimitExceeded):
+        code = "RATE_LIMITED"
+        err_type = "RATE_LIMITED"
+        retry_after = exc.wait_seconds
+    elif isinstance(exc, TimeoutError) or "Timeout" in exc.__class__.__name__:
+        code = "TIMEOUT"
+        err_type = "TIMEOUT"
 
     return ToolError(
         code=code,
@@ -38,10 +92,146 @@ def _make_tool_error(
         request_params=request_params,
         raw_response=raw_response,
         stack_trace_id=stid,
-        stack_trace=tb,
+        stack_trace=None,
+        retry_after_seconds=retry_after,
     )
 
 
+_CACHE_OUTCOMES: dict[CacheStatus, str] = {"hit": "cache_hit", "stale": "cache_stale", "miss": "success"}
+
+
+def _trace_meta(coalesced: bool, queue_wait: float | None = None) -> dict[str, Any]:
+    meta: dict[str, Any] = {"coalesced": True} if coalesced else {}
+    if queue_wait is not None:
+        meta["queue_wait_ms"] = round(queue_wait * 1000.0, 3)
+    return meta
+
+
+def _success_trace(
+    *,
+    actor: str,
+    tool_name: str,
+    params: Mapping[str, Any],
+    cid: str,
+    outcome: str = "success",
+    coalesced: bool = False,
+    queue_wait: float | None = None,
+) -> TraceEvent:
+    return TraceEvent(
+        actor=actor,
+        action="tool_call",
+        target=tool_name,
+        params=params,  # TraceEvent zamraża (jedna kopia)
+        outcome=outcome,
+        error=None,
+        correlation_id=cid,
+        meta=_trace_meta(coalesced, queue_wait),
+    )
+
+
+def _error_trace(
+    *,
+    actor: str,
+    tool_name: str,
+    params: Mapping[str, Any],
+    cid: str,
+    exc: Exception,
+    coalesced: bool = False,
+    queue_wait: float | None = None,
+) -> TraceEvent:
+    terr = tool_error_from_exception(provider=tool_name, request_params=params, exc=exc)
+    return TraceEvent(
+        actor=actor,
+        action="tool_call",
+        target=tool_name,
+        params=params,
+        outcome="error",
+        error=terr,
+        correlation_id=cid,
+        meta=_trace_meta(coalesced, queue_wait),
+    )
+
+
+# (wynik, outcome, coalesced)
+_Invocation = tuple[Any, str, bool]
+
+
+def _invoke(tool_callable: Any, params: dict[str, Any]) -> _Invocation:
+    if isinstance(tool_callable, CachedTool):
+        result, status = tool_callable.call_with_status(**params)
+        return result, _CACHE_OUTCOMES[status], False
+    if isinstance(tool_callable, CoalescedTool):
+        result, shared = tool_callable.call_with_status(**params)
+        return result, "success", shared
+    return tool_callable(**params), "success", False
+
+
+async def _invoke_async(tool_callable: Any, params: dict[str, Any]) -> _Invocation:
+    if isinstance(tool_callable, (CachedTool, CoalescedTool)):
+        return await asyncio.to_thread(_invoke, tool_callable, params)
+    return await as_async_tool(tool_callable)(**params), "success", False
+
+
+def _circuit_open_trace(
+    *,
+    actor: str,
+    tool_name: str,
+    params: Mapping[str, Any],
+    cid: str,
+    breaker: CircuitBreaker,
+) -> TraceEvent:
+    retry_in = breaker.retry_in()
+    terr = ToolError(
+        code="CIRCUIT_OPEN",
+        type="CIRCUIT_OPEN",
+        message=f"Circuit open for provider '{tool_name}'; next probe in {retry_in:.1f}s",
+        provider=tool_name,
+        request_params=params,
+        raw_response=None,
+        stack_trace_id=_stack_trace_id(f"CIRCUIT_OPEN:{tool_name}"),
+        stack_trace=None,
+        retry_after_seconds=retry_in,
+    )
+    return TraceEvent(
+        actor=actor,
+        action="tool_call",
+        target=tool_name,
+        params=params,
+        outcome="error",
+        error=terr,
+        correlation_id=cid,
+    )
+
+
+def _deadline_trace(*, actor: str, tool_name: str, params: Mapping[str, Any], cid: str) -> TraceEvent:
+    # budżet rundy skończył się, zanim narzędzie wystartowało — nie wołamy go wcale
+    try:
+        raise DeadlineExceeded(f"Deadline exceeded before calling '{tool_name}'")
+    except DeadlineExceeded as exc:
+        return _error_trace(actor=actor, tool_name=tool_name, params=params, cid=cid, exc=exc)
+
+
+def _observe(limiter: RateLimiter | None, trace: TraceEvent) -> None:
+    # adaptacja tempa: 429 (+ Retry-After) zwalnia limiter, sukces providera powoli go rozpędza
+    if limiter is None:
+        return
+    if trace.error is not None and trace.error.code == "429":
+        limiter.on_throttled(trace.error.retry_after_seconds)
+    elif trace.outcome == "success":
+        limiter.on_success()
+
+
+def _record(breaker: CircuitBreaker | None, trace: TraceEvent, started: float, *, ran: bool) -> None:
+    # do okna breakera tylko prawdziwe wywołania providera: nie trafienia w cache i nie cudze wyniki
+    if breaker is None:
+        return
+    if not ran or trace.outcome in ("cache_hit", "cache_stale") or trace.meta.get("coalesced"):
+        breaker.release()
+        return
+    failure = trace.error is not None and counts_as_failure(trace.error)
+    breaker.record(failure=failure, elapsed_seconds=time.perf_counter() - started)
+
+
 def call_tool_with_trace(
     *,
     tool_name: str,
@@ -49,38 +239,157 @@ def call_tool_with_trace(
     params: Mapping[str, Any],
     actor: str = "tool_runner",
     correlation_id: str | None = None,
+    singleflight: SingleFlight | None = None,
+    breakers: CircuitBreakerRegistry | None = None,
+    timeout_seconds: float | None = None,
+    rate_limiters: RateLimiterRegistry | None = None,
 ) -> tuple[Any | None, TraceEvent]:
     """
     Wywołuje narzędzie i ZAWSZE zwraca TraceEvent.
     - sukces: (result, TraceEvent(outcome="success", error=None))
     - błąd:   (None,   TraceEvent(outcome="error",   error=ToolError))
+    - CachedTool: trafienie w cache -> outcome="cache_hit" (albo "cache_stale")
+
+    singleflight: równoległe wywołania z tym samym tool_name + params współdzielą jedno
+    wykonanie. Każdy wywołujący dostaje własny TraceEvent (własne correlation_id);
+    ci, którzy dostali cudzy wynik/błąd, mają meta={"coalesced": True}.
+
+    breakers: circuit breaker per provider (tool_name). Przy otwartym obwodzie narzędzie
+    nie jest wołane, a błąd ma type="CIRCUIT_OPEN".
+
+    timeout_seconds: limit wywołania; obowiązuje mniejszy z niego i pozostałego budżetu rundy
+    (deadline_scope z Orchestrator.handle). Przekroczenie -> ToolError(type="TIMEOUT").
+
+    rate_limiters: token bucket per provider, pobierany za breakerem i wewnątrz single-flight
+    (tylko wywołania, które naprawdę idą do providera). Czas w kolejce trafia do
+    meta["queue_wait_ms"] i wlicza się w limit wywołania; odmowa tokenu -> ToolError(type="RATE_LIMITED").
+    429/Retry-After z odpowiedzi zwalniają limiter.
+    """
+    cid = correlation_id or uuid.uuid4().hex
+    call_params = dict(params)
+    entered = ran = False
+
+    limit = effective_timeout(timeout_seconds)
+    if limit is not None and limit <= 0:
+        return None, _deadline_trace(actor=actor, tool_name=tool_name, params=params, cid=cid)
+
+    breaker = breakers.get(tool_name) if breakers is not None else None
+    if breaker is not None and not breaker.allow():
+        return None, _circuit_open_trace(actor=actor, tool_name=tool_name, params=params, cid=cid, breaker=breaker)
+
+    # token dopiero tuż przed providerem: odrzuceni przez breaker i followerzy single-flight go nie zużywają
+    limiter = rate_limiters.get(tool_name) if rate_limiters is not None else None
+    queue_wait: float | None = None
+
+    def run() -> _Invocation:
+        nonlocal entered, ran, queue_wait
+        entered = True
+        if limiter is not None:
+            queue_wait = 0.0
+            queue_wait = limiter.acquire(max_wait_seconds=limit)
+        ran = True
+        return _invoke(tool_callable, call_params)
+
+    def execute() -> _Invocation:
+        if singleflight is None:
+            return run()
+        (result, outcome, inner), shared = singleflight.do(call_key(tool_name, call_params), run)
+        return result, outcome, shared or inner
+
+    started = time.perf_counter()
+    try:
+        result, outcome, coalesced = call_with_timeout(limit, execute)
+        trace = _success_trace(
+            actor=actor, tool_name=tool_name, params=params, cid=cid, outcome=outcome, coalesced=coalesced,
+            queue_wait=queue_wait,
+        )
+
+    except Exception as exc:  # celowo szeroko: chcemy ustandaryzować wszystko
+        coalesced = not entered and not isinstance(exc, DeadlineExceeded)
+        result, trace = None, _error_trace(
+            actor=actor, tool_name=tool_name, params=params, cid=cid, exc=exc, coalesced=coalesced,
+            queue_wait=queue_wait,
+        )
+
+    except BaseException:
+        # przerwanie (np. KeyboardInterrupt) — zwalniamy próbę half-open
+        if breaker is not None:
+            breaker.record(failure=True, elapsed_seconds=time.perf_counter() - started)
+        raise
+
+    _record(breaker, trace, started, ran=ran)
+    _observe(limiter, trace)
+    return result, trace
+
+
+async def call_tool_with_trace_async(
+    *,
+    tool_name: str,
+    tool_callable: Any,
+    params: Mapping[str, Any],
+    actor: str = "tool_runner",
+    correlation_id: str | None = None,
+    singleflight: SingleFlight | None = None,
+    breakers: CircuitBreakerRegistry | None = None,
+    timeout_seconds: float | None = None,
+    rate_limiters: RateLimiterRegistry | None = None,
+) -> tuple[Any | None, TraceEvent]:
+    """
+    Async wariant call_tool_with_trace (ten sam kontrakt TraceEvent).
+    Narzędzia synchroniczne są automatycznie adaptowane (wątek roboczy).
+    Po przekroczeniu limitu korutyna narzędzia jest anulowana.
     """
     cid = correlation_id or uuid.uuid4().hex
+    call_params = dict(params)
+    entered = ran = False
+
+    limit = effective_timeout(timeout_seconds)
+    if limit is not None and limit <= 0:
+        return None, _deadline_trace(actor=actor, tool_name=tool_name, params=params, cid=cid)
+
+    breaker = breakers.get(tool_name) if breakers is not None else None
+    if breaker is not None and not breaker.allow():
+        return None, _circuit_open_trace(actor=actor, tool_name=tool_name, params=params, cid=cid, breaker=breaker)
 
+    limiter = rate_limiters.get(tool_name) if rate_limiters is not None else None
+    queue_wait: float | None = None
+
+    async def run() -> _Invocation:
+        nonlocal entered, ran, queue_wait
+        entered = True
+        if limiter is not None:
+            queue_wait = 0.0
+            queue_wait = await limiter.acquire_async(max_wait_seconds=limit)
+        ran = True
+        return await _invoke_async(tool_callable, call_params)
+
+    async def execute() -> _Invocation:
+        if singleflight is None:
+            return await run()
+        (result, outcome, inner), shared = await singleflight.do_async(call_key(tool_name, call_params), run)
+        return result, outcome, shared or inner
+
+    started = time.perf_counter()
     try:
-        result = tool_callable(**dict(params))
-        trace = TraceEvent(
-            actor=actor,
-            action="tool_call",
-            target=tool_name,
-            params=dict(params),
-            outcome="success",
-            error=None,
-            timestamp=TraceEvent.now_iso(),
-            correlation_id=cid,
+        result, outcome, coalesced = await await_with_timeout(limit, execute())
+        trace = _success_trace(
+            actor=actor, tool_name=tool_name, params=params, cid=cid, outcome=outcome, coalesced=coalesced,
+            queue_wait=queue_wait,
         )
-        return result, trace
 
     except Exception as exc:  # celowo szeroko: chcemy ustandaryzować wszystko
-        terr = _make_tool_error(provider=tool_name, request_params=params, exc=exc)
-        trace = TraceEvent(
-            actor=actor,
-            action="tool_call",
-            target=tool_name,
-            params=dict(params),
-            outcome="error",
-            error=terr,
-            timestamp=TraceEvent.now_iso(),
-            correlation_id=cid,
+        coalesced = not entered and not isinstance(exc, DeadlineExceeded)
+        result, trace = None, _error_trace(
+            actor=actor, tool_name=tool_name, params=params, cid=cid, exc=exc, coalesced=coalesced,
+            queue_wait=queue_wait,
         )
-        return None, trace
+
+    except BaseException:
+        # anulowanie (np. CancelledError) — zwalniamy próbę half-open
+        if breaker is not None:
+            breaker.record(failure=True, elapsed_seconds=time.perf_counter() - started)
+        raise
+
+    _record(breaker, trace, started, ran=ran)
+    _observe(limiter, trace)
+    return result, trace
@@ -1,33 +1,68 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
-from organizer.core.types import Event, now_iso
+from organizer.core.types import Event, FrozenDict, FrozenRecord, Timestamp, freeze, now_iso
 
+# outcome'y oznaczające, że wywołanie dało wynik (retry/recovery nie reagują)
+SUCCESS_OUTCOMES = frozenset({"ok", "success", "cache_hit", "cache_stale"})
 
-@dataclass(frozen=True)
-class TraceEvent:
+_set = object.__setattr__
+
+
+class TraceEvent(FrozenRecord):
     """
     Legacy trace model (zgodność z wcześniejszymi commitami: ToolError/trace wrapper).
 
     Pola oczekiwane przez istniejące testy/tooling:
     - actor, action, target, params, outcome, error, timestamp, correlation_id
+
+    outcome dla tool_call: "success" | "error" | "cache_hit" | "cache_stale" (wynik z CachedTool)
+    meta: dodatkowe znaczniki wywołania (np. coalesced — wynik współdzielony przez single-flight)
     """
+    __slots__ = ("actor", "action", "target", "params", "outcome", "error", "correlation_id", "meta", "_ts", "_iso")
+    _fields = ("actor", "action", "target", "params", "outcome", "error", "timestamp", "correlation_id", "meta")
+
     actor: str
     action: str
     target: str
-    params: Dict[str, Any] = field(default_factory=dict)
-    outcome: str = "ok"
-    error: Optional[str] = None
-    timestamp: str = field(default_factory=now_iso)
-    correlation_id: Optional[str] = None
+    params: FrozenDict
+    outcome: str
+    error: Optional[Any]  # ToolError dla outcome="error"
+    correlation_id: Optional[str]
+    meta: FrozenDict  # np. {"coalesced": True}
+
+    def __init__(
+        self,
+        actor: str,
+        action: str,
+        target: str,
+        params: Optional[Mapping[str, Any]] = None,
+        outcome: str = "ok",
+        error: Optional[Any] = None,
+        timestamp: Timestamp = None,
+        correlation_id: Optional[str] = None,
+        meta: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        _set(self, "actor", actor)
+        _set(self, "action", action)
+        _set(self, "target", target)
+        _set(self, "params", freeze(params))
+        _set(self, "outcome", outcome)
+        _set(self, "error", error)
+        _set(self, "correlation_id", correlation_id)
+        _set(self, "meta", freeze(meta))
+        self._init_timestamp(timestamp)
 
     @staticmethod
     def now_iso() -> str:
         # zachowujemy API, jeśli gdzieś było używane TraceEvent.now_iso()
         return now_iso()
 
+    @property
+    def succeeded(self) -> bool:
+        return self.outcome in SUCCESS_OUTCOMES
+
     def to_event(self) -> Event:
         """
         Adapter: pozwala w przyszłości migrować TraceEvent -> Event.
@@ -45,7 +80,23 @@ class TraceEvent:
             type=event_type,  # type: ignore[arg-type]
             actor=self.actor,
             target=self.target,
-            data=dict(self.params),
-            timestamp=self.timestamp,
+            data=self.params,
+            timestamp=self._ts,
             correlation_id=self.correlation_id,
         )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Pola w kolejności _fields (format linii trace JSONL); error zostaje obiektem (ToolError).
+        """
+        return {
+            "actor": self.actor,
+            "action": self.action,
+            "target": self.target,
+            "params": self.params,
+            "outcome": self.outcome,
+            "error": self.error,
+            "timestamp": self.timestamp,
+            "correlation_id": self.correlation_id,
+            "meta": self.meta,
+        }
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import json
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable, Mapping
 
 from organizer.core.trace import TraceEvent
 
 
+def _jsonable(obj: Any) -> Any:
+    # ToolError (i inne dataclassy) w polu error; Mapping np. request_params
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+
 def write_trace_jsonl(events: Iterable[TraceEvent], path: str | Path) -> Path:
     """
     Zapisuje trace (team_conversation) do pliku JSONL.
@@ -19,6 +29,6 @@ def write_trace_jsonl(events: Iterable[TraceEvent], path: str | Path) -> Path:
 
     with p.open("w", encoding="utf-8") as f:
         for ev in events:
-            f.write(json.dumps(ev.__dict__, ensure_ascii=False) + "\n")
+            f.write(json.dumps(ev.to_dict(), ensure_ascii=False, default=_jsonable) + "\n")
 
     return p
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import time
+from dataclasses import FrozenInstanceError
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Mapping, Optional, Literal, Type, Union
+from typing import Any, Dict, List, Mapping, Optional, Literal, Type, TypeVar, Union
 
 
 # ---------- wspólne ----------
@@ -10,11 +11,30 @@ from typing import Any, Dict, List, Mapping, Optional, Literal, Type, Union
 Role = Literal["user", "agent", "system", "tool", "error"]
 EventType = Literal["route", "decision", "tool_call", "observation", "respond", "critique", "error"]
 
+Timestamp = Union[str, int, None]  # ISO 8601 albo epoch-ns (time.time_ns()); None -> teraz
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_set = object.__setattr__
+
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def iso_from_ns(ns: int) -> str:
+    # ten sam format co now_iso() (UTC, mikrosekundy)
+    seconds, rest = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=rest // 1_000).isoformat()
+
+
+def ns_from_iso(text: str) -> int:
+    dt = datetime.fromisoformat(text)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
 def _role_from_sender(sender: str) -> Role:
     s = (sender or "").lower()
     if s == "user":
@@ -28,32 +48,179 @@ def _role_from_sender(sender: str) -> Role:
     return "agent"
 
 
+class FrozenDict(dict):
+    """
+    Niemutowalny dict na meta/data/params modeli. Podklasa dict: json.dumps, isinstance(x, dict),
+    porównania i repr działają jak dotąd; metody modyfikujące rzucają TypeError.
+
+    Modele współdzielą tę samą instancję przy pochodnych (with_correlation_id, to_event, to_dict),
+    zamiast kopiować dict. Zamrożenie jest płytkie — zagnieżdżonych wartości nie kopiujemy.
+    """
+    __slots__ = ()
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"{self.__class__.__name__} is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (self.__class__, (dict(self),))
+
+
+EMPTY = FrozenDict()
+
+
+def freeze(mapping: Optional[Mapping[str, Any]]) -> FrozenDict:
+    """
+    FrozenDict z mapowania; już zamrożone (i puste) bez kopiowania.
+    """
+    if mapping.__class__ is FrozenDict:
+        return mapping  # type: ignore[return-value]
+    return FrozenDict(mapping) if mapping else EMPTY
+
+
+R = TypeVar("R", bound="FrozenRecord")
+
+
+class FrozenRecord:
+    """
+    Baza kompaktowych, niemutowalnych modeli (zamiast frozen dataclass): __slots__ bez __dict__
+    na instancję, porównanie/hash/repr po polach z _fields (kolejność jak w dataclass).
+
+    Znacznik czasu (pole "timestamp"): trzymany surowo w _ts — epoch-ns z time.time_ns()
+    (tanie przy tworzeniu) albo podany string ISO (bez parsowania); ISO dla ns liczone leniwie
+    przy pierwszym odczycie timestamp i zapamiętywane.
+
+    Pola-słowniki (meta/data/params) są zamrażane do FrozenDict przy tworzeniu, więc kopie
+    (with_correlation_id) współdzielą je bez kopiowania.
+    """
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+    _slot_names: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._slot_names = tuple(name for c in reversed(cls.__mro__) for name in c.__dict__.get("__slots__", ()))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def _values(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, f) for f in self._fields)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()  # type: ignore[attr-defined]
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields)
+        return f"{self.__class__.__name__}({body})"
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._slot_names)
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        for name, value in zip(self._slot_names, state):
+            _set(self, name, value)
+
+    def replace(self: R, **changes: Any) -> R:
+        """
+        Kopia ze zmienionymi polami (odpowiednik dataclasses.replace; timestamp przechodzi bez formatowania).
+        """
+        kwargs = {f: (self._ts if f == "timestamp" else getattr(self, f)) for f in self._fields}  # type: ignore[attr-defined]
+        unknown = set(changes) - set(kwargs)
+        if unknown:
+            raise TypeError(f"{self.__class__.__name__}.replace() got unexpected fields: {sorted(unknown)}")
+        kwargs.update(changes)
+        return self.__class__(**kwargs)
+
+    def with_correlation_id(self: R, correlation_id: Optional[str]) -> R:
+        """
+        Kopia z innym correlation_id (dla modeli z tym polem) bez __init__: współdzieli
+        meta/data i sformatowany timestamp. Ten sam correlation_id -> ten sam obiekt.
+        """
+        if self.correlation_id == correlation_id:  # type: ignore[attr-defined]
+            return self
+        new = object.__new__(self.__class__)
+        for name in self._slot_names:
+            _set(new, name, correlation_id if name == "correlation_id" else getattr(self, name))
+        return new
+
+    # ---------- timestamp (dla klas ze slotami _ts/_iso) ----------
+
+    def _init_timestamp(self, timestamp: Timestamp) -> None:
+        _set(self, "_ts", time.time_ns() if timestamp is None else timestamp)
+        _set(self, "_iso", timestamp if isinstance(timestamp, str) else None)
+
+    @property
+    def timestamp(self) -> str:
+        iso = self._iso  # type: ignore[attr-defined]
+        if iso is None:
+            iso = iso_from_ns(self._ts)  # type: ignore[attr-defined]
+            _set(self, "_iso", iso)
+        return iso
+
+    @property
+    def timestamp_ns(self) -> int:
+        ts = self._ts  # type: ignore[attr-defined]
+        return ts if isinstance(ts, int) else ns_from_iso(ts)
+
+
+def _timestamp_from(data: Mapping[str, Any]) -> Timestamp:
+    ts = data.get("timestamp")
+    return None if ts is None else str(ts)
+
+
 # ---------- Message ----------
 
-@dataclass(frozen=True)
-class Message:
+class Message(FrozenRecord):
     """
     Jednolity model wiadomości w systemie.
     Uwaga: zachowuje kompatybilność wstecz: minimalnie sender+content.
     """
+    __slots__ = ("sender", "content", "role", "meta", "correlation_id", "_ts", "_iso")
+    _fields = ("sender", "content", "role", "meta", "timestamp", "correlation_id")
+
     sender: str
     content: str
-    role: Role = "agent"
-    meta: Dict[str, Any] = field(default_factory=dict)
-    timestamp: str = field(default_factory=now_iso)
-    correlation_id: Optional[str] = None
+    role: Role
+    meta: FrozenDict
+    correlation_id: Optional[str]
 
-    def __post_init__(self) -> None:
+    def __init__(
+        self,
+        sender: str,
+        content: str,
+        role: Role = "agent",
+        meta: Optional[Mapping[str, Any]] = None,
+        timestamp: Timestamp = None,
+        correlation_id: Optional[str] = None,
+    ) -> None:
+        _set(self, "sender", sender)
+        _set(self, "content", content)
         # jeśli ktoś tworzy Message("user", "...") bez roli -> ustawiamy sensownie
-        if self.role == "agent":
-            object.__setattr__(self, "role", _role_from_sender(self.sender))
+        _set(self, "role", _role_from_sender(sender) if role == "agent" else role)
+        _set(self, "meta", freeze(meta))
+        _set(self, "correlation_id", correlation_id)
+        self._init_timestamp(timestamp)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "sender": self.sender,
             "content": self.content,
             "role": self.role,
-            "meta": dict(self.meta),
+            "meta": self.meta,
             "timestamp": self.timestamp,
             "correlation_id": self.correlation_id,
         }
@@ -64,32 +231,49 @@ class Message:
             sender=str(data.get("sender", "")),
             content=str(data.get("content", "")),
             role=data.get("role", "agent"),
-            meta=dict(data.get("meta", {})),
-            timestamp=str(data.get("timestamp", now_iso())),
+            meta=freeze(data.get("meta")),
+            timestamp=_timestamp_from(data),
             correlation_id=data.get("correlation_id"),
         )
 
 
 # ---------- Event (nowy, ujednolicony) ----------
 
-@dataclass(frozen=True)
-class Event:
+class Event(FrozenRecord):
     """
     Ujednolicony event MAS (decision/tool_call/observation/critique/...).
     """
+    __slots__ = ("type", "actor", "target", "data", "correlation_id", "_ts", "_iso")
+    _fields = ("type", "actor", "target", "data", "timestamp", "correlation_id")
+
     type: EventType
     actor: str
     target: str
-    data: Dict[str, Any] = field(default_factory=dict)
-    timestamp: str = field(default_factory=now_iso)
-    correlation_id: Optional[str] = None
+    data: FrozenDict
+    correlation_id: Optional[str]
+
+    def __init__(
+        self,
+        type: EventType,
+        actor: str,
+        target: str,
+        data: Optional[Mapping[str, Any]] = None,
+        timestamp: Timestamp = None,
+        correlation_id: Optional[str] = None,
+    ) -> None:
+        _set(self, "type", type)
+        _set(self, "actor", actor)
+        _set(self, "target", target)
+        _set(self, "data", freeze(data))
+        _set(self, "correlation_id", correlation_id)
+        self._init_timestamp(timestamp)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "type": self.type,
             "actor": self.actor,
             "target": self.target,
-            "data": dict(self.data),
+            "data": self.data,
             "timestamp": self.timestamp,
             "correlation_id": self.correlation_id,
         }
@@ -100,33 +284,50 @@ class Event:
             type=data.get("type", "error"),
             actor=str(data.get("actor", "")),
             target=str(data.get("target", "")),
-            data=dict(data.get("data", {})),
-            timestamp=str(data.get("timestamp", now_iso())),
+            data=freeze(data.get("data")),
+            timestamp=_timestamp_from(data),
             correlation_id=data.get("correlation_id"),
         )
 
 
 # ---------- ToolResult (wsteczna kompatybilność) ----------
 
-@dataclass(frozen=True)
-class ToolResult:
+class ToolResult(FrozenRecord):
     """
     W repo istnieją importy `ToolResult` i wrappery retry/recovery.
     Zostaje jako sztywny model.
     """
+    __slots__ = ("ok", "data", "error", "meta", "correlation_id", "_ts", "_iso")
+    _fields = ("ok", "data", "error", "meta", "timestamp", "correlation_id")
+
     ok: bool
-    data: Dict[str, Any] = field(default_factory=dict)
-    error: Optional[str] = None
-    meta: Dict[str, Any] = field(default_factory=dict)
-    timestamp: str = field(default_factory=now_iso)
-    correlation_id: Optional[str] = None
+    data: FrozenDict
+    error: Optional[str]
+    meta: FrozenDict
+    correlation_id: Optional[str]
+
+    def __init__(
+        self,
+        ok: bool,
+        data: Optional[Mapping[str, Any]] = None,
+        error: Optional[str] = None,
+        meta: Optional[Mapping[str, Any]] = None,
+        timestamp: Timestamp = None,
+        correlation_id: Optional[str] = None,
+    ) -> None:
+        _set(self, "ok", ok)
+        _set(self, "data", freeze(data))
+        _set(self, "error", error)
+        _set(self, "meta", freeze(meta))
+        _set(self, "correlation_id", correlation_id)
+        self._init_timestamp(timestamp)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "ok": self.ok,
-            "data": dict(self.data),
+            "data": self.data,
             "error": self.error,
-            "meta": dict(self.meta),
+            "meta": self.meta,
             "timestamp": self.timestamp,
             "correlation_id": self.correlation_id,
         }
@@ -135,27 +336,39 @@ class ToolResult:
     def from_dict(cls: Type["ToolResult"], data: Mapping[str, Any]) -> "ToolResult":
         return cls(
             ok=bool(data.get("ok", False)),
-            data=dict(data.get("data", {})),
+            data=freeze(data.get("data")),
             error=data.get("error"),
-            meta=dict(data.get("meta", {})),
-            timestamp=str(data.get("timestamp", now_iso())),
+            meta=freeze(data.get("meta")),
+            timestamp=_timestamp_from(data),
             correlation_id=data.get("correlation_id"),
         )
 
 
 # ---------- AgentResult ----------
 
-@dataclass(frozen=True)
-class AgentResult:
+class AgentResult(FrozenRecord):
     """
     Standaryzacja wyniku agenta:
     - message: Message (tekst)
     - payload: opcjonalny structured payload (plan/JSON/itp.)
     - events: opcjonalne eventy MAS (np. tool_call/observation)
     """
+    __slots__ = ("message", "payload", "events")
+    _fields = ("message", "payload", "events")
+
     message: Message
-    payload: Optional[Dict[str, Any]] = None
-    events: List[Event] = field(default_factory=list)
+    payload: Optional[Dict[str, Any]]
+    events: List[Event]
+
+    def __init__(
+        self,
+        message: Message,
+        payload: Optional[Dict[str, Any]] = None,
+        events: Optional[List[Event]] = None,
+    ) -> None:
+        _set(self, "message", message)
+        _set(self, "payload", payload)
+        _set(self, "events", [] if events is None else events)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from organizer.core.tool import Tool
+from organizer.tools.gazetteer import Gazetteer, Place, fold, shared_gazetteer
+
+# Reguły odmiany: końcówka formy zależnej -> możliwe końcówki mianownika.
+# Kandydat jest przyjmowany tylko, jeśli istnieje w gazetteerze, więc reguły mogą być szerokie.
+# Kolejność: dłuższe końcówki najpierw (bardziej specyficzne).
+DECLENSION_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("owie", ("ów", "owa", "owo")),   # Krakowie, Częstochowie, Legionowie
+    ("ściu", ("ść",)),                # Zamościu
+    ("ach", ("e", "y", "i")),         # Katowicach, Tychach, Suwałkach
+    ("owa", ("ów",)),                 # (z) Krakowa, Tarnowa
+    ("niu", ("ń",)),                  # Poznaniu, Toruniu
+    ("nia", ("ń",)),                  # (z) Poznania
+    ("cie", ("t",)),                  # Sopocie
+    ("ku", ("ek",)),                  # Włocławku
+    ("iu", ("", "ie")),               # Wrocławiu, Radomiu, Zawierciu
+    ("ie", ("", "a", "o")),           # Lublinie, Warszawie, Lesznie
+    ("em", ("e",)),                   # Zakopanem
+    ("u", ("", "o", "e")),            # Gdańsku, Giżycku, Opolu
+    ("i", ("ia", "", "a")),           # Gdyni, (z) Łodzi
+    ("y", ("a", "", "e")),            # Legnicy, Bydgoszczy, Łomży
+    ("a", ("",)),                     # (z) Gdańska
+)
+
+
+def nominative_candidates(form: str) -> list[str]:
+    """
+    Kandydaci na mianownik (złożone małe litery) dla formy zależnej, wg DECLENSION_RULES.
+    """
+    key = fold(form)
+    out: list[str] = []
+    for suffix, replacements in DECLENSION_RULES:
+        if len(key) > len(suffix) + 1 and key.endswith(suffix):
+            stem = key[: -len(suffix)]
+            out.extend(stem + r for r in replacements)
+    return out
+
+
+def resolve_place(text: str, gazetteer: Gazetteer) -> Place | None:
+    """
+    Mianownik z gazetteera: najpierw dokładna forma (trie), potem reguły odmiany. None = nieznane.
+    """
+    place = gazetteer.lookup(text)
+    if place is not None:
+        return place
+    for candidate in nominative_candidates(text):
+        i = gazetteer.trie.get(candidate)
+        if i is not None:
+            return gazetteer.places[i]
+    return None
+
+
+class NormalizerStats:
+    """
+    Licznik trafień lokalnych (gazetteer + reguły) vs. odwołań do fallbacku (LLM).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.fallback_calls = 0
+        self.unresolved = 0
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            if outcome == "local":
+                self.local_hits += 1
+            elif outcome == "fallback":
+                self.fallback_calls += 1
+            else:
+                self.unresolved += 1
+
+    @property
+    def total(self) -> int:
+        return self.local_hits + self.fallback_calls + self.unresolved
+
+    @property
+    def local_hit_rate(self) -> float:
+        return self.local_hits / self.total if self.total else 0.0
+
+
+@dataclass(frozen=True)
+class LocalCityNormalizerTool:
+    """
+    Offline normalizator polskich nazw miejscowości do mianownika (kontrakt jak OpenAICityNormalizerTool).
+
+    - gazetteer (trie form) + reguły odmiany: typowe przypadki ("Krakowie", "w Gdyni") bez sieci,
+    - nieznane formy -> fallback (np. OpenAICityNormalizerTool); bez fallbacku zwracamy wejście,
+    - stats: trafienia lokalne vs. fallback (local_hit_rate).
+    """
+    name: str = "local_city_normalizer"
+    fallback: Tool | None = None
+    gazetteer: Gazetteer | None = None  # None -> procesowy shared_gazetteer()
+    stats: NormalizerStats = field(default_factory=NormalizerStats, compare=False, repr=False)
+
+    def __call__(self, *, text: str) -> dict[str, Any]:
+        place = self.resolve_local(text)
+        if place is not None:
+            self.stats.record("local")
+            return {"input": text, "nominative": place.name, "source": "gazetteer"}
+
+        if self.fallback is not None:
+            self.stats.record("fallback")
+            return self.fallback(text=text)
+
+        self.stats.record("unresolved")
+        return {"input": text, "nominative": text, "source": "passthrough"}
+
+    def resolve_local(self, text: str) -> Place | None:
+        """
+        Tylko ścieżka lokalna (bez fallbacku i bez liczenia statystyk) — np. do prefetchu.
+        """
+        return resolve_place(text, self.gazetteer or shared_gazetteer())
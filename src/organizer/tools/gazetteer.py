@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import mmap
+import threading
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+DEFAULT_GAZETTEER_PATH = Path(__file__).parent / "data" / "pl_cities.tsv"
+
+
+def fold(text: str) -> str:
+    # klucz wyszukiwania: bez wielkości liter i nadmiarowych spacji ("  KRAKÓW " == "kraków")
+    return " ".join((text or "").split()).casefold()
+
+
+def ascii_fold(text: str) -> str:
+    # fold() bez znaków diakrytycznych: "Łódź" -> "lodz" (ł nie rozkłada się w NFKD)
+    decomposed = unicodedata.normalize("NFKD", fold(text).replace("ł", "l"))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+@dataclass(frozen=True)
+class Place:
+    """
+    Miejscowość z gazetteera: nazwa w mianowniku + współrzędne (+ kraj, jeśli źródło go podaje).
+    """
+    name: str
+    latitude: float
+    longitude: float
+    country: str | None = None  # None -> domyślny kraj geokodera
+
+
+class _Node:
+    __slots__ = ("children", "place")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.place: int = -1  # indeks w Gazetteer.places (-1 = brak)
+
+
+class FormTrie:
+    """
+    Trie form nazw (mianownik + odmiany) -> indeks miejscowości.
+    Węzły ze __slots__; wspólne prefiksy (Gorzów/Gorzowie/Gorzowa) zajmują pamięć raz.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._size = 0
+
+    def insert(self, key: str, place: int) -> None:
+        node = self._root
+        for ch in key:
+            nxt = node.children.get(ch)
+            if nxt is None:
+                nxt = node.children[ch] = _Node()
+            node = nxt
+        if node.place < 0:
+            self._size += 1
+        node.place = place
+
+    def get(self, key: str) -> int | None:
+        node = self._root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node.place if node.place >= 0 else None
+
+    def with_prefix(self, prefix: str, limit: int = 10) -> list[tuple[str, int]]:
+        node = self._root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        out: list[tuple[str, int]] = []
+        stack: list[tuple[str, _Node]] = [(prefix, node)]
+        while stack and len(out) < limit:
+            key, node = stack.pop()
+            if node.place >= 0:
+                out.append((key, node.place))
+            for ch in sorted(node.children, reverse=True):
+                stack.append((key + ch, node.children[ch]))
+        return out
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class Gazetteer:
+    """
+    Słownik polskich miejscowości (TSV: name, latitude, longitude, forms) z trie form nazw.
+
+    forms: odmiany nieregularne (Łodzi, Gnieźnie, Zielonej Górze) — regularne odmiany
+    rozpoznaje silnik reguł w organizer.tools.city_normalizer.
+    """
+
+    def __init__(self, places: list[Place], forms: dict[str, int] | None = None):
+        self.places = places
+        self.trie = FormTrie()
+        for i, place in enumerate(places):
+            self.trie.insert(fold(place.name), i)
+        for form, i in (forms or {}).items():
+            self.trie.insert(fold(form), i)
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_GAZETTEER_PATH) -> "Gazetteer":
+        places: list[Place] = []
+        forms: dict[str, int] = {}
+        with Path(path).open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                cols = line.rstrip("\n").split("\t")
+                name, lat, lon = cols[0].strip(), float(cols[1]), float(cols[2])
+                places.append(Place(name=name, latitude=lat, longitude=lon))
+                extra = cols[3] if len(cols) > 3 else ""
+                for form in extra.split(","):
+                    if form.strip():
+                        forms[form.strip()] = len(places) - 1
+        return cls(places, forms)
+
+    @classmethod
+    def load_geonames(
+        cls,
+        path: str | Path,
+        *,
+        country_code: str | None = "PL",
+        min_population: int = 0,
+        feature_class: str = "P",
+    ) -> "Gazetteer":
+        """
+        Wczytuje zrzut GeoNames (TSV: geonameid, name, asciiname, alternatenames, latitude, longitude,
+        feature class, feature code, country code, ..., population). Plik jest mapowany w pamięć (mmap),
+        więc duże zrzuty (allCountries) nie są wczytywane w całości do pamięci Pythona.
+        alternatenames trafiają do trie jako formy (np. odmiany i nazwy obce); country code -> Place.country.
+        """
+        places: list[Place] = []
+        forms: dict[str, int] = {}
+        with Path(path).open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                cols = raw.decode("utf-8").rstrip("\n").split("\t")
+                if len(cols) < 15 or cols[6] != feature_class:
+                    continue
+                if country_code is not None and cols[8] != country_code:
+                    continue
+                try:
+                    population = int(cols[14] or 0)
+                    lat, lon = float(cols[4]), float(cols[5])
+                except ValueError:
+                    continue
+                if population < min_population:
+                    continue
+                places.append(Place(name=cols[1], latitude=lat, longitude=lon, country=cols[8] or None))
+                for alt in cols[3].split(","):
+                    if alt.strip():
+                        forms.setdefault(alt.strip(), len(places) - 1)
+        return cls(places, forms)
+
+    def lookup(self, text: str) -> Place | None:
+        """
+        Dokładne dopasowanie formy (mianownik albo znana odmiana), bez reguł.
+        """
+        i = self.trie.get(fold(text))
+        return None if i is None else self.places[i]
+
+    def __iter__(self) -> Iterator[Place]:
+        return iter(self.places)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+
+_shared: Gazetteer | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_gazetteer() -> Gazetteer:
+    """
+    Procesowy gazetteer wczytywany leniwie z DEFAULT_GAZETTEER_PATH.
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = Gazetteer.load()
+    return _shared
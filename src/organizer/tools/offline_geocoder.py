@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from organizer.core.tool import Tool
+from organizer.tools.city_normalizer import nominative_candidates, resolve_place
+from organizer.tools.gazetteer import FormTrie, Gazetteer, Place, ascii_fold, shared_gazetteer
+
+
+def levenshtein(a: str, b: str, limit: int | None = None) -> int:
+    """
+    Odległość edycyjna (wstawienie/usunięcie/zamiana). limit: wcześniejsze przerwanie,
+    gdy wynik na pewno go przekroczy (zwraca wtedy limit + 1).
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if limit is not None and min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def trigrams(key: str) -> list[str]:
+    # z dopełnieniem brzegów: "lodz" -> "$$l", "$lo", "lod", "odz", "dz$", "z$$"
+    padded = f"$${key}$$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class TrigramIndex:
+    """
+    Indeks odwrócony trigram -> klucze (ascii_fold). Kandydatów na literówki filtruje
+    lemat q-gramowy (k edycji niszczy najwyżej 3k trigramów), a dokładną odległość
+    liczy levenshtein() z limitem tylko dla tych nielicznych kandydatów.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, list[int]] = {}
+        self._keys: list[str] = []
+        self._places: list[int] = []
+
+    def insert(self, key: str, place: int) -> None:
+        slot = len(self._keys)
+        self._keys.append(key)
+        self._places.append(place)
+        for gram in set(trigrams(key)):
+            self._postings.setdefault(gram, []).append(slot)
+
+    def search(self, key: str, max_distance: int) -> list[tuple[int, str, int]]:
+        """
+        (odległość, klucz, indeks miejscowości) w promieniu max_distance, od najbliższych.
+        """
+        grams = trigrams(key)
+        shared: dict[int, int] = {}
+        for gram in set(grams):
+            for slot in self._postings.get(gram, ()):
+                shared[slot] = shared.get(slot, 0) + 1
+
+        out: list[tuple[int, str, int]] = []
+        for slot, common in shared.items():
+            candidate = self._keys[slot]
+            if common < max(len(grams), len(candidate) + 2) - 3 * max_distance:
+                continue
+            d = levenshtein(key, candidate, limit=max_distance)
+            if d <= max_distance:
+                out.append((d, candidate, self._places[slot]))
+        out.sort()
+        return out
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def max_typos(key: str) -> int:
+    # krótkie nazwy (Ełk, Nysa) przy 2 literówkach pasowałyby do połowy gazetteera
+    if len(key) <= 3:
+        return 0
+    return 1 if len(key) <= 6 else 2
+
+
+@dataclass(frozen=True)
+class GeocodeMatch:
+    place: Place
+    match: str  # "exact" | "prefix" | "fuzzy"
+    distance: int = 0
+
+
+class GeocoderIndex:
+    """
+    Indeksy wyszukiwania nad Gazetteer (budowane raz, tylko do odczytu):
+    - gazetteer.trie: dokładne formy z polskimi znakami (+ reguły odmiany w resolve_place),
+    - ascii: trie kluczy bez diakrytyków ("Lodz", "Krakowie" pisane bez ogonków) i prefiksy ("Gdan"),
+    - trigrams: indeks trigramowy nad tymi samymi kluczami — literówki ("Krakw", "Warszwa").
+    """
+
+    def __init__(self, gazetteer: Gazetteer):
+        self.gazetteer = gazetteer
+        self.ascii = FormTrie()
+        self.trigrams = TrigramIndex()
+        self._positions: dict[Place, int] = {}
+        for i, place in enumerate(gazetteer.places):
+            self._positions.setdefault(place, i)
+        keys: dict[str, int] = {}
+        for key, i in gazetteer.trie.with_prefix("", limit=len(gazetteer.trie)):
+            keys.setdefault(ascii_fold(key), i)
+        # mianowniki mają pierwszeństwo przed odmianami o tym samym kluczu ascii
+        for i, place in enumerate(gazetteer.places):
+            keys[ascii_fold(place.name)] = i
+        for key, i in keys.items():
+            self.ascii.insert(key, i)
+            self.trigrams.insert(key, i)
+
+    def search(self, text: str, limit: int = 1, *, approximate: bool = True) -> list[GeocodeMatch]:
+        """
+        approximate=False: tylko dopasowania dokładne (formy, odmiany, pisownia bez ogonków) —
+        bez prefiksów i literówek.
+        """
+        limit = max(1, limit)
+        out: list[GeocodeMatch] = []
+        seen: set[int] = set()
+
+        def add(i: int, match: str, distance: int = 0) -> bool:
+            if i not in seen:
+                seen.add(i)
+                out.append(GeocodeMatch(self.gazetteer.places[i], match, distance))
+            return len(out) >= limit
+
+        place = resolve_place(text, self.gazetteer)
+        if place is not None and add(self._positions[place], "exact"):
+            return out
+
+        key = ascii_fold(text)
+        if not key:
+            return out
+        for candidate in (key, *nominative_candidates(key)):
+            i = self.ascii.get(candidate)
+            if i is not None and add(i, "exact"):
+                return out
+        if not approximate:
+            return out
+
+        if len(key) >= 3:
+            for _, i in self.ascii.with_prefix(key, limit=limit):
+                if add(i, "prefix"):
+                    return out
+
+        for distance, _, i in self.trigrams.search(key, max_typos(key)):
+            if add(i, "fuzzy", distance):
+                return out
+        return out
+
+
+_shared: GeocoderIndex | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_geocoder_index() -> GeocoderIndex:
+    """
+    Procesowy indeks nad shared_gazetteer() — budowany leniwie, raz.
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = GeocoderIndex(shared_gazetteer())
+    return _shared
+
+
+@dataclass(frozen=True)
+class OfflineGeocoderTool:
+    """
+    Lokalny geokoder (kontrakt i format odpowiedzi jak OpenMeteoGeocodingTool) nad gazetteerem.
+
+    - domyślna nazwa "fallback_geocoder" — ta, którą RecoveryAgent wskazuje w FixPlan,
+    - jako geokoder główny: OpenMeteoWeatherTool(geocoding=OfflineGeocoderTool(fallback=OpenMeteoGeocodingTool())),
+      a zdalne wyszukiwanie tylko dla miejsc spoza gazetteera,
+    - rozpoznaje formy odmienione ("Warszawie"), pisownię bez ogonków, prefiksy i literówki.
+
+    Z fallbackiem lokalnie rozstrzygane są tylko dopasowania dokładne; prefiksy i literówki dopiero,
+    gdy fallback nic nie znalazł albo rzucił wyjątek (inaczej "Wadowice" -> Katowice zamiast zdalnego wyniku).
+    """
+    name: str = "fallback_geocoder"
+    fallback: Tool | None = None
+    index: GeocoderIndex | None = None  # None -> shared_geocoder_index()
+    country: str = "Poland"  # tylko dla miejsc bez kraju w gazetteerze (domyślny TSV)
+
+    def __call__(self, *, location: str, count: int = 1, language: str = "en") -> dict[str, Any]:
+        index = self.index or shared_geocoder_index()
+        if self.fallback is None:
+            return self._payload(index.search(location, limit=count))
+
+        matches = index.search(location, limit=count, approximate=False)
+        if matches:
+            return self._payload(matches)
+        try:
+            remote = self.fallback(location=location, count=count, language=language)
+        except Exception:
+            # zdalny geokoder leży: prefiks/literówka z gazetteera lepsze niż błąd całego wyszukiwania
+            matches = index.search(location, limit=count)
+            if matches:
+                return self._payload(matches)
+            raise
+        if remote.get("results"):
+            return remote
+        return self._payload(index.search(location, limit=count))
+
+    def _payload(self, matches: list[GeocodeMatch]) -> dict[str, Any]:
+        return {
+            "results": [
+                {
+                    "name": m.place.name,
+                    "latitude": m.place.latitude,
+                    "longitude": m.place.longitude,
+                    "country": m.place.country or self.country,
+                    "match": m.match,
+                    "source": "gazetteer",
+                }
+                for m in matches
+            ]
+        }
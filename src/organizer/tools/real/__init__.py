@@ -3,6 +3,21 @@ from .ticketmaster import TicketmasterEventsTool
 from .housing_stub import RealHousingToolStub
 from .openai_city_normalizer import OpenAICityNormalizerTool
 from .openai_recovery import OpenAIRecoveryTool
+from .forecast_cache import ForecastCache
+from .geocoding_cache import GeocodingCache, GeoPoint
+from .hourly_series import HourlySeries, DailyStats, WeatherWindow
+from .llm_client import (
+    Completion,
+    FakeCompletionBackend,
+    LlmClient,
+    LlmClientConfig,
+    OpenAIBackend,
+    configure_shared_llm,
+    close_shared_llm,
+    shared_llm,
+)
+from .llm_cache import LlmResponseCache
+from .http import HttpPoolConfig, SharedHttpClient, shared_http, configure_shared_http, close_shared_http
 
 __all__ = [
     "OpenMeteoWeatherTool",
@@ -11,4 +26,24 @@ __all__ = [
     "RealHousingToolStub",
     "OpenAICityNormalizerTool",
     "OpenAIRecoveryTool",
+    "ForecastCache",
+    "GeocodingCache",
+    "GeoPoint",
+    "HourlySeries",
+    "DailyStats",
+    "WeatherWindow",
+    "HttpPoolConfig",
+    "SharedHttpClient",
+    "shared_http",
+    "configure_shared_http",
+    "close_shared_http",
+    "Completion",
+    "FakeCompletionBackend",
+    "LlmClient",
+    "LlmClientConfig",
+    "OpenAIBackend",
+    "shared_llm",
+    "configure_shared_llm",
+    "close_shared_llm",
+    "LlmResponseCache",
 ]
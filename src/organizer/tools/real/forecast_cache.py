@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from organizer.core.concurrency import submit
+from organizer.core.deadline import without_deadline
+
+Loader = Callable[[], Any]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float
+    expires_at: float
+    loader: Loader
+    hot: bool = False  # trafiony tuż przed granicą cyklu
+    refreshing: bool = False
+
+
+class ForecastCache:
+    """
+    Cache okna prognozy: jedno pobranie 7 dni (godzinowo) obsługuje każdą datę dla danej lokalizacji.
+
+    Klucz: (lat, lon) zaokrąglone do coord_precision miejsc (~1 km przy 2).
+    TTL wyrównany do cyklu aktualizacji modelu: wpis wygasa na najbliższej granicy
+    update_interval_seconds (+ update_offset_seconds), czyli wtedy, gdy provider i tak ma nowe dane.
+
+    Refresh-ahead: trafienie w ostatnich refresh_ahead_seconds przed wygaśnięciem oznacza wpis
+    jako gorący. Pierwsze trafienie w gorący wpis po granicy cyklu (do refresh_ahead_seconds po niej)
+    dostaje jeszcze starą wartość i zleca odświeżenie w tle — gorące miasta nie trafiają na zimny
+    miss, a pobranie następuje dopiero po aktualizacji modelu. Jak każdy wpis, odświeżony obowiązuje
+    do granicy cyklu liczonej od własnego fetched_at.
+    """
+
+    def __init__(
+        self,
+        *,
+        update_interval_seconds: float = 3600.0,
+        update_offset_seconds: float = 0.0,
+        refresh_ahead_seconds: float = 300.0,
+        max_entries: int = 1024,
+        coord_precision: int = 2,
+        clock: Callable[[], float] = time.time,
+        submit_fn: Callable[..., Any] = submit,
+    ):
+        if update_interval_seconds <= 0:
+            raise ValueError("update_interval_seconds must be > 0")
+
+        self._interval = update_interval_seconds
+        self._offset = update_offset_seconds
+        self._refresh_ahead = max(0.0, refresh_ahead_seconds)
+        self._max_entries = max(1, max_entries)
+        self._precision = coord_precision
+        self._clock = clock
+        self._submit = submit_fn
+
+        self._entries: "OrderedDict[tuple[float, float], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def key(self, lat: float, lon: float) -> tuple[float, float]:
+        return round(float(lat), self._precision), round(float(lon), self._precision)
+
+    def expires_at(self, fetched_at: float) -> float:
+        # następna granica cyklu aktualizacji (czas ścienny, nie "fetched_at + ttl")
+        slot = math.floor((fetched_at - self._offset) / self._interval) + 1
+        return slot * self._interval + self._offset
+
+    def get_or_load(self, lat: float, lon: float, loader: Loader) -> Any:
+        key = self.key(lat, lon)
+        now = self._clock()
+
+        refresh = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                if now >= entry.expires_at - self._refresh_ahead:
+                    entry.hot = True
+                value = entry.value
+            elif entry is not None and entry.hot and now < entry.expires_at + self._refresh_ahead:
+                # po granicy cyklu: stara wartość, a pobranie (już nowych danych) w tle
+                self.hits += 1
+                self._entries.move_to_end(key)
+                if not entry.refreshing:
+                    entry.refreshing = refresh = True
+                value = entry.value
+            else:
+                self.misses += 1
+                entry = None
+
+        if entry is not None:
+            # odświeżenie zlecamy poza blokadą (loader robi HTTP)
+            if refresh:
+                self._submit(without_deadline, self._refresh, key, loader)  # bez deadline'u tej rundy
+            return value
+
+        value = loader()
+        self._store(key, value, loader)
+        return value
+
+    def peek(self, lat: float, lon: float) -> Any | None:
+        """
+        Wartość bez ładowania (None, jeśli brak lub wygasła).
+        """
+        with self._lock:
+            entry = self._entries.get(self.key(lat, lon))
+            if entry is None or self._clock() >= entry.expires_at:
+                return None
+            return entry.value
+
+    def put(self, lat: float, lon: float, value: Any, loader: Loader) -> None:
+        """
+        Zapis wartości pobranej poza get_or_load (np. batchem); loader służy do refresh-ahead.
+        """
+        self._store(self.key(lat, lon), value, loader)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------- internal ----------
+
+    def _store(self, key: tuple[float, float], value: Any, loader: Loader) -> None:
+        fetched_at = self._clock()
+        with self._lock:
+            self._entries[key] = _Entry(
+                value=value,
+                fetched_at=fetched_at,
+                expires_at=self.expires_at(fetched_at),
+                loader=loader,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key: tuple[float, float], loader: Loader) -> None:
+        try:
+            value = loader()
+        except Exception:
+            # odświeżenie w tle nie może wysadzić ruchu; kolejne zapytanie to zwykły miss
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.hot = entry.refreshing = False
+            return
+
+        self._store(key, value, loader)
+        with self._lock:
+            self.refreshes += 1
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    """
+    Wynik geokodowania: współrzędne + nazwa do pokazania użytkownikowi (np. "Kraków, Poland").
+    """
+    latitude: float
+    longitude: float
+    name: str
+
+
+def normalize_location(location: str) -> str:
+    # "  kraków " i "KRAKÓW" to ten sam klucz
+    return " ".join((location or "").split()).casefold()
+
+
+class GeocodingCache:
+    """
+    Cache geokodowania: LRU w RAM przed trwałym magazynem SQLite.
+
+    Klucz: (znormalizowana lokalizacja, język). Współrzędne miast praktycznie się nie zmieniają,
+    więc wpisy nie mają TTL. path=None -> tylko RAM (np. testy).
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS geocode ("
+        " location TEXT NOT NULL,"
+        " language TEXT NOT NULL,"
+        " latitude REAL NOT NULL,"
+        " longitude REAL NOT NULL,"
+        " name TEXT NOT NULL,"
+        " updated_at REAL NOT NULL,"
+        " PRIMARY KEY (location, language))"
+    )
+
+    def __init__(self, path: str | Path | None = None, *, max_memory_entries: int = 4096):
+        self._memory: "OrderedDict[tuple[str, str], GeoPoint]" = OrderedDict()
+        self._max_memory = max(1, max_memory_entries)
+        self._lock = threading.Lock()
+
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            p = Path(path)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(p), check_same_thread=False)
+            self._db.execute(self._SCHEMA)
+            self._db.commit()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, location: str, language: str = "en") -> GeoPoint | None:
+        key = (normalize_location(location), language)
+        with self._lock:
+            point = self._memory.get(key)
+            if point is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return point
+
+            point = self._load(key)
+            if point is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._remember(key, point)
+            return point
+
+    def put(self, location: str, language: str, point: GeoPoint) -> None:
+        key = (normalize_location(location), language)
+        with self._lock:
+            self._remember(key, point)
+            self._store(key, point)
+            if self._db is not None:
+                self._db.commit()
+
+    def preload_jsonl(self, *paths: str | Path) -> int:
+        """
+        Rozgrzewa cache z plików JSONL (np. history/trace_*.jsonl). Zwraca liczbę wczytanych wpisów.
+
+        Rozpoznawane linie:
+        - rekord cache: {"location", "language"?, "latitude", "longitude", "name"?}
+        - TraceEvent/Event: params/data z location + latitude + longitude (np. wynik geokodowania)
+        Pozostałe linie (decision/route/respond, uszkodzony JSON) są pomijane.
+        """
+        loaded = 0
+        with self._lock:
+            for path in paths:
+                p = Path(path)
+                if not p.is_file():
+                    continue
+                with p.open("r", encoding="utf-8") as f:
+                    for line in f:
+                        record = self._record_from_line(line)
+                        if record is None:
+                            continue
+                        location, language, point = record
+                        key = (normalize_location(location), language)
+                        self._remember(key, point)
+                        self._store(key, point)
+                        loaded += 1
+            if self._db is not None:
+                self._db.commit()
+        return loaded
+
+    def export_jsonl(self, path: str | Path) -> int:
+        """
+        Zrzuca wpisy (RAM + SQLite) jako rekordy cache w JSONL — format czytany przez preload_jsonl().
+        """
+        with self._lock:
+            entries = dict(self._memory)
+            if self._db is not None:
+                for loc, lang, lat, lon, name in self._db.execute(
+                    "SELECT location, language, latitude, longitude, name FROM geocode"
+                ):
+                    entries.setdefault((loc, lang), GeoPoint(latitude=lat, longitude=lon, name=name))
+
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with p.open("w", encoding="utf-8") as f:
+            for (loc, lang), point in entries.items():
+                record = {"location": loc, "language": lang, "latitude": point.latitude,
+                          "longitude": point.longitude, "name": point.name}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(entries)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # ---------- internal ----------
+
+    def _remember(self, key: tuple[str, str], point: GeoPoint) -> None:
+        self._memory[key] = point
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: tuple[str, str]) -> GeoPoint | None:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT latitude, longitude, name FROM geocode WHERE location = ? AND language = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        return GeoPoint(latitude=float(row[0]), longitude=float(row[1]), name=str(row[2]))
+
+    def _store(self, key: tuple[str, str], point: GeoPoint) -> None:
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO geocode (location, language, latitude, longitude, name, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key[0], key[1], point.latitude, point.longitude, point.name, time.time()),
+        )
+
+    @staticmethod
+    def _record_from_line(line: str) -> tuple[str, str, GeoPoint] | None:
+        try:
+            raw = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(raw, dict):
+            return None
+
+        candidates: Iterable[Any] = (raw, raw.get("params"), raw.get("data"))
+        for c in candidates:
+            if not isinstance(c, Mapping):
+                continue
+            try:
+                location = str(c["location"])
+                lat = float(c["latitude"])
+                lon = float(c["longitude"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            name = str(c.get("name") or c.get("resolved_name") or location)
+            language = str(c.get("language") or "en")
+            return location, language, GeoPoint(latitude=lat, longitude=lon, name=name)
+        return None
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+from datetime import date as Date, datetime, timedelta
+from typing import Any, Mapping
+
+_HOUR = timedelta(hours=1)
+
+
+@dataclass(frozen=True)
+class DailyStats:
+    temp_min: float
+    temp_max: float
+    temp_mean: float
+    precip_max: float
+
+
+@dataclass(frozen=True)
+class WeatherWindow:
+    """
+    Okno [start_hour, end_hour) w danym dniu, np. najlepsze na aktywności outdoor.
+    """
+    day: Date
+    start_hour: int
+    end_hour: int
+    precip_mean: float
+    temp_mean: float
+
+    def label(self) -> str:
+        return f"{self.start_hour:02d}:00–{self.end_hour:02d}:00"
+
+
+def _to_float(x: Any) -> float:
+    # Open-Meteo potrafi zwrócić null dla brakujących godzin
+    return math.nan if x is None else float(x)
+
+
+class HourlySeries:
+    """
+    Prognoza godzinowa sparsowana raz do zwartej postaci (array('d')) z indeksem (dzień, godzina).
+
+    - ciągła seria co 1h (typowy przypadek): indeks liczony arytmetycznie od pierwszej godziny,
+    - seria z lukami: słownik "YYYY-MM-DDTHH" -> indeks.
+    Oba warianty dają lookup O(1) zamiast skanowania listy czasów.
+    """
+
+    __slots__ = ("_start", "_index", "_days", "temperature", "precipitation")
+
+    def __init__(self, times: list[str], temperature: array, precipitation: array):
+        if not (len(times) == len(temperature) == len(precipitation)):
+            raise ValueError("HourlySeries: times/temperature/precipitation must have equal length")
+
+        self.temperature = temperature
+        self.precipitation = precipitation
+        self._start: datetime | None = None
+        self._index: dict[str, int] | None = None
+        self._days: dict[Date, tuple[int, int]] = {}
+
+        if not times:
+            return
+
+        first = datetime.fromisoformat(times[0])
+        last = datetime.fromisoformat(times[-1])
+        if last - first == _HOUR * (len(times) - 1):
+            self._start = first
+            day = first.date()
+            while True:
+                lo = self._offset(datetime.combine(day, datetime.min.time()))
+                hi = lo + 24
+                if hi <= 0:
+                    day += timedelta(days=1)
+                    continue
+                if lo >= len(times):
+                    break
+                self._days[day] = (max(lo, 0), min(hi, len(times)))
+                day += timedelta(days=1)
+        else:
+            self._index = {}
+            for i, t in enumerate(times):
+                self._index[t[:13]] = i
+                d = Date.fromisoformat(t[:10])
+                lo, _ = self._days.get(d, (i, i))
+                self._days[d] = (lo, i + 1)
+
+    @classmethod
+    def from_hourly(cls, hourly: Mapping[str, Any]) -> "HourlySeries":
+        """
+        Buduje serię z sekcji "hourly" odpowiedzi Open-Meteo.
+        """
+        times = list(hourly.get("time", []))
+        temps = array("d", (_to_float(x) for x in hourly.get("temperature_2m", [])))
+        precs = array("d", (_to_float(x) for x in hourly.get("precipitation_probability", [])))
+        return cls(times, temps, precs)
+
+    def __len__(self) -> int:
+        return len(self.temperature)
+
+    def days(self) -> list[Date]:
+        return sorted(self._days)
+
+    def index(self, day: Date, hour: int) -> int | None:
+        if self._start is not None:
+            i = self._offset(datetime(day.year, day.month, day.day, hour))
+            return i if 0 <= i < len(self) else None
+        assert self._index is not None
+        return self._index.get(f"{day.isoformat()}T{hour:02d}")
+
+    def at(self, day: Date, hour: int) -> tuple[float, float] | None:
+        """
+        (temperatura, prawdopodobieństwo opadów) dla danej godziny albo None.
+        """
+        i = self.index(day, hour)
+        if i is None:
+            return None
+        return self.temperature[i], self.precipitation[i]
+
+    def first_of_day(self, day: Date) -> tuple[float, float] | None:
+        bounds = self._days.get(day)
+        if bounds is None:
+            return None
+        return self.temperature[bounds[0]], self.precipitation[bounds[0]]
+
+    def daily_stats(self, day: Date) -> DailyStats | None:
+        bounds = self._days.get(day)
+        if bounds is None:
+            return None
+        lo, hi = bounds
+        temps = [t for t in self.temperature[lo:hi] if not math.isnan(t)]
+        precs = [p for p in self.precipitation[lo:hi] if not math.isnan(p)]
+        if not temps:
+            return None
+        return DailyStats(
+            temp_min=min(temps),
+            temp_max=max(temps),
+            temp_mean=sum(temps) / len(temps),
+            precip_max=max(precs) if precs else math.nan,
+        )
+
+    def best_window(self, day: Date, hours: int = 3, *, start_hour: int = 8, end_hour: int = 22) -> WeatherWindow | None:
+        """
+        Okno `hours` godzin z najniższym średnim prawdopodobieństwem opadów
+        (remis: wyższa średnia temperatura), przesuwana suma O(n).
+        """
+        if hours < 1:
+            raise ValueError("hours must be >= 1")
+
+        idx = [self.index(day, h) for h in range(start_hour, end_hour)]
+        if any(i is None for i in idx) or len(idx) < hours:
+            return None
+
+        lo = idx[0]
+        if idx[-1] - lo == len(idx) - 1:
+            precs = self.precipitation[lo : lo + len(idx)]
+            temps = self.temperature[lo : lo + len(idx)]
+        else:
+            precs = array("d", (self.precipitation[i] for i in idx))
+            temps = array("d", (self.temperature[i] for i in idx))
+
+        p_sum = sum(precs[:hours])
+        t_sum = sum(temps[:hours])
+        best = (p_sum, -t_sum, 0)
+        for s in range(1, len(idx) - hours + 1):
+            p_sum += precs[s + hours - 1] - precs[s - 1]
+            t_sum += temps[s + hours - 1] - temps[s - 1]
+            best = min(best, (p_sum, -t_sum, s))
+
+        p_sum, neg_t, s = best
+        return WeatherWindow(
+            day=day,
+            start_hour=start_hour + s,
+            end_hour=start_hour + s + hours,
+            precip_mean=p_sum / hours,
+            temp_mean=-neg_t / hours,
+        )
+
+    # ---------- internal ----------
+
+    def _offset(self, when: datetime) -> int:
+        assert self._start is not None
+        return int((when - self._start) // _HOUR)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+import httpx
+
+from organizer.core.deadline import request_timeout
+
+
+@dataclass(frozen=True)
+class HttpPoolConfig:
+    """
+    Konfiguracja współdzielonej puli połączeń HTTP dla realnych narzędzi.
+
+    max_connections / max_keepalive_connections: limity całej puli (httpx.Limits)
+    keepalive_expiry_seconds: jak długo trzymamy bezczynne połączenie (TCP+TLS do ponownego użycia)
+    max_connections_per_host: limit równoległych żądań do jednego hosta (ochrona providera)
+    http2: HTTP/2 (wymaga pakietu `h2`; bez niego po cichu zostajemy na HTTP/1.1)
+    """
+    timeout_seconds: float = 10.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    max_connections_per_host: int = 10
+    http2: bool = False
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class SharedHttpClient:
+    """
+    Jeden klient sync (httpx.Client) na proces i jeden async (httpx.AsyncClient) na pętlę zdarzeń,
+    z pulą keep-alive i limitem połączeń per host.
+
+    Klienci tworzeni są leniwie. Pula httpx.AsyncClient i asyncio.Semaphore należą do pętli,
+    w której powstały — dlatego klient async i jego limity per host są osobne dla każdej pętli
+    (WeakKeyDictionary: znikają razem z pętlą).
+    """
+
+    def __init__(
+        self,
+        config: HttpPoolConfig | None = None,
+        *,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._config = config or HttpPoolConfig()
+        self._transport = transport
+        self._async_transport = async_transport
+
+        self._client: httpx.Client | None = None
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._async_host_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._closing: set[asyncio.Task] = set()
+
+    @property
+    def config(self) -> HttpPoolConfig:
+        return self._config
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_kwargs(), transport=self._transport)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Klient async bieżącej pętli (wołać z wnętrza pętli).
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    **self._client_kwargs(), transport=self._async_transport
+                )
+        return client
+
+    def get(
+        self,
+        url: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        with self._host_slot(url):
+            return self.client.get(url, params=params, headers=headers, timeout=self._timeout(timeout))
+
+    async def aget(
+        self,
+        url: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        async with self._async_host_slot(url):
+            return await self.async_client.get(url, params=params, headers=headers, timeout=self._timeout(timeout))
+
+    def close(self) -> None:
+        for loop, async_client in self._detach():
+            self._close_on(loop, async_client)
+
+    async def aclose(self) -> None:
+        current = asyncio.get_running_loop()
+        for loop, async_client in self._detach():
+            if loop is current:
+                await async_client.aclose()
+            else:
+                self._close_on(loop, async_client)
+
+    # ---------- internal ----------
+
+    def _detach(self) -> list[tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]]:
+        # zamyka klienta sync; zwraca klientów async do zamknięcia w ich pętlach
+        with self._lock:
+            client, self._client = self._client, None
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+            self._async_host_slots.clear()
+        if client is not None:
+            client.close()
+        return async_clients
+
+    def _close_on(self, loop: asyncio.AbstractEventLoop, async_client: httpx.AsyncClient) -> None:
+        # aclose() musi biec w pętli klienta; zamkniętej pętli nie da się już użyć — połączenia zbierze GC
+        if loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is running:
+            task = loop.create_task(async_client.aclose())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(async_client.aclose(), loop)
+        else:
+            loop.run_until_complete(async_client.aclose())
+
+    def _client_kwargs(self) -> dict[str, Any]:
+        return {
+            "timeout": self._config.timeout_seconds,
+            "limits": self._config.limits(),
+            "http2": self._config.http2 and http2_available(),
+        }
+
+    def _timeout(self, timeout: float | None) -> float | None:
+        # nie dłużej niż pozostały budżet rundy (deadline z Orchestrator.handle)
+        return request_timeout(self._config.timeout_seconds if timeout is None else timeout)
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = httpx.URL(url).host
+        slot = self._host_slots.get(host)
+        if slot is None:
+            with self._lock:
+                slot = self._host_slots.setdefault(
+                    host, threading.BoundedSemaphore(self._config.max_connections_per_host)
+                )
+        return slot
+
+    def _async_host_slot(self, url: str) -> asyncio.Semaphore:
+        # asyncio.Semaphore należy do pętli — osobny zestaw per pętla
+        host = httpx.URL(url).host
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._async_host_slots.get(loop)
+            if slots is None:
+                slots = self._async_host_slots[loop] = {}
+            slot = slots.get(host)
+            if slot is None:
+                slot = slots[host] = asyncio.Semaphore(self._config.max_connections_per_host)
+        return slot
+
+
+_shared: SharedHttpClient | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_http() -> SharedHttpClient:
+    """
+    Procesowy klient HTTP używany domyślnie przez wszystkie realne narzędzia.
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = SharedHttpClient()
+    return _shared
+
+
+def configure_shared_http(
+    config: HttpPoolConfig | None = None,
+    *,
+    transport: httpx.BaseTransport | None = None,
+    async_transport: httpx.AsyncBaseTransport | None = None,
+) -> SharedHttpClient:
+    """
+    Podmienia procesowego klienta (np. HTTP/2, inne limity, MockTransport w testach).
+    Poprzedni klient jest zamykany.
+    """
+    global _shared
+    new = SharedHttpClient(config, transport=transport, async_transport=async_transport)
+    with _shared_lock:
+        old, _shared = _shared, new
+    if old is not None:
+        old.close()
+    return new
+
+
+def close_shared_http() -> None:
+    """
+    Hook zamknięcia dla CLI/serwera: zamyka pulę połączeń. Kolejne użycie utworzy nową.
+    """
+    global _shared
+    with _shared_lock:
+        old, _shared = _shared, None
+    if old is not None:
+        old.close()
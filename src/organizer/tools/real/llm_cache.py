@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Mapping, Sequence
+
+from organizer.tools.real.llm_client import Completion
+
+
+def cache_key(
+    *,
+    model: str,
+    temperature: float | None,
+    messages: Sequence[Mapping[str, str]],
+    response_format: Mapping[str, Any] | None,
+    prompt_version: str | None = None,
+    version: str = "1",
+) -> str:
+    """
+    Adres treści zapytania: sha256 z kanonicznego JSON-a (posortowane klucze, bez zbędnych spacji).
+    """
+    payload = {
+        "v": version,
+        "prompt": prompt_version,
+        "model": model,
+        "temperature": temperature,
+        "messages": [dict(m) for m in messages],
+        "response_format": dict(response_format) if response_format is not None else None,
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCache:
+    """
+    Cache odpowiedzi LLM dla deterministycznych zapytań (temperature=0): LRU w RAM przed SQLite.
+
+    Klucz: cache_key(model, temperature, messages, response_format, prompt_version, version).
+    version: globalna wersja cache — wpisy z inną wersją są usuwane przy otwarciu;
+    prompt_version (od wywołującego) unieważnia wpisy po zmianie promptu konkretnego narzędzia.
+    ttl_seconds: po tym czasie wpis jest pomijany (model po stronie providera też się zmienia).
+    max_disk_entries: górny limit wierszy w SQLite (najstarsze wypadają). path=None -> tylko RAM.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS llm_cache ("
+        " key TEXT PRIMARY KEY,"
+        " version TEXT NOT NULL,"
+        " model TEXT NOT NULL,"
+        " content TEXT NOT NULL,"
+        " prompt_tokens INTEGER NOT NULL,"
+        " completion_tokens INTEGER NOT NULL,"
+        " created_at REAL NOT NULL)"
+    )
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        version: str = "1",
+        ttl_seconds: float = 7 * 24 * 3600.0,
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.version = version
+        self._ttl = ttl_seconds
+        self._max_memory = max(1, max_memory_entries)
+        self._max_disk = max(1, max_disk_entries)
+        self._clock = clock
+        self._memory: "OrderedDict[str, tuple[Completion, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db: sqlite3.Connection | None = None
+        self._disk_rows = 0
+        if path is not None:
+            p = Path(path)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(p), check_same_thread=False)
+            self._db.execute(self._SCHEMA)
+            self._db.execute("DELETE FROM llm_cache WHERE version != ?", (version,))
+            self._db.commit()
+            self._disk_rows = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(
+        self,
+        *,
+        model: str,
+        temperature: float | None,
+        messages: Sequence[Mapping[str, str]],
+        response_format: Mapping[str, Any] | None,
+        prompt_version: str | None = None,
+    ) -> str:
+        return cache_key(
+            model=model,
+            temperature=temperature,
+            messages=messages,
+            response_format=response_format,
+            prompt_version=prompt_version,
+            version=self.version,
+        )
+
+    def get(self, key: str) -> Completion | None:
+        now = self._clock()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                completion, created_at = hit
+                if now - created_at < self._ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return completion
+                del self._memory[key]
+
+            loaded = self._load(key, now)
+            if loaded is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._remember(key, *loaded)
+            return loaded[0]
+
+    def put(self, key: str, completion: Completion) -> None:
+        created_at = self._clock()
+        with self._lock:
+            self._remember(key, completion, created_at)
+            self._store(key, completion, created_at)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Usuwa wpis (RAM i SQLite) — np. gdy wywołujący odrzucił zapisaną odpowiedź.
+        """
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # ---------- internal ----------
+
+    def _remember(self, key: str, completion: Completion, created_at: float) -> None:
+        self._memory[key] = (completion, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str, now: float) -> tuple[Completion, float] | None:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT model, content, prompt_tokens, completion_tokens, created_at FROM llm_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None or now - float(row[4]) >= self._ttl:
+            return None
+        completion = Completion(content=row[1], model=row[0], prompt_tokens=int(row[2]), completion_tokens=int(row[3]))
+        return completion, float(row[4])
+
+    def _store(self, key: str, completion: Completion, created_at: float) -> None:
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO llm_cache"
+            " (key, version, model, content, prompt_tokens, completion_tokens, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, self.version, completion.model, completion.content, completion.prompt_tokens,
+             completion.completion_tokens, created_at),
+        )
+        self._disk_rows += 1  # szacunek (REPLACE też liczy); dokładny stan po przycięciu
+        if self._disk_rows > self._max_disk:
+            # najpierw wygasłe, potem najstarsze ponad limit
+            self._db.execute("DELETE FROM llm_cache WHERE created_at <= ?", (created_at - self._ttl,))
+            self._db.execute(
+                "DELETE FROM llm_cache WHERE key IN"
+                " (SELECT key FROM llm_cache ORDER BY created_at ASC LIMIT"
+                "  max(0, (SELECT COUNT(*) FROM llm_cache) - ?))",
+                (self._max_disk,),
+            )
+            self._disk_rows = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        self._db.commit()
@@ -0,0 +1,455 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Protocol, Sequence
+
+from organizer.core.deadline import DeadlineExceeded, remaining_seconds, request_timeout
+
+if TYPE_CHECKING:
+    from organizer.tools.real.llm_cache import LlmResponseCache
+
+Messages = Sequence[Mapping[str, str]]
+Validator = Callable[["Completion"], bool]
+
+
+def default_cacheable(completion: "Completion", response_format: Mapping[str, Any] | None) -> bool:
+    """
+    Minimalna walidacja przed zapisem do cache: niepusta treść, a w JSON mode — obiekt JSON
+    (ucięta/niepoprawna odpowiedź nie może "zatruć" promptu na cały TTL).
+    """
+    content = (completion.content or "").strip()
+    if not content:
+        return False
+    if (response_format or {}).get("type") == "json_object":
+        try:
+            return isinstance(json.loads(content), dict)
+        except ValueError:
+            return False
+    return True
+
+
+@dataclass(frozen=True)
+class LlmClientConfig:
+    """
+    Konfiguracja procesowego klienta LLM.
+
+    max_in_flight: ile równoległych zapytań do LLM (ponad limit -> czekamy w kolejce, najwyżej do końca budżetu rundy)
+    timeout_seconds: domyślny timeout zapytania (obcinany do pozostałego budżetu rundy)
+    max_retries: ponowienia wewnątrz SDK OpenAI (0 = ponawia tylko nasz RetryPolicy)
+    """
+    max_in_flight: int = 8
+    timeout_seconds: float = 30.0
+    max_retries: int = 2
+
+
+@dataclass(frozen=True)
+class Completion:
+    """
+    Odpowiedź LLM niezależna od SDK: treść + zużycie tokenów (0, jeśli backend nie raportuje).
+    """
+    content: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class CompletionBackend(Protocol):
+    def complete(
+        self, *, model: str, messages: Messages, temperature: float | None, response_format: Mapping[str, Any] | None,
+        timeout: float | None,
+    ) -> Completion: ...
+
+    async def acomplete(
+        self, *, model: str, messages: Messages, temperature: float | None, response_format: Mapping[str, Any] | None,
+        timeout: float | None,
+    ) -> Completion: ...
+
+
+class OpenAIBackend:
+    """
+    Backend OpenAI: jeden klient sync (OpenAI) na proces i jeden async (AsyncOpenAI) na pętlę zdarzeń,
+    więc pula połączeń SDK (keep-alive, TLS) jest używana ponownie między wywołaniami.
+    Pula AsyncOpenAI należy do pętli, w której powstała — stąd klient per pętla (jak LlmClient._async_slot).
+    """
+
+    def __init__(self, *, api_key: str | None = None, max_retries: int = 2):
+        self._api_key = api_key
+        self._max_retries = max_retries
+        self._client: Any = None
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def complete(self, *, model, messages, temperature, response_format, timeout) -> Completion:
+        resp = self._sync_client().chat.completions.create(
+            **self._request(model, messages, temperature, response_format), timeout=timeout
+        )
+        return self._to_completion(resp, model)
+
+    async def acomplete(self, *, model, messages, temperature, response_format, timeout) -> Completion:
+        resp = await self._async_sdk_client().chat.completions.create(
+            **self._request(model, messages, temperature, response_format), timeout=timeout
+        )
+        return self._to_completion(resp, model)
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+            self._async_clients.clear()  # AsyncOpenAI zamknie pętla, do której należy
+        if client is not None:
+            client.close()
+
+    # ---------- internal ----------
+
+    def _key(self) -> str:
+        api_key = self._api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("Missing env var: OPENAI_API_KEY")
+        return api_key
+
+    def _sync_client(self) -> Any:
+        if self._client is None:
+            api_key = self._key()
+            from openai import OpenAI  # lazy import
+            with self._lock:
+                if self._client is None:
+                    self._client = OpenAI(api_key=api_key, max_retries=self._max_retries)
+        return self._client
+
+    def _async_sdk_client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            api_key = self._key()
+            from openai import AsyncOpenAI  # lazy import
+            with self._lock:
+                client = self._async_clients.get(loop)
+                if client is None:
+                    client = self._async_clients[loop] = AsyncOpenAI(api_key=api_key, max_retries=self._max_retries)
+        return client
+
+    @staticmethod
+    def _request(model, messages, temperature, response_format) -> dict[str, Any]:
+        request: dict[str, Any] = {"model": model, "messages": [dict(m) for m in messages]}
+        if temperature is not None:
+            request["temperature"] = temperature
+        if response_format is not None:
+            request["response_format"] = dict(response_format)
+        return request
+
+    @staticmethod
+    def _to_completion(resp: Any, model: str) -> Completion:
+        usage = getattr(resp, "usage", None)
+        return Completion(
+            content=resp.choices[0].message.content or "",
+            model=getattr(resp, "model", None) or model,
+            prompt_tokens=int(getattr(usage, "prompt_tokens", 0) or 0),
+            completion_tokens=int(getattr(usage, "completion_tokens", 0) or 0),
+        )
+
+
+class FakeCompletionBackend:
+    """
+    Lokalny backend do testów i benchmarków (bez sieci i klucza API).
+
+    responder: stała odpowiedź albo funkcja messages -> treść
+    latency_seconds: sztuczne opóźnienie każdego zapytania
+    Tokeny liczone w przybliżeniu (słowa), żeby metryki miały sens w benchmarkach.
+    """
+
+    def __init__(self, responder: str | Callable[[list[dict[str, str]]], str] = "{}", *, latency_seconds: float = 0.0):
+        self._responder = responder
+        self._latency = latency_seconds
+        self.requests: list[dict[str, Any]] = []
+
+    def complete(self, *, model, messages, temperature, response_format, timeout) -> Completion:
+        if self._latency > 0:
+            time.sleep(self._latency)
+        return self._answer(model, messages, response_format)
+
+    async def acomplete(self, *, model, messages, temperature, response_format, timeout) -> Completion:
+        if self._latency > 0:
+            await asyncio.sleep(self._latency)
+        return self._answer(model, messages, response_format)
+
+    def _answer(self, model: str, messages: Messages, response_format: Mapping[str, Any] | None) -> Completion:
+        msgs = [dict(m) for m in messages]
+        self.requests.append({"model": model, "messages": msgs, "response_format": response_format})
+        content = self._responder(msgs) if callable(self._responder) else self._responder
+        return Completion(
+            content=content,
+            model=model,
+            prompt_tokens=sum(len(m.get("content", "").split()) for m in msgs),
+            completion_tokens=len(content.split()),
+        )
+
+
+@dataclass(frozen=True)
+class ModelStats:
+    calls: int
+    errors: int
+    total_latency_ms: float
+    prompt_tokens: int
+    completion_tokens: int
+    cache_hits: int = 0  # odpowiedzi z LlmResponseCache (nie wliczane do calls/latencji)
+
+    @property
+    def mean_latency_ms(self) -> float:
+        return self.total_latency_ms / self.calls if self.calls else 0.0
+
+
+class LlmMetrics:
+    """
+    Metryki per model: liczba wywołań/błędów, łączna latencja i zużycie tokenów.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, list[float]] = {}  # model -> [calls, errors, latency_ms, prompt, completion, cache_hits]
+
+    def record(self, model: str, *, elapsed_seconds: float, completion: Completion | None) -> None:
+        with self._lock:
+            s = self._stats.setdefault(model, [0, 0, 0.0, 0, 0, 0])
+            s[0] += 1
+            s[2] += elapsed_seconds * 1000.0
+            if completion is None:
+                s[1] += 1
+            else:
+                s[3] += completion.prompt_tokens
+                s[4] += completion.completion_tokens
+
+    def record_cache_hit(self, model: str) -> None:
+        with self._lock:
+            self._stats.setdefault(model, [0, 0, 0.0, 0, 0, 0])[5] += 1
+
+    def snapshot(self) -> dict[str, ModelStats]:
+        with self._lock:
+            return {
+                model: ModelStats(
+                    calls=int(s[0]),
+                    errors=int(s[1]),
+                    total_latency_ms=round(s[2], 3),
+                    prompt_tokens=int(s[3]),
+                    completion_tokens=int(s[4]),
+                    cache_hits=int(s[5]),
+                )
+                for model, s in self._stats.items()
+            }
+
+
+class LlmClient:
+    """
+    Procesowy punkt dostępu do LLM dla agentów i narzędzi (OpenAIAgent, normalizer, recovery).
+
+    - jeden backend (domyślnie OpenAIBackend z pulą połączeń SDK) współdzielony przez wszystkie wywołania,
+    - limit max_in_flight równoległych zapytań (sync: semafor wątków, async: semafor pętli),
+    - timeout zapytania obcinany do budżetu rundy (deadline),
+    - metryki per model (metrics.snapshot()),
+    - opcjonalny cache odpowiedzi (LlmResponseCache) dla zapytań z temperature=0.
+    """
+
+    def __init__(
+        self,
+        backend: CompletionBackend | None = None,
+        config: LlmClientConfig | None = None,
+        *,
+        cache: "LlmResponseCache | None" = None,
+    ):
+        self._config = config or LlmClientConfig()
+        self._cache = cache
+        self._backend = backend or OpenAIBackend(max_retries=self._config.max_retries)
+        self._slots = threading.BoundedSemaphore(max(1, self._config.max_in_flight))
+        self._async_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self.metrics = LlmMetrics()
+
+    @property
+    def backend(self) -> CompletionBackend:
+        return self._backend
+
+    def complete(
+        self,
+        *,
+        model: str,
+        messages: Messages,
+        temperature: float | None = None,
+        response_format: Mapping[str, Any] | None = None,
+        timeout_seconds: float | None = None,
+        prompt_version: str | None = None,
+        validate: Validator | None = None,
+        use_cache: bool = True,
+    ) -> Completion:
+        """
+        prompt_version: wersja promptu wywołującego (część klucza cache — zmiana promptu unieważnia wpisy).
+        validate: czy odpowiedź nadaje się do cache (np. parsuje się do oczekiwanego schematu);
+            None -> default_cacheable. Odpowiedź odrzucona przez walidator jest zwracana, ale nie zapisywana.
+        use_cache=False: ponowienie po złej odpowiedzi — pomija i usuwa wpis cache dla tego zapytania.
+        """
+        key = self._cache_key(model, messages, temperature, response_format, prompt_version)
+        cached = self._cached(key, model, use_cache)
+        if cached is not None:
+            return cached
+
+        if not self._slots.acquire(timeout=remaining_seconds()):
+            raise DeadlineExceeded("Deadline exceeded while waiting for an LLM slot")
+        started = time.perf_counter()
+        completion: Completion | None = None
+        try:
+            completion = self._backend.complete(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                response_format=response_format,
+                timeout=request_timeout(self._timeout(timeout_seconds)),
+            )
+        finally:
+            self._slots.release()
+            self.metrics.record(model, elapsed_seconds=time.perf_counter() - started, completion=completion)
+        self._remember(key, completion, response_format, validate)
+        return completion
+
+    async def acomplete(
+        self,
+        *,
+        model: str,
+        messages: Messages,
+        temperature: float | None = None,
+        response_format: Mapping[str, Any] | None = None,
+        timeout_seconds: float | None = None,
+        prompt_version: str | None = None,
+        validate: Validator | None = None,
+        use_cache: bool = True,
+    ) -> Completion:
+        key = self._cache_key(model, messages, temperature, response_format, prompt_version)
+        cached = self._cached(key, model, use_cache)
+        if cached is not None:
+            return cached
+
+        async with self._async_slot():
+            started = time.perf_counter()
+            completion: Completion | None = None
+            try:
+                completion = await self._backend.acomplete(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    response_format=response_format,
+                    timeout=request_timeout(self._timeout(timeout_seconds)),
+                )
+            finally:
+                self.metrics.record(model, elapsed_seconds=time.perf_counter() - started, completion=completion)
+        self._remember(key, completion, response_format, validate)
+        return completion
+
+    def close(self) -> None:
+        close = getattr(self._backend, "close", None)
+        if close is not None:
+            close()
+        if self._cache is not None:
+            self._cache.close()
+
+    # ---------- internal ----------
+
+    def _cache_key(self, model, messages, temperature, response_format, prompt_version) -> str | None:
+        # tylko deterministyczne zapytania: jawne temperature=0
+        if self._cache is None or temperature is None or temperature != 0:
+            return None
+        return self._cache.key(
+            model=model,
+            temperature=temperature,
+            messages=messages,
+            response_format=response_format,
+            prompt_version=prompt_version,
+        )
+
+    def _cached(self, key: str | None, model: str, use_cache: bool) -> Completion | None:
+        if key is None:
+            return None
+        if not use_cache:
+            self._cache.invalidate(key)
+            return None
+        completion = self._cache.get(key)
+        if completion is not None:
+            self.metrics.record_cache_hit(model)
+        return completion
+
+    def _remember(
+        self,
+        key: str | None,
+        completion: Completion,
+        response_format: Mapping[str, Any] | None,
+        validate: Validator | None,
+    ) -> None:
+        if key is None:
+            return
+        try:
+            ok = validate(completion) if validate is not None else default_cacheable(completion, response_format)
+        except Exception:
+            ok = False
+        if ok:
+            self._cache.put(key, completion)
+
+    def _timeout(self, timeout_seconds: float | None) -> float:
+        return self._config.timeout_seconds if timeout_seconds is None else timeout_seconds
+
+    def _async_slot(self) -> asyncio.Semaphore:
+        # asyncio.Semaphore należy do pętli — osobny per pętla
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slot = self._async_slots.get(loop)
+            if slot is None:
+                slot = self._async_slots[loop] = asyncio.Semaphore(max(1, self._config.max_in_flight))
+        return slot
+
+
+_shared: LlmClient | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_llm() -> LlmClient:
+    """
+    Procesowy klient LLM używany domyślnie przez OpenAIAgent i narzędzia OpenAI.
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = LlmClient()
+    return _shared
+
+
+def configure_shared_llm(
+    backend: CompletionBackend | None = None,
+    config: LlmClientConfig | None = None,
+    *,
+    cache: "LlmResponseCache | None" = None,
+) -> LlmClient:
+    """
+    Podmienia procesowego klienta (np. FakeCompletionBackend w testach/benchmarkach, inny max_in_flight,
+    cache odpowiedzi). Poprzedni klient jest zamykany.
+    """
+    global _shared
+    new = LlmClient(backend, config, cache=cache)
+    with _shared_lock:
+        old, _shared = _shared, new
+    if old is not None:
+        old.close()
+    return new
+
+
+def close_shared_llm() -> None:
+    """
+    Hook zamknięcia dla CLI/serwera. Kolejne użycie utworzy nowego klienta.
+    """
+    global _shared
+    with _shared_lock:
+        old, _shared = _shared, None
+    if old is not None:
+        old.close()
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date as Date, datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Sequence
 
-import httpx
+from organizer.core.batching import MicroBatcher
+from organizer.core.tool import Tool
+from organizer.tools.real.forecast_cache import ForecastCache
+from organizer.tools.real.geocoding_cache import GeoPoint, GeocodingCache
+from organizer.tools.real.hourly_series import DailyStats, HourlySeries, WeatherWindow
+from organizer.tools.real.http import SharedHttpClient, shared_http
 
 
 @dataclass(frozen=True)
@@ -14,53 +19,128 @@ class OpenMeteoGeocodingTool:
     """
     name: str = "open_meteo_geocoding"
     base_url: str = "https://geocoding-api.open-meteo.com/v1/search"
+    http: SharedHttpClient | None = None  # None -> procesowa pula (shared_http())
 
     def __call__(self, *, location: str, count: int = 1, language: str = "en") -> dict[str, Any]:
         params = {"name": location, "count": count, "language": language, "format": "json"}
-        with httpx.Client(timeout=10.0) as client:
-            r = client.get(self.base_url, params=params)
-            r.raise_for_status()
-            return r.json()
+        r = (self.http or shared_http()).get(self.base_url, params=params)
+        r.raise_for_status()
+        return r.json()
 
 
 @dataclass(frozen=True)
 class OpenMeteoWeatherTool:
     """
     Realne narzędzie pogodowe:
-    - geokoduje nazwę miasta do lat/lon,
-    - pobiera prognozę godzinową,
+    - geokoduje nazwę miasta do lat/lon (z geocode_cache, jeśli podany — bez round-tripu HTTP),
+    - pobiera prognozę godzinową (7 dni; z forecast_cache jedno pobranie obsługuje każdą datę okna),
     - zwraca uproszczony format: summary/temp/precip_prob dla wybranego dnia (domyślnie 'tomorrow').
+
+    forecast_many() pobiera prognozy wielu miejsc jednym żądaniem (Open-Meteo przyjmuje listy
+    latitude/longitude po przecinku). with_batching() skleja też równoległe pojedyncze wywołania
+    (np. wiele sesji naraz) w jedno żądanie przez MicroBatcher.
     """
     name: str = "open_meteo_weather"
     forecast_url: str = "https://api.open-meteo.com/v1/forecast"
-    geocoding: OpenMeteoGeocodingTool = OpenMeteoGeocodingTool()
+    geocoding: Tool = OpenMeteoGeocodingTool()  # albo OfflineGeocoderTool (gazetteer, zdalnie tylko braki)
+    http: SharedHttpClient | None = None  # None -> procesowa pula (shared_http())
+    geocode_cache: GeocodingCache | None = None
+    forecast_cache: ForecastCache | None = None
+    forecast_batcher: MicroBatcher | None = None  # patrz with_batching()
 
     def __call__(self, *, location: str, date: str) -> dict[str, Any]:
         lat, lon, resolved_name = self._geocode(location)
 
         target = self._resolve_date(date)
 
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "hourly": "temperature_2m,precipitation_probability",
-            "timezone": "auto",
-            "timeformat": "iso8601",
-            "forecast_days": 7,
-        }
-
-        with httpx.Client(timeout=10.0) as client:
-            r = client.get(self.forecast_url, params=params)
-            r.raise_for_status()
-            data = r.json()
-
-        # wybieramy godzinę około południa (12:00) w danym dniu, jeśli istnieje
-        hourly = data.get("hourly", {})
-        times: list[str] = hourly.get("time", [])
-        temps: list[float] = hourly.get("temperature_2m", [])
-        precs: list[float] = hourly.get("precipitation_probability", [])
-
-        chosen_temp, chosen_prec = self._pick_midday(times, temps, precs, target)
+        if self.forecast_cache is not None:
+            series = self.forecast_cache.get_or_load(lat, lon, lambda: self._fetch_series(lat, lon))
+        else:
+            series = self._fetch_series(lat, lon)
+
+        return self._report(resolved_name, series, target)
+
+    def with_batching(self, *, max_delay_seconds: float = 0.005, max_batch_size: int = 50) -> "OpenMeteoWeatherTool":
+        """
+        Kopia narzędzia, której pobrania prognozy z okna max_delay_seconds idą jednym żądaniem.
+        """
+        batcher = MicroBatcher(
+            self._fetch_series_combined,
+            single_fn=lambda point: self._fetch_series_direct(*point),
+            max_batch_size=max_batch_size,
+            max_delay_seconds=max_delay_seconds,
+        )
+        return replace(self, forecast_batcher=batcher)
+
+    def forecast_many(self, *, locations: Sequence[str], dates: Sequence[str] | str = "tomorrow") -> list[dict[str, Any]]:
+        """
+        Prognozy wielu miejsc (np. plan kilku miast) — brakujące w cache jednym żądaniem HTTP.
+        dates: jedna data dla wszystkich albo lista równoległa do locations.
+        """
+        if isinstance(dates, str):
+            dates = [dates] * len(locations)
+        if len(dates) != len(locations):
+            raise ValueError("dates must be a single date or match locations")
+
+        points = [self._geocode(location) for location in locations]
+
+        series_by_key: dict[tuple[float, float], HourlySeries] = {}
+        missing: list[tuple[float, float]] = []
+        for lat, lon, _ in points:
+            key = (lat, lon)
+            if key in series_by_key or key in missing:
+                continue
+            cached = self.forecast_cache.peek(lat, lon) if self.forecast_cache is not None else None
+            if cached is not None:
+                series_by_key[key] = cached
+            else:
+                missing.append(key)
+
+        if missing:
+            for (lat, lon), series in zip(missing, self.fetch_series_many(missing)):
+                series_by_key[(lat, lon)] = series
+                if self.forecast_cache is not None:
+                    self.forecast_cache.put(lat, lon, series, lambda lat=lat, lon=lon: self._fetch_series(lat, lon))
+
+        return [
+            self._report(resolved_name, series_by_key[(lat, lon)], self._resolve_date(date))
+            for (lat, lon, resolved_name), date in zip(points, dates)
+        ]
+
+    def fetch_series_many(self, points: Sequence[tuple[float, float]]) -> list[HourlySeries]:
+        """
+        Jedno żądanie forecast dla wielu punktów; wyniki w kolejności points.
+        Gdy żądanie zbiorcze się nie uda, punkty są pobierane osobno.
+        """
+        try:
+            return self._fetch_series_combined(points)
+        except Exception:
+            if len(points) == 1:
+                raise
+        return [self._fetch_series_direct(lat, lon) for lat, lon in points]
+
+    def _fetch_series_combined(self, points: Sequence[tuple[float, float]]) -> list[HourlySeries]:
+        # też batch_fn MicroBatchera: błąd całego żądania -> każdy wywołujący pobiera swój punkt osobno
+        if len(points) == 1:
+            return [self._fetch_series_direct(*points[0])]
+
+        params = self._forecast_params(
+            ",".join(str(lat) for lat, _ in points),
+            ",".join(str(lon) for _, lon in points),
+        )
+        r = (self.http or shared_http()).get(self.forecast_url, params=params)
+        r.raise_for_status()
+        data = r.json()
+        if isinstance(data, dict):  # pojedynczy obiekt, gdy provider zredukował listę
+            data = [data]
+        if len(data) != len(points):
+            raise RuntimeError(f"Open-Meteo forecast: expected {len(points)} locations, got {len(data)}")
+        return [HourlySeries.from_hourly(item.get("hourly", {})) for item in data]
+
+    def _report(self, resolved_name: str, series: HourlySeries, target: Date) -> dict[str, Any]:
+        chosen_temp, chosen_prec = self._pick_midday(series, target)
+        stats = series.daily_stats(target)
+        window = series.best_window(target)
 
         summary = "deszczowo" if chosen_prec > 60 else "pogodnie"
 
@@ -71,10 +151,58 @@ class OpenMeteoWeatherTool:
             "temp_c": int(round(chosen_temp)),
             "precip_prob": int(round(chosen_prec)),
             "source": "open-meteo",
+            **self._extras(stats, window),
+        }
+
+    @staticmethod
+    def _extras(stats: DailyStats | None, window: WeatherWindow | None) -> dict[str, Any]:
+        extras: dict[str, Any] = {}
+        if stats is not None:
+            extras["temp_min_c"] = int(round(stats.temp_min))
+            extras["temp_max_c"] = int(round(stats.temp_max))
+            if stats.precip_max == stats.precip_max:  # nie-NaN
+                extras["precip_max"] = int(round(stats.precip_max))
+        if window is not None:
+            extras["best_window"] = window.label()
+        return extras
+
+    def _fetch_series(self, lat: float, lon: float) -> HourlySeries:
+        if self.forecast_batcher is not None:
+            return self.forecast_batcher.call((lat, lon))
+        return self._fetch_series_direct(lat, lon)
+
+    def _fetch_series_direct(self, lat: float, lon: float) -> HourlySeries:
+        r = (self.http or shared_http()).get(self.forecast_url, params=self._forecast_params(lat, lon))
+        r.raise_for_status()
+        data = r.json()
+        return HourlySeries.from_hourly(data.get("hourly", {}))
+
+    @staticmethod
+    def _forecast_params(latitude: Any, longitude: Any) -> dict[str, Any]:
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": "temperature_2m,precipitation_probability",
+            "timezone": "auto",
+            "timeformat": "iso8601",
+            "forecast_days": 7,
         }
 
     def _geocode(self, location: str) -> tuple[float, float, str]:
-        geo = self.geocoding(location=location, count=1, language="en")
+        language = "en"
+        if self.geocode_cache is not None:
+            cached = self.geocode_cache.get(location, language)
+            if cached is not None:
+                return cached.latitude, cached.longitude, cached.name
+
+        lat, lon, resolved = self._geocode_remote(location, language)
+
+        if self.geocode_cache is not None:
+            self.geocode_cache.put(location, language, GeoPoint(latitude=lat, longitude=lon, name=resolved))
+        return lat, lon, resolved
+
+    def _geocode_remote(self, location: str, language: str) -> tuple[float, float, str]:
+        geo = self.geocoding(location=location, count=1, language=language)
         results = geo.get("results") or []
         if not results:
             raise RuntimeError(f"Open-Meteo geocoding: no results for '{location}'")
@@ -95,23 +223,9 @@ class OpenMeteoWeatherTool:
         # oczekujemy YYYY-MM-DD
         return Date.fromisoformat(date_str)
 
-    def _pick_midday(
-        self,
-        times: list[str],
-        temps: list[float],
-        precs: list[float],
-        target: Date,
-    ) -> tuple[float, float]:
-        # szukamy wpisu "YYYY-MM-DDT12:00"
-        target_prefix = target.isoformat() + "T12:00"
-        for i, t in enumerate(times):
-            if t.startswith(target_prefix):
-                return float(temps[i]), float(precs[i])
-
-        # fallback: pierwszy wpis z danego dnia
-        day_prefix = target.isoformat() + "T"
-        for i, t in enumerate(times):
-            if t.startswith(day_prefix):
-                return float(temps[i]), float(precs[i])
-
-        raise RuntimeError("Open-Meteo forecast: no hourly data for target day")
+    def _pick_midday(self, series: HourlySeries, target: Date) -> tuple[float, float]:
+        # godzina około południa (12:00) w danym dniu; fallback: pierwszy wpis z danego dnia
+        picked = series.at(target, 12) or series.first_of_day(target)
+        if picked is None:
+            raise RuntimeError("Open-Meteo forecast: no hourly data for target day")
+        return picked
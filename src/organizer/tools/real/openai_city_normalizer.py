@@ -1,9 +1,22 @@
 from __future__ import annotations
 
-import os
 import json
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, replace
+from typing import Any, Sequence
+
+from organizer.core.batching import MicroBatcher
+from organizer.tools.real.llm_client import Completion, LlmClient, shared_llm
+
+_SYSTEM_PROMPT = (
+    "Zamieniasz polskie nazwy miast/miejsc na mianownik. "
+    "Odpowiadaj wyłącznie JSON-em."
+)
+
+
+def _has_nominative(completion: Completion) -> bool:
+    # do cache tylko odpowiedź z niepustym mianownikiem
+    data = json.loads(completion.content or "{}")
+    return isinstance(data, dict) and isinstance(data.get("nominative"), str) and bool(data["nominative"].strip())
 
 
 @dataclass(frozen=True)
@@ -11,30 +24,30 @@ class OpenAICityNormalizerTool:
     """
     Zamienia polską nazwę miasta (w dowolnej odmianie) na mianownik.
     Wymaga: OPENAI_API_KEY.
+
+    normalize_many() normalizuje wiele nazw jednym zapytaniem (JSON mode); brakujące albo
+    niepoprawne odpowiedzi są ponawiane tylko dla tych nazw (do batch_retries razy).
+    with_batching() skleja równoległe pojedyncze wywołania (np. wiele sesji) w jedno zapytanie.
     """
     name: str = "openai_city_normalizer"
     model: str = "gpt-4o-mini"
+    timeout_seconds: float = 15.0  # obcinany do pozostałego budżetu rundy
+    llm: LlmClient | None = None  # None -> procesowy shared_llm()
+    prompt_version: str = "city-normalizer/1"  # zmień przy zmianie promptu (unieważnia cache odpowiedzi)
+    batch_prompt_version: str = "city-normalizer-batch/1"
+    batch_size: int = 50  # nazw w jednym zapytaniu normalize_many()
+    batch_retries: int = 1  # dodatkowe zapytania tylko o brakujące nazwy
+    batcher: MicroBatcher | None = None  # patrz with_batching()
 
     def __call__(self, *, text: str) -> dict[str, Any]:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("Missing env var: OPENAI_API_KEY")
-
-        # lazy import
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        if self.batcher is not None:
+            return self.batcher.call(text)
 
-        resp = client.chat.completions.create(
+        completion = (self.llm or shared_llm()).complete(
             model=self.model,
             temperature=0,
             messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "Zamieniasz polskie nazwy miast/miejsc na mianownik. "
-                        "Odpowiadaj wyłącznie JSON-em."
-                    ),
-                },
+                {"role": "system", "content": _SYSTEM_PROMPT},
                 {
                     "role": "user",
                     "content": (
@@ -44,9 +57,100 @@ class OpenAICityNormalizerTool:
                 },
             ],
             response_format={"type": "json_object"},
+            timeout_seconds=self.timeout_seconds,
+            prompt_version=self.prompt_version,
+            validate=_has_nominative,
         )
 
-        content = resp.choices[0].message.content or "{}"
+        content = completion.content or "{}"
         data = json.loads(content)
         nominative = str(data.get("nominative", text)).strip()
         return {"input": text, "nominative": nominative, "source": "openai"}
+
+    def with_batching(self, *, max_delay_seconds: float = 0.01, max_batch_size: int = 20) -> "OpenAICityNormalizerTool":
+        """
+        Kopia narzędzia, której wywołania z okna max_delay_seconds idą jednym zapytaniem do LLM.
+        """
+        batcher = MicroBatcher(self._normalize_batch, max_batch_size=max_batch_size, max_delay_seconds=max_delay_seconds)
+        return replace(self, batcher=batcher)
+
+    def normalize_many(self, texts: Sequence[str]) -> list[dict[str, Any]]:
+        """
+        Mianowniki dla wielu nazw (kolejność jak texts; powtórzenia pytane raz).
+        Nazwa bez poprawnej odpowiedzi po batch_retries ponowieniach -> RuntimeError.
+        """
+        unique = list(dict.fromkeys(texts))
+        answers: dict[str, dict[str, Any]] = {}
+        step = max(1, self.batch_size)
+        for start in range(0, len(unique), step):
+            chunk = unique[start:start + step]
+            for text, result in zip(chunk, self._normalize_batch(chunk)):
+                if isinstance(result, BaseException):
+                    raise result
+                answers[text] = result
+        return [answers[text] for text in texts]
+
+    # ---------- internal ----------
+
+    def _normalize_batch(self, texts: list[str]) -> list[dict[str, Any] | BaseException]:
+        # wynik albo wyjątek na pozycji każdej nazwy (kontrakt MicroBatcher)
+        answers: dict[int, str] = {}
+        missing = list(range(len(texts)))
+        for attempt in range(1 + max(0, self.batch_retries)):
+            # ponowienie omija cache — inaczej wróciłaby ta sama zła odpowiedź
+            answers.update(self._complete_batch([(i, texts[i]) for i in missing], use_cache=attempt == 0))
+            missing = [i for i in missing if i not in answers]
+            if not missing:
+                break
+
+        out: list[dict[str, Any] | BaseException] = []
+        for i, text in enumerate(texts):
+            if i in answers:
+                out.append({"input": text, "nominative": answers[i], "source": "openai"})
+            else:
+                out.append(RuntimeError(f"OpenAI city normalizer: no answer for '{text}'"))
+        return out
+
+    def _complete_batch(self, items: list[tuple[int, str]], *, use_cache: bool = True) -> dict[int, str]:
+        """
+        Jedno zapytanie o wiele nazw; zwraca tylko poprawne odpowiedzi (id -> mianownik).
+        Do cache trafia tylko odpowiedź z poprawnym mianownikiem dla każdego id.
+        """
+        asked = {i for i, _ in items}
+        payload = json.dumps({"items": [{"id": i, "text": t} for i, t in items]}, ensure_ascii=False)
+        completion = (self.llm or shared_llm()).complete(
+            model=self.model,
+            temperature=0,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": (
+                        f"Wejście: {payload}\n"
+                        "Dla każdego elementu zwróć mianownik pola text, zachowując id. "
+                        'Zwróć dokładnie: {"results": [{"id": <id>, "nominative": "<mianownik>"}]}'
+                    ),
+                },
+            ],
+            response_format={"type": "json_object"},
+            timeout_seconds=self.timeout_seconds,
+            prompt_version=self.batch_prompt_version,
+            validate=lambda c: _parse_batch(c, asked).keys() == asked,
+            use_cache=use_cache,
+        )
+        return _parse_batch(completion, asked)
+
+
+def _parse_batch(completion: Completion, asked: set[int]) -> dict[int, str]:
+    try:
+        results = json.loads(completion.content or "{}").get("results")
+    except (ValueError, AttributeError):
+        return {}
+    answers: dict[int, str] = {}
+    for row in results if isinstance(results, list) else ():
+        if not isinstance(row, dict):
+            continue
+        i, nominative = row.get("id"), row.get("nominative")
+        if isinstance(i, int) and i in asked and isinstance(nominative, str) and nominative.strip():
+            answers[i] = nominative.strip()
+    return answers
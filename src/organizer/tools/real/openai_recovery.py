@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 import json
-import os
 from dataclasses import dataclass
 from typing import Any, Callable, Mapping
 
 from organizer.core.errors import ToolError
 from organizer.core.fixplan import FixPlan
+from organizer.core.stack_traces import stack_trace_of
 from organizer.core.task import Task
+from organizer.tools.real.llm_client import Completion, LlmClient, shared_llm
 
 
 CompletionFn = Callable[[list[dict[str, str]]], str]
 
 
+def _is_fix_json(completion: Completion) -> bool:
+    # do cache tylko odpowiedź w jednym z formatów FixPlan (inaczej propose_fix i tak zwraca None)
+    data = json.loads(completion.content or "{}")
+    return isinstance(data, dict) and data.get("action") in {"retry_tool", "fallback_tool", "fail"}
+
+
 @dataclass(frozen=True)
 class OpenAIRecoveryTool:
     """
@@ -22,12 +29,15 @@ class OpenAIRecoveryTool:
     - waliduje JSON i mapuje go na FixPlan
 
     Uwaga: to narzędzie jest opcjonalne.
-    Jeśli nie ustawisz OPENAI_API_KEY i nie podasz completion_fn, podniesie RuntimeError.
+    Jeśli nie ustawisz OPENAI_API_KEY i nie podasz completion_fn ani llm, podniesie RuntimeError.
     """
     name: str = "openai_recovery"
     model: str = "gpt-4o-mini"
     temperature: float = 0.0
     completion_fn: CompletionFn | None = None
+    timeout_seconds: float = 30.0  # obcinany do pozostałego budżetu rundy
+    llm: LlmClient | None = None  # None -> procesowy shared_llm()
+    prompt_version: str = "recovery/1"  # zmień przy zmianie promptu (unieważnia cache odpowiedzi)
 
     def propose_fix(self, *, error: ToolError, last_task: Task, last_inputs: Mapping[str, Any]) -> FixPlan | None:
         messages = self._build_messages(error=error, last_task=last_task, last_inputs=last_inputs)
@@ -44,23 +54,19 @@ class OpenAIRecoveryTool:
         if self.completion_fn is not None:
             return self.completion_fn(messages)
 
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("Missing env var: OPENAI_API_KEY")
-
-        from openai import OpenAI  # lazy import
-        client = OpenAI(api_key=api_key)
-
-        resp = client.chat.completions.create(
+        completion = (self.llm or shared_llm()).complete(
             model=self.model,
             temperature=self.temperature,
             messages=messages,
             response_format={"type": "json_object"},
+            timeout_seconds=self.timeout_seconds,
+            prompt_version=self.prompt_version,
+            validate=_is_fix_json,
         )
-        return resp.choices[0].message.content or "{}"
+        return completion.content or "{}"
 
     def _build_messages(self, *, error: ToolError, last_task: Task, last_inputs: Mapping[str, Any]) -> list[dict[str, str]]:
-        trace = (error.stack_trace or "").strip()
+        trace = (stack_trace_of(error) or "").strip()
         if len(trace) > 8000:
             trace = trace[-8000:]  # ogon jest najcenniejszy
 
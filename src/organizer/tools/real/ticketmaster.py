@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import date as Date, datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Generator, Iterator
 
-import httpx
+from organizer.core.concurrency import submit
+from organizer.core.deadline import remaining_seconds
+from organizer.tools.real.http import SharedHttpClient, shared_http
 
 
 @dataclass(frozen=True)
@@ -18,20 +21,84 @@ class TicketmasterEventsTool:
     """
     name: str = "ticketmaster_events"
     base_url: str = "https://app.ticketmaster.com/discovery/v2/events.json"
+    http: SharedHttpClient | None = None  # None -> procesowa pula (shared_http())
 
     def __call__(self, *, city: str, date: str, category: str = "any") -> dict[str, Any]:
+        day = self._resolve_date(date)
+        raw = self._fetch_page(self._params(city=city, day=day, category=category, page_size=20), 0)
+        events_out = [self._normalize(ev, city=city, day=day) for ev in self._page_events(raw)]
+        return {"city": city, "date": day.isoformat(), "category": category, "events": events_out, "source": "ticketmaster"}
+
+    def iter_events(
+        self,
+        *,
+        city: str,
+        date: str,
+        category: str = "any",
+        page_size: int = 20,
+        max_pages: int = 5,
+        prefetch_next: bool = True,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Strumień znormalizowanych eventów, strona po stronie (posortowane po starcie: sort=date,asc).
+
+        Pierwsza strona jest pobierana od razu (w tle), jeszcze przed pierwszym next();
+        przy prefetch_next kolejna strona leci równolegle z konsumpcją bieżącej.
+        Konsument może przerwać w dowolnym momencie (break / close()) — niepobrane strony
+        nie są pobierane, a zaplanowane są anulowane.
+        """
+        day = self._resolve_date(date)
+        params = self._params(city=city, day=day, category=category, page_size=page_size)
+        first = submit(self._fetch_page, params, 0)
+        return _EventStream(
+            first, self._stream(first, params, city=city, day=day, max_pages=max_pages, prefetch_next=prefetch_next)
+        )
+
+    def _stream(
+        self,
+        first: Future,
+        params: dict[str, Any],
+        *,
+        city: str,
+        day: Date,
+        max_pages: int,
+        prefetch_next: bool,
+    ) -> Iterator[dict[str, Any]]:
+        pending: Future | None = first
+        try:
+            page = 0
+            while pending is not None:
+                raw = pending.result(timeout=remaining_seconds())
+                pending = None
+
+                total_pages = int(((raw.get("page") or {}).get("totalPages")) or 1)
+                has_next = page + 1 < min(max_pages, total_pages)
+                if has_next and prefetch_next:
+                    pending = submit(self._fetch_page, params, page + 1)
+
+                for ev in self._page_events(raw):
+                    yield self._normalize(ev, city=city, day=day)
+
+                if has_next and pending is None:
+                    pending = submit(self._fetch_page, params, page + 1)
+                page += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def _params(self, *, city: str, day: Date, category: str, page_size: int) -> dict[str, Any]:
         api_key = os.getenv("TICKETMASTER_API_KEY")
         if not api_key:
             raise RuntimeError("Missing env var: TICKETMASTER_API_KEY")
 
-        day = self._resolve_date(date)
         start = datetime(day.year, day.month, day.day, 0, 0, tzinfo=timezone.utc)
         end = start + timedelta(days=1)
 
-        params = {
+        params: dict[str, Any] = {
             "apikey": api_key,
             "city": city,
-            "size": 20,
+            "size": page_size,
+            "sort": "date,asc",
             "startDateTime": start.isoformat().replace("+00:00", "Z"),
             "endDateTime": end.isoformat().replace("+00:00", "Z"),
         }
@@ -39,41 +106,59 @@ class TicketmasterEventsTool:
         # proste mapowanie kategorii -> classificationName (Ticketmaster przykłady)
         if category != "any":
             params["classificationName"] = category
+        return params
 
-        with httpx.Client(timeout=10.0) as client:
-            r = client.get(self.base_url, params=params)
-            r.raise_for_status()
-            raw = r.json()
-
-        events_out = []
-        embedded = (raw.get("_embedded") or {}).get("events") or []
-        for ev in embedded:
-            name = ev.get("name", "Untitled")
-            dates = ev.get("dates", {}).get("start", {})
-            local_dt = dates.get("localDate", day.isoformat())
-            local_time = dates.get("localTime", "19:00:00")
-
-            # format zgodny z naszym wcześniejszym kontraktem eventów
-            start_hhmm = local_time[:5] if isinstance(local_time, str) else "19:00"
-
-            # indoor/outdoor: Ticketmaster nie zawsze daje to wprost — heurystyka: venue name exists => indoor True
-            venues = (((ev.get("_embedded") or {}).get("venues")) or [])
-            indoor_guess = True if venues else True
-
-            events_out.append(
-                {
-                    "title": name,
-                    "city": city,
-                    "date": local_dt,
-                    "start": start_hhmm,
-                    "price_pln": None,   # API może nie dać ceny bez dodatkowych pól/źródeł
-                    "indoor": indoor_guess,
-                }
-            )
+    def _fetch_page(self, params: dict[str, Any], page: int) -> dict[str, Any]:
+        r = (self.http or shared_http()).get(self.base_url, params={**params, "page": page})
+        r.raise_for_status()
+        return r.json()
 
-        return {"city": city, "date": day.isoformat(), "category": category, "events": events_out, "source": "ticketmaster"}
+    @staticmethod
+    def _page_events(raw: dict[str, Any]) -> list[dict[str, Any]]:
+        return (raw.get("_embedded") or {}).get("events") or []
+
+    @staticmethod
+    def _normalize(ev: dict[str, Any], *, city: str, day: Date) -> dict[str, Any]:
+        name = ev.get("name", "Untitled")
+        dates = ev.get("dates", {}).get("start", {})
+        local_dt = dates.get("localDate", day.isoformat())
+        local_time = dates.get("localTime", "19:00:00")
+
+        # format zgodny z naszym wcześniejszym kontraktem eventów
+        start_hhmm = local_time[:5] if isinstance(local_time, str) else "19:00"
+
+        # indoor/outdoor: Ticketmaster nie zawsze daje to wprost — heurystyka: venue name exists => indoor True
+        venues = (((ev.get("_embedded") or {}).get("venues")) or [])
+        indoor_guess = True if venues else True
+
+        return {
+            "title": name,
+            "city": city,
+            "date": local_dt,
+            "start": start_hhmm,
+            "price_pln": None,   # API może nie dać ceny bez dodatkowych pól/źródeł
+            "indoor": indoor_guess,
+        }
 
     def _resolve_date(self, date_str: str) -> Date:
         if date_str.lower() == "tomorrow":
             return (datetime.now(timezone.utc) + timedelta(days=1)).date()
         return Date.fromisoformat(date_str)
+
+
+class _EventStream(Iterator[dict[str, Any]]):
+    """
+    Generator _stream() + anulowanie pierwszej strony: finally generatora nie wykona się,
+    jeśli close() przyjdzie przed pierwszym next() (a strona 0 jest już zaplanowana).
+    """
+
+    def __init__(self, first: Future, events: Generator[dict[str, Any], None, None]):
+        self._first = first
+        self._events = events
+
+    def __next__(self) -> dict[str, Any]:
+        return next(self._events)
+
+    def close(self) -> None:
+        self._first.cancel()
+        self._events.close()
@@ -0,0 +1,238 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from organizer.core import MicroBatcher
+from organizer.tools.real import ForecastCache, GeocodingCache, GeoPoint, OpenMeteoWeatherTool
+from organizer.tools.real.http import SharedHttpClient
+
+
+def _hourly(temp: float) -> dict:
+    times = [f"2026-01-{day}T12:00" for day in range(10, 17)]
+    return {"hourly": {"time": times, "temperature_2m": [temp] * 7, "precipitation_probability": [5.0] * 7}}
+
+
+def _forecast_handler(calls: list):
+    # Open-Meteo: lista po przecinku -> tablica obiektów; pojedynczy punkt -> obiekt
+    def handler(request):
+        lats = request.url.params["latitude"].split(",")
+        calls.append(lats)
+        if len(lats) == 1:
+            return httpx.Response(200, json=_hourly(float(lats[0])))
+        return httpx.Response(200, json=[_hourly(float(lat)) for lat in lats])
+
+    return handler
+
+
+def _geo() -> GeocodingCache:
+    geo = GeocodingCache()
+    geo.put("Kraków", "en", GeoPoint(50.0, 19.94, "Kraków, Poland"))
+    geo.put("Gdańsk", "en", GeoPoint(54.0, 18.65, "Gdańsk, Poland"))
+    geo.put("Poznań", "en", GeoPoint(52.0, 16.93, "Poznań, Poland"))
+    return geo
+
+
+def _busy(call, item, batcher):
+    # wywołanie "w locie" (batch_fn czeka na hold) — pod obciążeniem lider czeka okno i zbiera resztę
+    busy = threading.Thread(target=call, args=(item,))
+    busy.start()
+    while batcher.batches < 1:
+        time.sleep(0.001)
+    return busy
+
+
+def test_concurrent_calls_are_combined_into_one_batch():
+    batches = []
+    hold = threading.Event()
+    barrier = threading.Barrier(4)
+
+    def batch_fn(items):
+        batches.append(list(items))
+        if "hold" in items:
+            hold.wait(5)
+            return items
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_delay_seconds=0.2)
+    busy = _busy(batcher.call, "hold", batcher)
+
+    def call(item):
+        barrier.wait()
+        return batcher.call(item)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(call, [1, 2, 3, 2]))
+    hold.set()
+    busy.join(5)
+
+    assert results == [10, 20, 30, 20]
+    assert batches[0] == ["hold"] and len(batches) == 2
+    assert sorted(batches[1]) == [1, 2, 3]  # identyczny element wysłany raz
+    assert (batcher.batches, batcher.items) == (2, 5)
+
+
+def test_lone_caller_does_not_wait_for_window():
+    batcher = MicroBatcher(lambda items: items, max_delay_seconds=60.0)
+
+    started = time.perf_counter()
+    assert batcher.call("a") == "a"
+    assert time.perf_counter() - started < 1.0  # nikt inny nie czeka — flush od razu
+
+
+def test_failed_batch_falls_back_to_single_calls():
+    hold = threading.Event()
+    singles = []
+
+    def batch_fn(items):
+        if "hold" in items:
+            hold.wait(5)
+            return items
+        raise ConnectionError("batch endpoint down")
+
+    def single_fn(item):
+        singles.append(item)
+        if item == "bad":
+            raise ValueError(item)
+        return item.upper()
+
+    batcher = MicroBatcher(batch_fn, single_fn=single_fn, max_delay_seconds=0.2)
+    busy = _busy(batcher.call, "hold", batcher)
+    barrier = threading.Barrier(3)
+
+    def call(item):
+        barrier.wait()
+        try:
+            return batcher.call(item)
+        except ValueError as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(call, ["a", "bad", "b"]))
+    hold.set()
+    busy.join(5)
+
+    assert results[0] == "A" and results[2] == "B"
+    assert isinstance(results[1], ValueError)  # błąd tylko u swojego wywołującego
+    assert sorted(singles) == ["a", "b", "bad"]
+    assert batcher.fallbacks == 3
+
+
+def test_full_batch_is_flushed_without_waiting_for_window():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=1, max_delay_seconds=60.0)
+    assert batcher.call("a") == "a"  # nie czeka 60 s
+
+
+def test_errors_are_delivered_per_item_or_to_whole_batch():
+    per_item = MicroBatcher(lambda items: [ValueError(i) if i < 0 else i for i in items], max_delay_seconds=0)
+    assert per_item.call(1) == 1
+    with pytest.raises(ValueError):
+        per_item.call(-1)
+
+    def broken(items):
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        MicroBatcher(broken, max_delay_seconds=0).call(1)
+
+
+def test_forecast_many_uses_one_request_and_fills_cache():
+    calls = []
+    cache = ForecastCache()
+    tool = OpenMeteoWeatherTool(
+        http=SharedHttpClient(transport=httpx.MockTransport(_forecast_handler(calls))),
+        geocode_cache=_geo(),
+        forecast_cache=cache,
+    )
+
+    reports = tool.forecast_many(locations=["Kraków", "Gdańsk", "Poznań"], dates="2026-01-12")
+
+    assert [r["temp_c"] for r in reports] == [50, 54, 52]
+    assert [r["location"] for r in reports] == ["Kraków, Poland", "Gdańsk, Poland", "Poznań, Poland"]
+    assert calls == [["50.0", "54.0", "52.0"]]
+
+    # kolejne pojedyncze wywołanie trafia w cache
+    assert tool(location="Gdańsk", date="2026-01-13")["temp_c"] == 54
+    assert len(calls) == 1
+
+    # tylko brakujące miasta idą do providera
+    cache_only = tool.forecast_many(locations=["Gdańsk", "Kraków"], dates=["2026-01-10", "2026-01-11"])
+    assert [r["date"] for r in cache_only] == ["2026-01-10", "2026-01-11"]
+    assert len(calls) == 1
+
+
+def _held_forecast_handler(calls: list, hold: threading.Event, *, fail_batches: bool = False):
+    inner = _forecast_handler(calls)
+
+    def handler(request):
+        lats = request.url.params["latitude"].split(",")
+        if lats == ["1.0"]:
+            hold.wait(5)  # wywołanie "w locie" — pod obciążeniem batcher czeka okno
+        if fail_batches and len(lats) > 1:
+            calls.append(lats)
+            return httpx.Response(502, text="bad gateway")
+        return inner(request)
+
+    return handler
+
+
+def test_with_batching_combines_concurrent_single_calls():
+    calls, hold = [], threading.Event()
+    tool = OpenMeteoWeatherTool(
+        http=SharedHttpClient(transport=httpx.MockTransport(_held_forecast_handler(calls, hold))),
+        geocode_cache=_geo(),
+    ).with_batching(max_delay_seconds=0.2)
+    busy = _busy(tool.forecast_batcher.call, (1.0, 1.0), tool.forecast_batcher)
+    barrier = threading.Barrier(3)
+
+    def call(city):
+        barrier.wait()
+        return tool(location=city, date="2026-01-12")["temp_c"]
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        temps = list(pool.map(call, ["Kraków", "Gdańsk", "Poznań"]))
+    hold.set()
+    busy.join(5)
+
+    assert temps == [50, 54, 52]
+    combined = [c for c in calls if c != ["1.0"]]
+    assert len(combined) == 1
+    assert sorted(combined[0]) == ["50.0", "52.0", "54.0"]
+
+
+def test_failed_batch_request_falls_back_to_single_fetches():
+    calls, hold = [], threading.Event()
+    tool = OpenMeteoWeatherTool(
+        http=SharedHttpClient(transport=httpx.MockTransport(_held_forecast_handler(calls, hold, fail_batches=True))),
+        geocode_cache=_geo(),
+    ).with_batching(max_delay_seconds=0.2)
+    busy = _busy(tool.forecast_batcher.call, (1.0, 1.0), tool.forecast_batcher)
+    barrier = threading.Barrier(3)
+
+    def call(city):
+        barrier.wait()
+        return tool(location=city, date="2026-01-12")["temp_c"]
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        temps = list(pool.map(call, ["Kraków", "Gdańsk", "Poznań"]))
+    hold.set()
+    busy.join(5)
+
+    assert temps == [50, 54, 52]
+    assert tool.forecast_batcher.fallbacks == 3
+    assert sorted(c[0] for c in calls if len(c) == 1 and c != ["1.0"]) == ["50.0", "52.0", "54.0"]
+
+
+def test_forecast_many_falls_back_to_single_fetches():
+    calls = []
+    tool = OpenMeteoWeatherTool(
+        http=SharedHttpClient(transport=httpx.MockTransport(_held_forecast_handler(calls, threading.Event(), fail_batches=True))),
+        geocode_cache=_geo(),
+    )
+
+    reports = tool.forecast_many(locations=["Kraków", "Gdańsk"], dates="2026-01-12")
+
+    assert [r["temp_c"] for r in reports] == [50, 54]
+    assert calls == [["50.0", "54.0"], ["50.0"], ["54.0"]]
@@ -0,0 +1,166 @@
+import pytest
+
+from organizer.agents import RecoveryAgent
+from organizer.core import (
+    CachedTool,
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    RetryBudget,
+    RetryExceededError,
+    RetryPolicy,
+    Task,
+    ToolResultCache,
+    call_tool_with_retry,
+    call_tool_with_trace,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _config(**kwargs):
+    base = dict(min_calls=4, window_size=4, failure_rate_threshold=0.5, open_seconds=10.0)
+    base.update(kwargs)
+    return CircuitBreakerConfig(**base)
+
+
+def test_breaker_opens_on_error_rate_and_fails_fast():
+    clock = FakeClock()
+    breakers = CircuitBreakerRegistry(_config(), clock=clock)
+    calls = {"n": 0}
+
+    def down(**kwargs):
+        calls["n"] += 1
+        raise ConnectionError("provider down")
+
+    for _ in range(4):
+        call_tool_with_trace(tool_name="ticketmaster_events", tool_callable=down, params={}, breakers=breakers)
+    assert breakers.get("ticketmaster_events").state == "open"
+
+    result, trace = call_tool_with_trace(
+        tool_name="ticketmaster_events", tool_callable=down, params={"city": "Kraków"}, breakers=breakers
+    )
+    assert result is None
+    assert calls["n"] == 4  # narzędzie nie zostało wywołane
+    assert trace.error.type == "CIRCUIT_OPEN"
+    assert trace.error.provider == "ticketmaster_events"
+    assert trace.error.retry_after_seconds == 10.0
+
+    # inne providery działają niezależnie
+    _, ok = call_tool_with_trace(tool_name="open_meteo_weather", tool_callable=lambda **k: 1, params={}, breakers=breakers)
+    assert ok.outcome == "success"
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker("p", _config(), clock=clock)
+    for _ in range(4):
+        assert breaker.allow()
+        breaker.record(failure=True, elapsed_seconds=0.1)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10.0
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # tylko jedna próba naraz
+    breaker.record(failure=True, elapsed_seconds=0.1)
+    assert breaker.state == "open"
+
+    clock.now = 20.0
+    assert breaker.allow()
+    breaker.record(failure=False, elapsed_seconds=0.1)
+    assert breaker.state == "closed"
+    assert breaker.opened == 2
+
+
+def test_cache_hits_do_not_close_a_half_open_breaker():
+    clock = FakeClock()
+    breakers = CircuitBreakerRegistry(_config(), clock=clock)
+    provider = {"up": True}
+
+    def weather(**kwargs):
+        if not provider["up"]:
+            raise ConnectionError("provider down")
+        return {"temp_c": 3}
+
+    tool = CachedTool(weather, ToolResultCache(default_ttl_seconds=3600, clock=clock))
+    call_tool_with_trace(tool_name="weather", tool_callable=tool, params={"city": "Kraków"}, breakers=breakers)
+    provider["up"] = False
+    for i in range(4):
+        call_tool_with_trace(tool_name="weather", tool_callable=tool, params={"city": str(i)}, breakers=breakers)
+    breaker = breakers.get("weather")
+    assert breaker.state == "open"
+
+    clock.now = 10.0
+    for _ in range(3):
+        _, trace = call_tool_with_trace(tool_name="weather", tool_callable=tool, params={"city": "Kraków"}, breakers=breakers)
+        assert trace.outcome == "cache_hit"
+    assert breaker.state == "half_open"  # trafienia w cache nie są próbą providera
+
+    _, trace = call_tool_with_trace(tool_name="weather", tool_callable=tool, params={"city": "Gdańsk"}, breakers=breakers)
+    assert trace.error.type != "CIRCUIT_OPEN"  # próba half-open nadal wolna
+    assert breaker.state == "open"
+
+
+def test_slow_calls_open_the_breaker():
+    breaker = CircuitBreaker("p", _config(slow_call_seconds=1.0, slow_call_rate_threshold=0.75), clock=FakeClock())
+    for elapsed in (2.0, 2.0, 0.1, 2.0):
+        breaker.allow()
+        breaker.record(failure=False, elapsed_seconds=elapsed)
+    assert breaker.state == "open"
+
+
+def test_client_errors_do_not_open_the_breaker():
+    class Resp:
+        status_code = 404
+        headers = {}
+        text = "not found"
+
+    class NotFound(Exception):
+        response = Resp()
+
+    def tool(**kwargs):
+        raise NotFound("404")
+
+    breakers = CircuitBreakerRegistry(_config())
+    for _ in range(6):
+        call_tool_with_trace(tool_name="p", tool_callable=tool, params={}, breakers=breakers)
+    assert breakers.get("p").state == "closed"
+
+
+def test_circuit_open_is_not_retried():
+    breakers = CircuitBreakerRegistry(_config(min_calls=1, window_size=1), clock=FakeClock())
+
+    def down(**kwargs):
+        raise ConnectionError("provider down")
+
+    with pytest.raises(RetryExceededError) as excinfo:
+        call_tool_with_retry(
+            tool_name="p", tool_callable=down, params={}, actor="t", correlation_id="c",
+            policy=RetryPolicy(max_attempts=5), sleep_fn=lambda _: None, retry_budget=RetryBudget(),
+            breakers=breakers,
+        )
+    assert excinfo.value.last_error.type == "CIRCUIT_OPEN"
+
+
+def test_recovery_routes_circuit_open_to_fallback_tool():
+    breakers = CircuitBreakerRegistry(_config(min_calls=1, window_size=1), clock=FakeClock())
+    call_tool_with_trace(tool_name="open_meteo_geocoding", tool_callable=lambda **k: 1 / 0, params={}, breakers=breakers)
+    _, trace = call_tool_with_trace(
+        tool_name="open_meteo_geocoding", tool_callable=lambda **k: 1, params={"location": "Kraków"}, breakers=breakers
+    )
+
+    task = Task(name="geocode", target="open_meteo_geocoding", inputs={"location": "Kraków"})
+    plan = RecoveryAgent().propose_fix(error=trace.error, last_task=task, last_inputs=task.inputs)
+
+    assert plan.action == "fallback_tool"
+    assert plan.fallback_tool_name == "fallback_geocoder"
+    assert plan.params_patch == {"location": "Kraków"}
+    assert RecoveryAgent().fallback_tool_for("ticketmaster_events") == "fallback_ticketmaster_events"
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+from organizer.agents import WeatherAgent
+from organizer.core.types import Message
+from organizer.tools.city_normalizer import LocalCityNormalizerTool, nominative_candidates
+from organizer.tools.gazetteer import Gazetteer, Place, shared_gazetteer
+
+
+class RecordingFallback:
+    name = "fake_llm_normalizer"
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *, text: str):
+        self.calls.append(text)
+        return {"input": text, "nominative": "Pcim", "source": "openai"}
+
+
+@pytest.mark.parametrize(
+    "form, nominative",
+    [
+        ("Krakowie", "Kraków"),
+        ("Warszawie", "Warszawa"),
+        ("Gdańsku", "Gdańsk"),
+        ("Poznaniu", "Poznań"),
+        ("Wrocławiu", "Wrocław"),
+        ("Gdyni", "Gdynia"),
+        ("Katowicach", "Katowice"),
+        ("Lublinie", "Lublin"),
+        ("Opolu", "Opole"),
+        ("Bydgoszczy", "Bydgoszcz"),
+        ("Częstochowie", "Częstochowa"),
+        ("Zakopanem", "Zakopane"),
+        ("Łodzi", "Łódź"),          # forma nieregularna z gazetteera
+        ("Gnieźnie", "Gniezno"),
+        ("zielonej  górze", "Zielona Góra"),
+        ("KRAKÓW", "Kraków"),
+    ],
+)
+def test_common_forms_resolve_locally(form, nominative):
+    fallback = RecordingFallback()
+    tool = LocalCityNormalizerTool(fallback=fallback)
+
+    out = tool(text=form)
+
+    assert out == {"input": form, "nominative": nominative, "source": "gazetteer"}
+    assert fallback.calls == []
+
+
+def test_unknown_form_goes_to_fallback_and_is_counted():
+    fallback = RecordingFallback()
+    tool = LocalCityNormalizerTool(fallback=fallback)
+
+    tool(text="Krakowie")
+    tool(text="Gdyni")
+    assert tool(text="Pcimiu")["source"] == "openai"
+
+    assert fallback.calls == ["Pcimiu"]
+    assert (tool.stats.local_hits, tool.stats.fallback_calls) == (2, 1)
+    assert tool.stats.local_hit_rate == pytest.approx(2 / 3)
+
+
+def test_without_fallback_unknown_text_passes_through():
+    tool = LocalCityNormalizerTool()
+    assert tool(text="Pcimiu") == {"input": "Pcimiu", "nominative": "Pcimiu", "source": "passthrough"}
+    assert tool.stats.unresolved == 1
+
+
+def test_rule_candidates_are_validated_by_gazetteer():
+    gazetteer = Gazetteer([Place("Kraków", 50.06, 19.94)])
+    tool = LocalCityNormalizerTool(gazetteer=gazetteer)
+
+    assert "kraków" in nominative_candidates("Krakowie")
+    assert tool.resolve_local("Lublinie") is None  # reguła pasuje, ale nie ma takiej miejscowości
+
+
+def test_gazetteer_trie_prefix_search_and_size():
+    gazetteer = shared_gazetteer()
+    assert len(gazetteer) > 100
+    names = {gazetteer.places[i].name for _, i in gazetteer.trie.with_prefix("gd")}
+    assert names == {"Gdańsk", "Gdynia"}
+
+
+def test_local_resolution_is_fast():
+    tool = LocalCityNormalizerTool()
+    tool(text="Krakowie")  # wczytanie gazetteera
+    started = time.perf_counter()
+    for _ in range(1000):
+        tool(text="Krakowie")
+    assert (time.perf_counter() - started) / 1000 < 0.001
+
+
+def test_weather_agent_prefetches_locally_resolved_city():
+    class Weather:
+        name = "w"
+
+        def __call__(self, *, location, date):
+            return {"location": location, "date": date, "summary": "pogodnie", "temp_c": 20, "precip_prob": 0}
+
+    agent = WeatherAgent(tool=Weather(), city_normalizer=LocalCityNormalizerTool(fallback=RecordingFallback()))
+
+    plan = agent.prefetch_plan(Message(sender="user", content="pogoda w Krakowie"))
+    assert plan["weather_tool"].params["location"] == "Kraków"
+    assert agent.prefetch_plan(Message(sender="user", content="pogoda w Pcimiu")) == {}
+    assert "Kraków" in agent.handle(Message(sender="user", content="pogoda w Krakowie")).content
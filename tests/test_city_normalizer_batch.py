@@ -0,0 +1,157 @@
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from organizer.tools.real import FakeCompletionBackend, LlmClient, LlmResponseCache, OpenAICityNormalizerTool
+from organizer.tools.real.llm_client import Completion
+
+NOMINATIVES = {"Krakowie": "Kraków", "Gdańsku": "Gdańsk", "Poznaniu": "Poznań", "Sopocie": "Sopot"}
+
+
+def _items(msgs) -> list[dict]:
+    payload = re.search(r"Wejście: (\{.*\})\n", msgs[-1]["content"]).group(1)
+    return json.loads(payload)["items"]
+
+
+def _batch_responder(skip: set[str] = frozenset()):
+    def respond(msgs):
+        results = [
+            {"id": item["id"], "nominative": NOMINATIVES[item["text"]]}
+            for item in _items(msgs)
+            if item["text"] not in skip
+        ]
+        return json.dumps({"results": results}, ensure_ascii=False)
+
+    return respond
+
+
+def test_normalize_many_uses_one_completion_and_keeps_order():
+    backend = FakeCompletionBackend(_batch_responder())
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend))
+
+    out = tool.normalize_many(["Poznaniu", "Krakowie", "Poznaniu", "Sopocie"])
+
+    assert [r["nominative"] for r in out] == ["Poznań", "Kraków", "Poznań", "Sopot"]
+    assert out[0] == {"input": "Poznaniu", "nominative": "Poznań", "source": "openai"}
+    assert len(backend.requests) == 1
+    assert [i["text"] for i in _items(backend.requests[0]["messages"])] == ["Poznaniu", "Krakowie", "Sopocie"]
+
+
+def test_missing_answers_are_reissued_alone():
+    backend = None
+
+    def flaky(msgs):
+        # pierwsza odpowiedź gubi "Gdańsku"; ponowienie dostaje tylko brakującą nazwę
+        first = len(backend.requests) == 1
+        return _batch_responder({"Gdańsku"} if first else set())(msgs)
+
+    backend = FakeCompletionBackend(flaky)
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend))
+
+    out = tool.normalize_many(["Krakowie", "Gdańsku", "Sopocie"])
+
+    assert [r["nominative"] for r in out] == ["Kraków", "Gdańsk", "Sopot"]
+    assert [[i["text"] for i in _items(r["messages"])] for r in backend.requests] == [
+        ["Krakowie", "Gdańsku", "Sopocie"],
+        ["Gdańsku"],
+    ]
+
+
+def test_unanswered_after_retries_raises():
+    backend = FakeCompletionBackend(_batch_responder(skip={"Sopocie"}))
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend), batch_retries=1)
+
+    with pytest.raises(RuntimeError, match="Sopocie"):
+        tool.normalize_many(["Krakowie", "Sopocie"])
+    assert len(backend.requests) == 2
+
+
+def test_malformed_rows_are_ignored_and_retried():
+    replies = iter([
+        json.dumps({"results": [{"id": 0, "nominative": ""}, {"id": 7, "nominative": "X"}, "oops"]}),
+        json.dumps({"results": [{"id": 0, "nominative": "Kraków"}]}, ensure_ascii=False),
+    ])
+    backend = FakeCompletionBackend(lambda msgs: next(replies))
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend))
+
+    assert tool.normalize_many(["Krakowie"])[0]["nominative"] == "Kraków"
+
+
+def test_retry_after_malformed_answer_bypasses_response_cache():
+    backend = None
+
+    def truncated_then_ok(msgs):
+        # cała pierwsza odpowiedź ucięta; ponowienie to identyczne zapytanie
+        return '{"results": [' if len(backend.requests) == 1 else _batch_responder()(msgs)
+
+    backend = FakeCompletionBackend(truncated_then_ok)
+    cache = LlmResponseCache()
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend, cache=cache))
+
+    assert [r["nominative"] for r in tool.normalize_many(["Krakowie", "Sopocie"])] == ["Kraków", "Sopot"]
+    assert len(backend.requests) == 2
+    assert len(cache) == 1  # tylko poprawna odpowiedź
+
+    tool.normalize_many(["Krakowie", "Sopocie"])
+    assert len(backend.requests) == 2  # z cache
+
+
+def test_retry_evicts_poisoned_cache_entry():
+    backend = FakeCompletionBackend(_batch_responder())
+    cache = LlmResponseCache()
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend, cache=cache))
+    tool.normalize_many(["Krakowie"])
+    (key,) = cache._memory
+    cache.put(key, Completion(content='{"results": []}', model=tool.model))  # np. wpis sprzed walidacji
+
+    assert tool.normalize_many(["Krakowie"])[0]["nominative"] == "Kraków"
+    assert len(backend.requests) == 2
+    assert cache.get(key).content != '{"results": []}'
+
+
+def test_normalize_many_chunks_by_batch_size():
+    backend = FakeCompletionBackend(_batch_responder())
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend), batch_size=2)
+
+    tool.normalize_many(list(NOMINATIVES))
+
+    assert len(backend.requests) == 2
+
+
+def test_concurrent_single_calls_share_one_completion():
+    hold = threading.Event()
+    respond = _batch_responder()
+
+    def held(msgs):
+        texts = [i["text"] for i in _items(msgs)]
+        if texts == ["Wrocławiu"]:
+            hold.wait(5)  # wywołanie "w locie" — pod obciążeniem batcher czeka okno
+            return json.dumps({"results": [{"id": 0, "nominative": "Wrocław"}]}, ensure_ascii=False)
+        return respond(msgs)
+
+    backend = FakeCompletionBackend(held, latency_seconds=0.01)
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend)).with_batching(max_delay_seconds=0.2, max_batch_size=4)
+    busy = threading.Thread(target=tool, kwargs={"text": "Wrocławiu"})
+    busy.start()
+    while tool.batcher.batches < 1:
+        time.sleep(0.001)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        out = list(pool.map(lambda t: tool(text=t), NOMINATIVES))
+    hold.set()
+    busy.join(5)
+
+    assert [r["nominative"] for r in out] == list(NOMINATIVES.values())
+    assert len(backend.requests) == 2  # "w locie" + jedno zapytanie dla czterech
+    assert tool.batcher.batches == 2
+
+
+def test_lone_single_call_is_sent_without_waiting():
+    backend = FakeCompletionBackend(_batch_responder())
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend)).with_batching(max_delay_seconds=60.0)
+
+    assert tool(text="Krakowie")["nominative"] == "Kraków"  # nie czeka 60 s
@@ -0,0 +1,78 @@
+import json
+import pickle
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from organizer.core.trace import TraceEvent
+from organizer.core.trace_logger import write_trace_jsonl
+from organizer.core.types import AgentResult, Event, Message, ToolResult, iso_from_ns, ns_from_iso
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Message(sender="user", content="hej"),
+        Event(type="decision", actor="coordinator", target="planner"),
+        ToolResult(ok=True),
+        AgentResult(message=Message(sender="planner", content="plan")),
+        TraceEvent(actor="weather", action="tool_call", target="open_meteo"),
+    ],
+)
+def test_models_are_slotted_and_frozen(obj):
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        obj.correlation_id = "CID-X"
+
+
+def test_timestamp_is_stored_as_ns_and_formatted_lazily():
+    msg = Message(sender="user", content="hej")
+
+    assert isinstance(msg.timestamp_ns, int)
+    assert msg._iso is None  # jeszcze nie sformatowany
+    iso = msg.timestamp
+    assert iso.endswith("+00:00")
+    assert msg.timestamp is iso  # drugi odczyt z pamięci
+    assert ns_from_iso(iso) == msg.timestamp_ns // 1_000 * 1_000
+
+
+def test_given_iso_timestamp_is_kept_verbatim():
+    raw = "2026-01-10T12:30:00.250000+02:00"
+    ev = Event.from_dict({"type": "respond", "actor": "planner", "target": "user", "timestamp": raw})
+
+    assert ev.timestamp == raw
+    assert ev.to_dict()["timestamp"] == raw
+    assert iso_from_ns(ev.timestamp_ns) == "2026-01-10T10:30:00.250000+00:00"
+
+
+def test_replace_keeps_timestamp_and_other_fields():
+    msg = Message(sender="user", content="hej", meta={"x": 1})
+
+    copy = msg.replace(correlation_id="CID-1")
+
+    assert copy.timestamp_ns == msg.timestamp_ns
+    assert (copy.sender, copy.role, copy.meta, copy.correlation_id) == ("user", "user", {"x": 1}, "CID-1")
+    with pytest.raises(TypeError, match="unexpected fields"):
+        msg.replace(colour="red")
+
+
+def test_equality_repr_and_pickle_match_dataclass_semantics():
+    a = Message(sender="user", content="hej", timestamp=1_700_000_000_000_000_000)
+    b = Message(sender="user", content="hej", timestamp=1_700_000_000_000_000_000)
+
+    assert a == b and a != a.replace(content="inne")
+    assert repr(a).startswith("Message(sender='user', content='hej', role='user', meta={}, timestamp='2023-11-14T")
+    assert pickle.loads(pickle.dumps(a)) == a
+
+
+def test_trace_event_to_dict_and_jsonl(tmp_path):
+    trace = TraceEvent(actor="weather", action="tool_call", target="open_meteo", params={"q": "Kraków"},
+                       outcome="success", correlation_id="CID-2", meta={"coalesced": True})
+
+    path = write_trace_jsonl([trace], tmp_path / "trace.jsonl")
+    line = json.loads(path.read_text(encoding="utf-8"))
+
+    assert list(line) == ["actor", "action", "target", "params", "outcome", "error", "timestamp",
+                          "correlation_id", "meta"]
+    assert line["timestamp"] == trace.timestamp
+    assert trace.to_event().timestamp == trace.timestamp
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from organizer.agents import PlannerAgent
+from organizer.core import concurrency
+from organizer.core import AgentRegistry, AsyncAgent, Orchestrator, RoutingRule, call_tool_with_trace
+from organizer.core.agent import Agent
+from organizer.core.deadline import DeadlineExceeded, deadline_scope, remaining_seconds, request_timeout
+from organizer.core.tool_runner import call_tool_with_trace_async
+from organizer.core.trace_logger import write_trace_jsonl
+from organizer.core.types import Message
+from organizer.tools.real.http import HttpPoolConfig, SharedHttpClient
+
+
+class SleepyAgent(Agent):
+    def __init__(self, name: str, seconds: float):
+        super().__init__(name=name)
+        self._seconds = seconds
+
+    def handle(self, message: Message) -> Message:
+        time.sleep(self._seconds)
+        return Message(sender=self.name, content="za późno")
+
+
+class SleepyAsyncAgent(AsyncAgent):
+    def __init__(self, name: str, seconds: float):
+        super().__init__(name=name)
+        self._seconds = seconds
+
+    async def handle_async(self, message: Message) -> Message:
+        await asyncio.sleep(self._seconds)
+        return Message(sender=self.name, content="za późno")
+
+
+def make_orchestrator(agent, turn_timeout_seconds):
+    reg = AgentRegistry()
+    reg.register(agent)
+    return Orchestrator(reg, [RoutingRule("plan", agent.name)], turn_timeout_seconds=turn_timeout_seconds)
+
+
+def test_nested_scope_cannot_extend_parent_budget():
+    assert remaining_seconds() is None
+    with deadline_scope(0.5):
+        with deadline_scope(60):
+            assert remaining_seconds() <= 0.5
+        with deadline_scope(0.1):
+            assert remaining_seconds() <= 0.1
+        assert request_timeout(10.0) <= 0.5
+    assert remaining_seconds() is None
+    assert request_timeout(10.0) == 10.0
+
+
+def test_tool_call_overrun_is_reported_as_timeout():
+    def slow_tool(**kwargs):
+        time.sleep(1.0)
+        return {"ok": True}
+
+    started = time.perf_counter()
+    result, trace = call_tool_with_trace(tool_name="slow", tool_callable=slow_tool, params={}, timeout_seconds=0.05)
+
+    assert time.perf_counter() - started < 0.5
+    assert result is None
+    assert (trace.error.type, trace.error.code) == ("TIMEOUT", "TIMEOUT")
+
+
+def test_tool_call_gets_remaining_turn_budget():
+    calls = []
+
+    with deadline_scope(0.05):
+        _, first = call_tool_with_trace(tool_name="slow", tool_callable=lambda **k: time.sleep(0.5), params={})
+        _, second = call_tool_with_trace(tool_name="t", tool_callable=lambda **k: calls.append(k), params={})
+
+    assert first.error.type == "TIMEOUT"
+    assert second.error.type == "TIMEOUT"  # budżet już zużyty -> narzędzie nie jest wołane
+    assert calls == []
+
+
+def test_async_tool_call_is_cancelled_on_timeout():
+    cancelled = []
+
+    async def slow_tool(**kwargs):
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    _, trace = asyncio.run(
+        call_tool_with_trace_async(tool_name="slow", tool_callable=slow_tool, params={}, timeout_seconds=0.05)
+    )
+
+    assert trace.error.type == "TIMEOUT"
+    assert cancelled == [True]
+
+
+def test_turn_never_exceeds_slo(tmp_path):
+    orch = make_orchestrator(SleepyAgent("planner", 1.0), turn_timeout_seconds=0.1)
+
+    started = time.perf_counter()
+    reply = orch.handle_user_text("plan na jutro")
+
+    assert time.perf_counter() - started < 0.6
+    assert reply.sender == "orchestrator"
+    assert [t.action for t in orch.team_conversation] == ["route", "error", "respond"]
+    timeout = orch.team_conversation[1]
+    assert (timeout.target, timeout.error.type) == ("planner", "TIMEOUT")
+
+    path = write_trace_jsonl(orch.team_conversation, tmp_path / "trace.jsonl")
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert lines[1]["error"]["type"] == "TIMEOUT"
+
+
+def test_async_turn_never_exceeds_slo():
+    orch = make_orchestrator(SleepyAsyncAgent("planner", 1.0), turn_timeout_seconds=0.1)
+
+    started = time.perf_counter()
+    reply = asyncio.run(orch.handle_user_text_async("plan na jutro"))
+
+    assert time.perf_counter() - started < 0.6
+    assert reply.sender == "orchestrator"
+    assert orch.team_conversation[-2].error.type == "TIMEOUT"
+
+
+def test_fast_turn_is_unaffected_by_slo():
+    orch = make_orchestrator(SleepyAgent("planner", 0.0), turn_timeout_seconds=5.0)
+    assert orch.handle_user_text("plan").content == "za późno"
+
+
+def test_http_timeout_is_clipped_to_remaining_budget():
+    http = SharedHttpClient(HttpPoolConfig(timeout_seconds=10.0))
+
+    assert http._timeout(None) == 10.0
+    with deadline_scope(0.5):
+        assert http._timeout(None) <= 0.5
+    with deadline_scope(0.0):
+        with pytest.raises(DeadlineExceeded):
+            http._timeout(None)
+
+
+class SlowFixedTool:
+    def __init__(self, name, payload, delay):
+        self.name = name
+        self._payload = payload
+        self._delay = delay
+
+    def __call__(self, **kwargs):
+        time.sleep(self._delay)
+        return dict(self._payload, **kwargs)
+
+
+def test_concurrent_planner_turns_do_not_starve_their_branches(monkeypatch):
+    # mała pula I/O: ciała agentów nie mogą zajmować wątków, na które czekają ich gałęzie
+    io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="test-io")
+    monkeypatch.setattr(concurrency, "_executor", io_pool)
+    weather = SlowFixedTool("weather", {"summary": "pogodnie", "temp_c": 20, "precip_prob": 0}, 0.05)
+    events = SlowFixedTool("events", {"events": []}, 0.05)
+
+    def turn(i):
+        planner = PlannerAgent(weather_tool=weather, events_tool=events)
+        orch = make_orchestrator(planner, turn_timeout_seconds=2.0)
+        return orch.handle_user_text(f"Ułóż plan w Krakowie #{i}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=24) as sessions:
+            replies = list(sessions.map(turn, range(24)))
+    finally:
+        io_pool.shutdown(wait=True)
+
+    assert [r.sender for r in replies] == ["planner"] * 24
@@ -0,0 +1,124 @@
+import httpx
+
+from organizer.core.deadline import deadline_scope, remaining_seconds
+from organizer.tools.real import ForecastCache, GeocodingCache, GeoPoint, OpenMeteoWeatherTool
+from organizer.tools.real.http import SharedHttpClient
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run_now(fn, *args, **kwargs):
+    fn(*args, **kwargs)
+
+
+def test_one_window_fetch_serves_every_date_for_location():
+    forecast_calls = []
+
+    def handler(request):
+        forecast_calls.append(request.url)
+        times, temps, precs = [], [], []
+        for day in range(10, 17):
+            times.append(f"2026-01-{day}T12:00")
+            temps.append(float(day))
+            precs.append(5.0)
+        return httpx.Response(200, json={"hourly": {"time": times, "temperature_2m": temps, "precipitation_probability": precs}})
+
+    geo = GeocodingCache()
+    geo.put("Kraków", "en", GeoPoint(50.06, 19.94, "Kraków, Poland"))
+    tool = OpenMeteoWeatherTool(
+        http=SharedHttpClient(transport=httpx.MockTransport(handler)),
+        geocode_cache=geo,
+        forecast_cache=ForecastCache(),
+    )
+
+    temps = [tool(location="Kraków", date=f"2026-01-{d}")["temp_c"] for d in (10, 13, 16)]
+
+    assert temps == [10, 13, 16]
+    assert len(forecast_calls) == 1
+
+
+def test_ttl_is_aligned_to_update_cadence():
+    clock = FakeClock(10_000.0)
+    cache = ForecastCache(update_interval_seconds=3600, clock=clock, refresh_ahead_seconds=0)
+    loads = []
+
+    def loader():
+        loads.append(clock.now)
+        return {"n": len(loads)}
+
+    assert cache.expires_at(10_000.0) == 10_800.0  # następna pełna godzina, nie now + 3600
+    assert cache.get_or_load(50.061, 19.938, loader) == {"n": 1}
+    clock.now = 10_799.0
+    assert cache.get_or_load(50.06, 19.94, loader) == {"n": 1}  # ten sam klucz po zaokrągleniu
+    clock.now = 10_800.0
+    assert cache.get_or_load(50.06, 19.94, loader) == {"n": 2}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_refresh_ahead_reloads_hot_entry_after_model_update():
+    clock = FakeClock(0.0)
+    cache = ForecastCache(update_interval_seconds=3600, refresh_ahead_seconds=300, clock=clock, submit_fn=run_now)
+    loads = []
+
+    def loader():
+        loads.append(clock.now)
+        return len(loads)
+
+    cache.get_or_load(1, 1, loader)
+    clock.now = 3400.0  # w oknie refresh-ahead: wpis gorący, ale model jeszcze bez nowych danych
+    assert cache.get_or_load(1, 1, loader) == 1
+    assert loads == [0.0]
+
+    clock.now = 3700.0  # po granicy cyklu: odpowiedź od razu ze starego wpisu, pobranie w tle
+    assert cache.get_or_load(1, 1, loader) == 1
+    assert loads == [0.0, 3700.0]
+    assert cache.refreshes == 1 and cache.misses == 1
+    assert cache.peek(1, 1) == 2  # kolejne zapytanie trafia już w świeży wpis
+
+    clock.now = 7199.0
+    assert cache.peek(1, 1) == 2
+    clock.now = 7200.0  # świeży wpis obowiązuje do granicy liczonej od własnego fetched_at
+    assert cache.peek(1, 1) is None
+
+
+def test_background_refresh_runs_without_the_round_deadline():
+    clock = FakeClock(0.0)
+    cache = ForecastCache(update_interval_seconds=3600, refresh_ahead_seconds=300, clock=clock, submit_fn=run_now)
+    deadlines = []
+
+    def loader():
+        deadlines.append(remaining_seconds())
+        return len(deadlines)
+
+    cache.get_or_load(1, 1, loader)
+    clock.now = 3400.0
+    cache.get_or_load(1, 1, loader)
+    clock.now = 3700.0
+    with deadline_scope(5.0):
+        assert cache.get_or_load(1, 1, loader) == 1
+
+    assert deadlines == [None, None]
+
+
+def test_cold_entry_after_boundary_is_a_miss():
+    clock = FakeClock(0.0)
+    cache = ForecastCache(update_interval_seconds=3600, refresh_ahead_seconds=300, clock=clock, submit_fn=run_now)
+
+    cache.get_or_load(1, 1, lambda: "stary")
+    clock.now = 3700.0  # nikt nie pytał przed granicą
+    assert cache.get_or_load(1, 1, lambda: "nowy") == "nowy"
+    assert (cache.misses, cache.refreshes) == (2, 0)
+
+
+def test_entries_are_bounded():
+    cache = ForecastCache(max_entries=2, clock=FakeClock(0.0))
+    for i in range(3):
+        cache.get_or_load(i, i, lambda i=i: i)
+    assert len(cache) == 2
+    assert cache.peek(0, 0) is None
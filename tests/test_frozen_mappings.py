@@ -0,0 +1,79 @@
+import json
+import pickle
+
+import pytest
+
+from organizer.core import AgentRegistry, Orchestrator, RoutingRule
+from organizer.core.agent import Agent
+from organizer.core.trace import TraceEvent
+from organizer.core.types import EMPTY, AgentResult, Event, FrozenDict, Message, freeze
+
+
+def test_frozen_dict_is_an_immutable_dict():
+    fd = FrozenDict({"q": "Kraków", "n": 1})
+
+    assert isinstance(fd, dict) and fd == {"q": "Kraków", "n": 1}
+    for mutate in (lambda: fd.__setitem__("x", 1), lambda: fd.update(x=1), lambda: fd.pop("q"),
+                   lambda: fd.setdefault("x", 1), fd.clear, fd.popitem):
+        with pytest.raises(TypeError, match="immutable"):
+            mutate()
+    assert json.loads(json.dumps(fd, ensure_ascii=False)) == {"q": "Kraków", "n": 1}
+    assert pickle.loads(pickle.dumps(fd)) == fd
+    assert hash(fd) == hash(FrozenDict({"n": 1, "q": "Kraków"}))
+    assert repr(fd) == "{'q': 'Kraków', 'n': 1}"
+
+
+def test_freeze_reuses_frozen_and_empty_mappings():
+    fd = FrozenDict({"a": 1})
+
+    assert freeze(fd) is fd
+    assert freeze(None) is EMPTY and freeze({}) is EMPTY
+    assert Message(sender="user", content="hej").meta is EMPTY
+
+
+def test_with_correlation_id_shares_fields_and_timestamp():
+    msg = Message(sender="user", content="hej", meta={"x": 1})
+    iso = msg.timestamp
+
+    tagged = msg.with_correlation_id("CID-1")
+
+    assert tagged.correlation_id == "CID-1" and msg.correlation_id is None
+    assert tagged.meta is msg.meta
+    assert tagged.timestamp is iso
+    assert tagged.with_correlation_id("CID-1") is tagged
+
+
+def test_to_dict_and_to_event_do_not_copy():
+    trace = TraceEvent(actor="weather", action="tool_call", target="open_meteo", params={"q": "Kraków"})
+    event = trace.to_event()
+
+    assert event.data is trace.params
+    assert event.to_dict()["data"] is event.data
+    assert Event.from_dict(event.to_dict()).data is event.data
+
+
+class TaggingAgent(Agent):
+    def __init__(self):
+        super().__init__(name="tagger")
+
+    def handle(self, message: Message) -> AgentResult:
+        ev = Event(type="observation", actor=self.name, target="user", data={"seen": message.content})
+        return AgentResult(message=Message(sender=self.name, content="ok", meta={"k": 1}), events=[ev])
+
+
+def test_orchestrator_propagates_events_without_copying_data():
+    registry = AgentRegistry()
+    agent = TaggingAgent()
+    registry.register(agent)
+    orch = Orchestrator(registry, [RoutingRule("tag", "tagger")])
+
+    user = Message(sender="user", content="tag me", correlation_id="CID-7")
+    reply = orch.handle(user)
+
+    assert orch.user_history[0] is user  # correlation_id już był — bez kopii
+    observed = next(e for e in orch.team_events if e.type == "observation")
+    assert observed.correlation_id == "CID-7"
+    assert observed.data == {"seen": "tag me"}
+    assert reply.correlation_id == "CID-7" and reply.meta == {"k": 1}
+    route = next(t for t in orch.team_conversation if t.action == "route")
+    assert next(e for e in orch.team_events if e.type == "route").data is route.params
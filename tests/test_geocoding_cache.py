@@ -0,0 +1,71 @@
+import json
+
+from organizer.tools.real import GeocodingCache, GeoPoint, OpenMeteoWeatherTool
+
+
+class CountingGeocoder:
+    name = "counting_geocoder"
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, *, location, count=1, language="en"):
+        self.calls += 1
+        return {"results": [{"name": "Kraków", "country": "Poland", "latitude": 50.06, "longitude": 19.94}]}
+
+
+def test_cache_survives_restart_via_sqlite(tmp_path):
+    db = tmp_path / "geo.sqlite3"
+    cache = GeocodingCache(db)
+    cache.put("Kraków", "en", GeoPoint(50.06, 19.94, "Kraków, Poland"))
+    cache.close()
+
+    warm = GeocodingCache(db)
+    point = warm.get("  KRAKÓW ", "en")
+    assert point == GeoPoint(50.06, 19.94, "Kraków, Poland")
+    assert warm.disk_hits == 1
+
+    warm.get("kraków", "en")
+    assert warm.memory_hits == 1
+    assert warm.get("kraków", "pl") is None
+    assert warm.misses == 1
+
+
+def test_memory_lru_is_bounded():
+    cache = GeocodingCache(max_memory_entries=2)
+    for i in range(3):
+        cache.put(f"city-{i}", "en", GeoPoint(i, i, f"City {i}"))
+
+    assert cache.get("city-0", "en") is None  # wypadł z RAM, brak SQLite
+    assert cache.get("city-2", "en") is not None
+
+
+def test_preload_from_jsonl_and_export_roundtrip(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    lines = [
+        {"actor": "orchestrator", "action": "route", "target": "weather", "params": {"text": "x"}},
+        {"actor": "weather", "action": "tool_call", "target": "open_meteo_geocoding",
+         "params": {"location": "Gdańsk", "latitude": 54.35, "longitude": 18.65, "name": "Gdańsk, Poland"}},
+        {"location": "Warszawa", "language": "en", "latitude": 52.23, "longitude": 21.01, "name": "Warsaw, Poland"},
+    ]
+    trace.write_text("\n".join(json.dumps(x) for x in lines) + "\nnot json\n", encoding="utf-8")
+
+    cache = GeocodingCache()
+    assert cache.preload_jsonl(trace, tmp_path / "missing.jsonl") == 2
+    assert cache.get("gdańsk").name == "Gdańsk, Poland"
+
+    dump = tmp_path / "dump.jsonl"
+    assert cache.export_jsonl(dump) == 2
+    other = GeocodingCache()
+    other.preload_jsonl(dump)
+    assert other.get("Warszawa").latitude == 52.23
+
+
+def test_weather_tool_skips_geocoding_on_cache_hit():
+    geocoder = CountingGeocoder()
+    cache = GeocodingCache()
+    tool = OpenMeteoWeatherTool(geocoding=geocoder, geocode_cache=cache)
+
+    assert tool._geocode("Kraków") == (50.06, 19.94, "Kraków, Poland")
+    assert tool._geocode("kraków") == (50.06, 19.94, "Kraków, Poland")
+    assert geocoder.calls == 1
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from organizer.core import Hedger, HedgePolicy, call_tool_with_hedging, call_tool_with_hedging_async
+
+
+def _warm(hedger, provider, seconds=0.01, n=20):
+    for _ in range(n):
+        hedger.tracker.record(provider, seconds)
+
+
+def test_no_hedge_without_enough_latency_samples():
+    hedger = Hedger(HedgePolicy(min_samples=5))
+    result, traces = call_tool_with_hedging(
+        tool_name="geo", tool_callable=lambda **k: {"ok": True}, params={"q": 1}, hedger=hedger, correlation_id="c1"
+    )
+
+    assert result == {"ok": True}
+    assert len(traces) == 1
+    assert traces[0].meta == {"attempt": 1, "hedge": False}
+    assert hedger.hedges == 0
+    assert hedger.tracker.count("geo") == 1
+
+
+def test_slow_primary_is_hedged_and_duplicate_wins():
+    hedger = Hedger(HedgePolicy(min_samples=20))
+    _warm(hedger, "forecast", 0.01)
+    release = threading.Event()
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def tool(**kwargs):
+        with lock:
+            calls["n"] += 1
+            n = calls["n"]
+        if n == 1:
+            release.wait(2)  # pierwsza próba "wisi"
+            return {"attempt": 1}
+        return {"attempt": 2}
+
+    result, traces = call_tool_with_hedging(
+        tool_name="forecast", tool_callable=tool, params={"lat": 50}, hedger=hedger, correlation_id="cid-h"
+    )
+    release.set()
+
+    assert result == {"attempt": 2}
+    assert [t.correlation_id for t in traces] == ["cid-h", "cid-h"]
+    assert [t.meta["hedge"] for t in traces] == [False, True]
+    assert [t.outcome for t in traces] == ["cancelled", "success"]
+    assert (hedger.hedges, hedger.hedge_wins) == (1, 1)
+
+    # przegrana próba też trafia do okna latencji, gdy się skończy (p95 bez survivor bias)
+    give_up = time.monotonic() + 2
+    while hedger.tracker.count("forecast") < 22 and time.monotonic() < give_up:
+        time.sleep(0.005)
+    assert hedger.tracker.count("forecast") == 22
+    assert hedger.tracker.percentile("forecast", 1.0) >= hedger.tracker.percentile("forecast", 0.0)
+
+
+def test_failed_attempts_are_recorded():
+    hedger = Hedger(HedgePolicy(min_samples=5))
+
+    def down(**kwargs):
+        time.sleep(0.01)
+        raise ConnectionError("provider down")
+
+    result, traces = call_tool_with_hedging(tool_name="geo", tool_callable=down, params={}, hedger=hedger)
+
+    assert result is None and traces[0].outcome == "error"
+    assert hedger.tracker.count("geo") == 1
+    assert hedger.tracker.percentile("geo", 0.5) >= 0.01
+
+
+def test_hedge_budget_caps_duplicates():
+    hedger = Hedger(HedgePolicy(min_samples=20, budget_ratio=0.0))
+    _warm(hedger, "forecast", 0.001)
+
+    def slow(**kwargs):
+        time.sleep(0.02)
+        return 1
+
+    hedged = []
+    for _ in range(3):
+        _, traces = call_tool_with_hedging(tool_name="forecast", tool_callable=slow, params={}, hedger=hedger)
+        hedged.append(len(traces))
+
+    assert hedged == [2, 1, 1]  # tylko token startowy, ratio=0 nic nie dokłada
+    assert hedger.hedges == 1
+
+
+def test_async_hedge_cancels_loser():
+    hedger = Hedger(HedgePolicy(min_samples=20))
+    _warm(hedger, "geo", 0.01)
+    calls = []
+
+    async def tool(**kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return len(calls)
+
+    result, traces = asyncio.run(
+        call_tool_with_hedging_async(tool_name="geo", tool_callable=tool, params={}, hedger=hedger, correlation_id="c")
+    )
+
+    assert result == 2
+    assert [t.outcome for t in traces] == ["cancelled", "success"]
+    assert {t.correlation_id for t in traces} == {"c"}
+
+
+def test_counters_are_consistent_under_concurrency():
+    hedger = Hedger(HedgePolicy(min_samples=20, budget_ratio=1.0, budget_max_tokens=1000))
+    _warm(hedger, "forecast", 0.001)
+
+    def slow(**kwargs):
+        time.sleep(0.01)
+        return 1
+
+    def call(_):
+        return call_tool_with_hedging(tool_name="forecast", tool_callable=slow, params={}, hedger=hedger)[1]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        all_traces = list(pool.map(call, range(40)))
+
+    assert hedger.hedges == sum(len(traces) == 2 for traces in all_traces) > 0
+    assert hedger.hedge_wins <= hedger.hedges
+    # każde wywołanie zapisało co najmniej próbę zwycięską; duplikat anulowany przed startem — nic
+    assert 20 + 40 <= hedger.tracker.count("forecast") <= 20 + sum(len(traces) for traces in all_traces)
+
+
+def test_async_cancelled_loser_records_lower_bound():
+    hedger = Hedger(HedgePolicy(min_samples=20))
+    _warm(hedger, "geo", 0.01)
+    calls = []
+
+    async def tool(**kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return len(calls)
+
+    async def run():
+        out = await call_tool_with_hedging_async(tool_name="geo", tool_callable=tool, params={}, hedger=hedger)
+        await asyncio.sleep(0)  # anulowana próba kończy się w następnym kroku pętli
+        return out
+
+    asyncio.run(run())
+
+    assert hedger.tracker.count("geo") == 22
@@ -0,0 +1,74 @@
+from datetime import date
+
+import httpx
+import pytest
+
+from organizer.tools.real import GeocodingCache, GeoPoint, HourlySeries, OpenMeteoWeatherTool
+from organizer.tools.real.http import SharedHttpClient
+
+
+def _hourly(days=(10, 11), precip=None):
+    times, temps, precs = [], [], []
+    for d in days:
+        for h in range(24):
+            times.append(f"2026-01-{d}T{h:02d}:00")
+            temps.append(float(h))
+            precs.append(float(precip(d, h)) if precip else 50.0)
+    return {"time": times, "temperature_2m": temps, "precipitation_probability": precs}
+
+
+def test_contiguous_series_indexes_day_and_hour_arithmetically():
+    series = HourlySeries.from_hourly(_hourly())
+
+    assert series.days() == [date(2026, 1, 10), date(2026, 1, 11)]
+    assert series.index(date(2026, 1, 11), 12) == 36
+    assert series.at(date(2026, 1, 10), 12) == (12.0, 50.0)
+    assert series.at(date(2026, 1, 12), 12) is None
+
+
+def test_series_with_gaps_falls_back_to_dict_index():
+    hourly = {
+        "time": ["2026-01-10T06:00", "2026-01-10T18:00", "2026-01-11T09:00"],
+        "temperature_2m": [1.0, None, 3.0],
+        "precipitation_probability": [10, 20, 30],
+    }
+    series = HourlySeries.from_hourly(hourly)
+
+    assert series.at(date(2026, 1, 10), 12) is None
+    assert series.first_of_day(date(2026, 1, 11)) == (3.0, 30.0)
+    stats = series.daily_stats(date(2026, 1, 10))
+    assert (stats.temp_min, stats.temp_max, stats.precip_max) == (1.0, 1.0, 20.0)  # null pominięty
+
+
+def test_daily_stats_and_best_window():
+    # deszczowo wszędzie poza 15:00–18:00
+    series = HourlySeries.from_hourly(_hourly(precip=lambda d, h: 10 if 15 <= h < 18 else 80))
+    day = date(2026, 1, 10)
+
+    stats = series.daily_stats(day)
+    assert (stats.temp_min, stats.temp_max, stats.temp_mean) == (0.0, 23.0, 11.5)
+    assert stats.precip_max == 80.0
+
+    window = series.best_window(day)
+    assert (window.start_hour, window.end_hour, window.label()) == (15, 18, "15:00–18:00")
+    assert window.precip_mean == 10.0
+
+    with pytest.raises(ValueError):
+        series.best_window(day, hours=0)
+
+
+def test_weather_tool_reports_daily_range_and_best_window():
+    hourly = _hourly(precip=lambda d, h: 0 if h >= 19 else 40)
+
+    def handler(request):
+        return httpx.Response(200, json={"hourly": hourly})
+
+    geo = GeocodingCache()
+    geo.put("Kraków", "en", GeoPoint(50.06, 19.94, "Kraków, Poland"))
+    tool = OpenMeteoWeatherTool(http=SharedHttpClient(transport=httpx.MockTransport(handler)), geocode_cache=geo)
+
+    out = tool(location="Kraków", date="2026-01-11")
+
+    assert (out["temp_c"], out["precip_prob"]) == (12, 40)
+    assert (out["temp_min_c"], out["temp_max_c"], out["precip_max"]) == (0, 23, 40)
+    assert out["best_window"] == "19:00–22:00"
@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+
+from organizer.tools.real import OpenMeteoGeocodingTool, OpenMeteoWeatherTool, TicketmasterEventsTool
+from organizer.tools.real.http import HttpPoolConfig, SharedHttpClient, configure_shared_http, close_shared_http, shared_http
+
+
+def open_meteo_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "geocoding-api.open-meteo.com":
+        return httpx.Response(200, json={"results": [{"name": "Kraków", "country": "Poland", "latitude": 50.06, "longitude": 19.94}]})
+    day = request.url.params.get("start_date") or "2026-01-10"
+    return httpx.Response(
+        200,
+        json={
+            "hourly": {
+                "time": [f"{day}T11:00", f"{day}T12:00"],
+                "temperature_2m": [3.0, 4.4],
+                "precipitation_probability": [10, 70],
+            }
+        },
+    )
+
+
+def test_real_tools_share_one_pooled_client():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.host)
+        return open_meteo_handler(request)
+
+    http = SharedHttpClient(transport=httpx.MockTransport(handler))
+    tool = OpenMeteoWeatherTool(geocoding=OpenMeteoGeocodingTool(http=http), http=http)
+
+    data = tool(location="Kraków", date="2026-01-10")
+    client = http.client
+    tool(location="Kraków", date="2026-01-10")
+
+    assert data["location"] == "Kraków, Poland"
+    assert data["temp_c"] == 4
+    assert data["precip_prob"] == 70
+    assert http.client is client  # ten sam klient (pula keep-alive) między wywołaniami
+    assert seen.count("geocoding-api.open-meteo.com") == 2
+    http.close()
+
+
+def test_default_tools_use_process_wide_client_and_shutdown_hook(monkeypatch):
+    monkeypatch.setenv("TICKETMASTER_API_KEY", "k")
+
+    def handler(request):
+        assert request.url.params["apikey"] == "k"
+        return httpx.Response(200, json={"_embedded": {"events": [{"name": "Gig", "dates": {"start": {"localTime": "20:00:00"}}}]}})
+
+    configured = configure_shared_http(transport=httpx.MockTransport(handler))
+    try:
+        data = TicketmasterEventsTool()(city="Warsaw", date="2026-01-10")
+        assert shared_http() is configured
+        assert data["events"][0]["title"] == "Gig"
+        assert data["events"][0]["start"] == "20:00"
+    finally:
+        close_shared_http()
+
+    assert shared_http() is not configured
+
+
+def test_per_host_limit_and_async_variant():
+    http = SharedHttpClient(
+        HttpPoolConfig(max_connections_per_host=2, http2=True),
+        async_transport=httpx.MockTransport(open_meteo_handler),
+    )
+    assert http._host_slot("https://api.open-meteo.com/v1/forecast") is http._host_slot("https://api.open-meteo.com/x")
+
+    async def run():
+        r = await http.aget("https://geocoding-api.open-meteo.com/v1/search", params={"name": "Kraków"})
+        await http.aclose()
+        return r
+
+    r = asyncio.run(run())
+    assert r.json()["results"][0]["name"] == "Kraków"
+
+
+def test_async_client_and_host_limits_are_per_loop():
+    http = SharedHttpClient(async_transport=httpx.MockTransport(open_meteo_handler))
+    seen = []
+
+    async def run():
+        r = await http.aget("https://geocoding-api.open-meteo.com/v1/search", params={"name": "Kraków"})
+        seen.append((http.async_client, http._async_host_slot("https://geocoding-api.open-meteo.com/x")))
+        return r.json()["results"][0]["name"]
+
+    # każde asyncio.run to nowa pętla — klient i semafory z poprzedniej nie mogą być użyte
+    assert [asyncio.run(run()) for _ in range(2)] == ["Kraków", "Kraków"]
+    (client_a, slot_a), (client_b, slot_b) = seen
+    assert client_a is not client_b and slot_a is not slot_b
+
+    http.close()  # pętle już zamknięte: bez wyjątku
@@ -0,0 +1,148 @@
+import json
+
+from organizer.tools.real import (
+    FakeCompletionBackend,
+    LlmClient,
+    LlmResponseCache,
+    OpenAICityNormalizerTool,
+)
+from organizer.tools.real.llm_client import Completion
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _key(cache: LlmResponseCache, content: str = "Krakowie", **kwargs) -> str:
+    base = dict(
+        model="gpt-4o-mini",
+        temperature=0,
+        messages=[{"role": "user", "content": content}],
+        response_format={"type": "json_object"},
+    )
+    base.update(kwargs)
+    return cache.key(**base)
+
+
+def test_normalizer_hits_network_once_per_prompt():
+    backend = FakeCompletionBackend(lambda msgs: json.dumps({"nominative": "Kraków"}, ensure_ascii=False))
+    cache = LlmResponseCache()
+    tool = OpenAICityNormalizerTool(llm=LlmClient(backend, cache=cache))
+
+    for _ in range(3):
+        assert tool(text="Krakowie")["nominative"] == "Kraków"
+
+    assert len(backend.requests) == 1
+    assert (cache.misses, cache.memory_hits) == (1, 2)
+    assert tool.llm.metrics.snapshot()["gpt-4o-mini"].cache_hits == 2
+
+    # zmiana wersji promptu -> nowy klucz, nowe zapytanie
+    OpenAICityNormalizerTool(llm=tool.llm, prompt_version="city-normalizer/2")(text="Krakowie")
+    assert len(backend.requests) == 2
+
+
+def test_non_deterministic_requests_are_not_cached():
+    backend = FakeCompletionBackend("hej")
+    llm = LlmClient(backend, cache=LlmResponseCache())
+
+    llm.complete(model="m", messages=[{"role": "user", "content": "x"}])
+    llm.complete(model="m", messages=[{"role": "user", "content": "x"}], temperature=0.7)
+    llm.complete(model="m", messages=[{"role": "user", "content": "x"}], temperature=0.7)
+
+    assert len(backend.requests) == 3
+
+
+def test_key_is_canonical_and_covers_all_inputs():
+    cache = LlmResponseCache()
+    k = _key(cache)
+    assert k == cache.key(
+        response_format={"type": "json_object"},
+        messages=[{"content": "Krakowie", "role": "user"}],  # inna kolejność kluczy
+        temperature=0,
+        model="gpt-4o-mini",
+    )
+    assert k != _key(cache, model="gpt-4o")
+    assert k != _key(cache, response_format=None)
+    assert k != _key(cache, content="Gdańsku")
+    assert k != LlmResponseCache(version="2").key(
+        model="gpt-4o-mini", temperature=0, messages=[{"role": "user", "content": "Krakowie"}],
+        response_format={"type": "json_object"},
+    )
+
+
+def test_disk_store_survives_restart_with_ttl_and_version(tmp_path):
+    path = tmp_path / "llm_cache.sqlite3"
+    clock = FakeClock()
+    cache = LlmResponseCache(path, clock=clock, ttl_seconds=60)
+    key = _key(cache)
+    cache.put(key, Completion(content='{"nominative": "Kraków"}', model="gpt-4o-mini", prompt_tokens=5))
+    cache.close()
+
+    reopened = LlmResponseCache(path, clock=clock, ttl_seconds=60)
+    hit = reopened.get(key)
+    assert hit is not None and hit.prompt_tokens == 5
+    assert reopened.disk_hits == 1
+
+    clock.now += 61
+    assert LlmResponseCache(path, clock=clock, ttl_seconds=60).get(key) is None  # wygasło
+
+    clock.now -= 61
+    bumped = LlmResponseCache(path, clock=clock, ttl_seconds=60, version="2")
+    assert bumped.get(key) is None  # stara wersja usunięta przy otwarciu
+    reopened.close()
+    bumped.close()
+
+
+def test_disk_store_is_size_capped(tmp_path):
+    clock = FakeClock()
+    cache = LlmResponseCache(tmp_path / "c.sqlite3", clock=clock, max_disk_entries=2, max_memory_entries=1)
+    keys = []
+    for i in range(3):
+        clock.now += 1
+        keys.append(_key(cache, content=f"miasto {i}"))
+        cache.put(keys[-1], Completion(content=str(i), model="m"))
+
+    assert cache.get(keys[0]) is None  # najstarszy wypadł
+    assert cache.get(keys[1]).content == "1"
+    assert cache.get(keys[2]).content == "2"
+    cache.close()
+
+
+def test_malformed_or_rejected_responses_are_not_cached():
+    answers = iter(['{"nominative": "Kra', '{"nominative": ""}', '{"nominative": "Kraków"}'])
+    backend = FakeCompletionBackend(lambda msgs: next(answers))
+    cache = LlmResponseCache()
+    llm = LlmClient(backend, cache=cache)
+    ask = dict(model="gpt-4o-mini", temperature=0, messages=[{"role": "user", "content": "x"}],
+               response_format={"type": "json_object"})
+
+    assert llm.complete(**ask).content == '{"nominative": "Kra'  # ucięty JSON: zwrócony, nie zapisany
+    rejected = llm.complete(**ask, validate=lambda c: json.loads(c.content)["nominative"] != "")
+    assert rejected.content == '{"nominative": ""}'
+    assert llm.complete(**ask).content == '{"nominative": "Kraków"}'
+    assert llm.complete(**ask).content == '{"nominative": "Kraków"}'  # dopiero teraz z cache
+
+    assert len(backend.requests) == 3
+    assert len(cache) == 1
+
+
+def test_use_cache_false_evicts_and_refetches(tmp_path):
+    answers = iter(['{"nominative": "Krakowie"}', '{"nominative": "Kraków"}'])
+    backend = FakeCompletionBackend(lambda msgs: next(answers))
+    cache = LlmResponseCache(tmp_path / "c.sqlite3")
+    llm = LlmClient(backend, cache=cache)
+    ask = dict(model="m", temperature=0, messages=[{"role": "user", "content": "x"}])
+
+    assert llm.complete(**ask).content == '{"nominative": "Krakowie"}'
+    assert llm.complete(**ask, use_cache=False).content == '{"nominative": "Kraków"}'
+    assert llm.complete(**ask).content == '{"nominative": "Kraków"}'
+
+    assert len(backend.requests) == 2
+    cache.close()
+    reopened = LlmResponseCache(tmp_path / "c.sqlite3")
+    assert reopened.get(cache.key(**ask, response_format=None)).content == '{"nominative": "Kraków"}'
+    reopened.close()
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from organizer.agents.llm import OpenAIAgent
+from organizer.core.deadline import DeadlineExceeded, deadline_scope
+from organizer.core.types import Message
+from organizer.tools.real import (
+    FakeCompletionBackend,
+    LlmClient,
+    LlmClientConfig,
+    OpenAICityNormalizerTool,
+    configure_shared_llm,
+    close_shared_llm,
+    shared_llm,
+)
+
+
+class SlowBackend(FakeCompletionBackend):
+    """
+    Liczy maksymalną liczbę równoległych zapytań.
+    """
+
+    def __init__(self):
+        super().__init__("ok", latency_seconds=0.05)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def complete(self, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return super().complete(**kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_all_call_sites_use_the_shared_client():
+    backend = FakeCompletionBackend(lambda msgs: json.dumps({"nominative": "Kraków"}, ensure_ascii=False))
+    configure_shared_llm(backend)
+    try:
+        assert OpenAICityNormalizerTool()(text="Krakowie")["nominative"] == "Kraków"
+        assert OpenAIAgent().handle(Message(sender="user", content="hej")).content == '{"nominative": "Kraków"}'
+        assert len(backend.requests) == 2
+        assert backend.requests[0]["response_format"] == {"type": "json_object"}
+        assert shared_llm().metrics.snapshot()["gpt-4o-mini"].calls == 2
+    finally:
+        close_shared_llm()
+
+
+def test_max_in_flight_limits_concurrency():
+    backend = SlowBackend()
+    llm = LlmClient(backend, LlmClientConfig(max_in_flight=2))
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda _: llm.complete(model="m", messages=[{"role": "user", "content": "x"}]), range(6)))
+
+    assert backend.max_in_flight == 2
+
+
+def test_waiting_for_slot_respects_deadline():
+    backend = FakeCompletionBackend("ok", latency_seconds=0.3)
+    llm = LlmClient(backend, LlmClientConfig(max_in_flight=1))
+    holder = threading.Thread(target=llm.complete, kwargs={"model": "m", "messages": []})
+    holder.start()
+    time.sleep(0.05)
+
+    with deadline_scope(0.05):
+        with pytest.raises(DeadlineExceeded):
+            llm.complete(model="m", messages=[])
+    holder.join()
+
+
+def test_metrics_per_model_count_tokens_and_errors():
+    class Broken(FakeCompletionBackend):
+        def complete(self, **kwargs):
+            raise ConnectionError("down")
+
+    llm = LlmClient(FakeCompletionBackend("jeden dwa trzy"))
+    llm.complete(model="a", messages=[{"role": "user", "content": "ala ma kota"}])
+    llm.complete(model="b", messages=[{"role": "user", "content": "x"}])
+
+    stats = llm.metrics.snapshot()
+    assert (stats["a"].calls, stats["a"].prompt_tokens, stats["a"].completion_tokens) == (1, 3, 3)
+    assert stats["b"].calls == 1
+
+    broken = LlmClient(Broken())
+    with pytest.raises(ConnectionError):
+        broken.complete(model="a", messages=[])
+    assert broken.metrics.snapshot()["a"].errors == 1
+
+
+def test_async_complete_limits_concurrency_per_loop():
+    backend = FakeCompletionBackend("ok", latency_seconds=0.05)
+    llm = LlmClient(backend, LlmClientConfig(max_in_flight=2))
+
+    async def run():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(llm.acomplete(model="m", messages=[]) for _ in range(4)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(run())
+    assert [r.content for r in results] == ["ok"] * 4
+    assert elapsed >= 0.1  # 4 zapytania, po 2 naraz -> dwie tury
+
+
+def test_openai_backend_keeps_one_async_sdk_client_per_loop():
+    from organizer.tools.real.llm_client import OpenAIBackend
+
+    backend = OpenAIBackend(api_key="sk-test")
+
+    async def clients():
+        return backend._async_sdk_client(), backend._async_sdk_client()
+
+    first, again = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+
+    assert first is again
+    assert first is not second  # nowa pętla -> nowy klient (pula poprzedniej już nie działa)
@@ -0,0 +1,170 @@
+import time
+
+import pytest
+
+from organizer.tools.gazetteer import Gazetteer, ascii_fold
+from organizer.tools.offline_geocoder import (
+    GeocoderIndex,
+    OfflineGeocoderTool,
+    TrigramIndex,
+    levenshtein,
+    shared_geocoder_index,
+)
+from organizer.tools.real.open_meteo import OpenMeteoWeatherTool
+
+
+@pytest.mark.parametrize(
+    "text, expected, match",
+    [
+        ("Warszawie", "Warszawa", "exact"),
+        ("krakowie", "Kraków", "exact"),
+        ("Lodz", "Łódź", "exact"),
+        ("Wroclawiu", "Wrocław", "exact"),
+        ("Gdan", "Gdańsk", "prefix"),
+        ("Krakw", "Kraków", "fuzzy"),
+        ("Warszwa", "Warszawa", "fuzzy"),
+        ("Szczecinn", "Szczecin", "fuzzy"),
+    ],
+)
+def test_search_resolves_inflected_ascii_prefix_and_typo(text, expected, match):
+    found = shared_geocoder_index().search(text)
+
+    assert [(m.place.name, m.match) for m in found] == [(expected, match)]
+
+
+def test_unknown_and_short_names_do_not_match_fuzzily():
+    index = shared_geocoder_index()
+
+    assert index.search("xyzzy") == []
+    assert index.search("Ełkk")[0].place.name == "Ełk"  # 4 znaki: 1 literówka dopuszczalna
+    assert index.search("Ełx") == []  # 3 znaki: tylko dokładnie
+
+
+def test_trigram_index_matches_bounded_levenshtein():
+    index = TrigramIndex()
+    for i, key in enumerate(["krakow", "krosno", "tarnow", "torun"]):
+        index.insert(key, i)
+
+    assert [key for _, key, _ in index.search("krakw", 1)] == ["krakow"]
+    assert [key for _, key, _ in index.search("tarnuw", 2)] == ["tarnow"]
+    assert levenshtein("krakow", "krosno", limit=1) == 2  # przerwane po przekroczeniu limitu
+
+
+def test_tool_returns_open_meteo_shaped_payload():
+    tool = OfflineGeocoderTool()
+
+    payload = tool(location="Warszawie", count=1, language="en")
+
+    assert tool.name == "fallback_geocoder"  # nazwa, którą emituje RecoveryAgent
+    top = payload["results"][0]
+    assert (top["name"], top["country"], top["source"]) == ("Warszawa", "Poland", "gazetteer")
+    assert top["latitude"] == pytest.approx(52.23, abs=0.05)
+
+
+def test_tool_delegates_misses_to_fallback():
+    calls = []
+
+    def remote(**kwargs):
+        calls.append(kwargs)
+        return {"results": [{"name": "Berlin", "latitude": 52.52, "longitude": 13.4, "country": "Germany"}]}
+
+    tool = OfflineGeocoderTool(fallback=remote)
+
+    assert tool(location="Kraków")["results"][0]["name"] == "Kraków"
+    assert tool(location="Berlin")["results"][0]["country"] == "Germany"
+    assert calls == [{"location": "Berlin", "count": 1, "language": "en"}]
+
+
+@pytest.mark.parametrize("text", ["Wadowice", "Chełmno", "Lublana"])
+def test_fallback_wins_over_local_fuzzy_match(text):
+    # lokalnie: Katowice / Chełm / Lublin (fuzzy) — z fallbackiem decyduje geokoder zdalny
+    def remote(**kwargs):
+        return {"results": [{"name": kwargs["location"], "latitude": 0.0, "longitude": 0.0, "country": "X"}]}
+
+    assert OfflineGeocoderTool(fallback=remote)(location=text)["results"][0]["name"] == text
+
+
+def test_local_prefix_and_typo_used_when_fallback_misses():
+    calls = []
+
+    def remote(**kwargs):
+        calls.append(kwargs["location"])
+        return {}  # Open-Meteo bez "results"
+
+    tool = OfflineGeocoderTool(fallback=remote)
+
+    assert tool(location="Warszawie")["results"][0]["match"] == "exact"
+    assert tool(location="Krakw")["results"][0]["name"] == "Kraków"
+    assert tool(location="Gdan")["results"][0]["match"] == "prefix"
+    assert calls == ["Krakw", "Gdan"]
+
+
+def test_local_matches_used_when_fallback_fails():
+    def remote(**kwargs):
+        raise ConnectionError("open-meteo down")
+
+    tool = OfflineGeocoderTool(fallback=remote)
+
+    assert tool(location="Krakw")["results"][0]["name"] == "Kraków"
+    assert tool(location="Gdan")["results"][0]["match"] == "prefix"
+    with pytest.raises(ConnectionError):
+        tool(location="Berlin")  # lokalnie też nic — błąd fallbacku idzie dalej
+
+
+def test_weather_tool_uses_offline_geocoder_as_primary():
+    tool = OpenMeteoWeatherTool(geocoding=OfflineGeocoderTool(name="offline_geocoder"))
+
+    assert tool._geocode("Poznaniu")[2] == "Poznań, Poland"
+
+
+def test_lookup_is_well_under_a_millisecond():
+    index = shared_geocoder_index()
+    queries = ["Warszawie", "Krakw", "Gdan", "Lodz", "xyzzy"]
+    for q in queries:
+        index.search(q)
+
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q in queries:
+            index.search(q)
+    per_lookup = (time.perf_counter() - start) / (rounds * len(queries))
+
+    assert per_lookup < 0.001
+
+
+def test_load_geonames_dump_via_mmap(tmp_path):
+    def row(gid, name, alternates, lat, lon, fclass, country, population):
+        cols = [gid, name, ascii_fold(name), alternates, lat, lon, fclass, "PPL", country,
+                "", "", "", "", "", population, "", "", "Europe/Warsaw", "2024-01-01"]
+        return "\t".join(cols)
+
+    dump = tmp_path / "PL.txt"
+    dump.write_text(
+        "\n".join([
+            row("1", "Zakopane", "Zakopanem,Sakopane", "49.299", "19.949", "P", "PL", "27000"),
+            row("2", "Tatry", "", "49.2", "20.0", "T", "PL", "0"),                  # góry, nie miejscowość
+            row("3", "Berlin", "", "52.52", "13.40", "P", "DE", "3600000"),          # inny kraj
+            row("4", "Mała Wieś", "", "50.0", "20.0", "P", "PL", "12"),              # poniżej progu
+        ]) + "\n",
+        encoding="utf-8",
+    )
+
+    gazetteer = Gazetteer.load_geonames(dump, min_population=100)
+    index = GeocoderIndex(gazetteer)
+
+    assert [p.name for p in gazetteer] == ["Zakopane"]
+    assert index.search("Sakopane")[0].place.name == "Zakopane"
+    assert index.search("Zakopnae")[0].match == "fuzzy"
+
+
+def test_country_comes_from_geonames_column(tmp_path):
+    dump = tmp_path / "allCountries.txt"
+    cols = ["3", "Berlin", "Berlin", "", "52.52", "13.40", "P", "PPL", "DE",
+            "", "", "", "", "", "3600000", "", "", "Europe/Berlin", "2024-01-01"]
+    dump.write_text("\t".join(cols) + "\n", encoding="utf-8")
+
+    tool = OfflineGeocoderTool(index=GeocoderIndex(Gazetteer.load_geonames(dump, country_code=None)))
+
+    assert tool(location="Berlin")["results"][0]["country"] == "DE"
+    assert OfflineGeocoderTool()(location="Kraków")["results"][0]["country"] == "Poland"
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+from organizer.core import AgentRegistry, AsyncAgent, Orchestrator, RoutingRule, call_tool_with_trace_async
+from organizer.core.agent import Agent
+from organizer.core.types import Message
+from organizer.agents.coordinator import CoordinatorAgent
+
+
+class SlowSyncAgent(Agent):
+    def __init__(self, name: str):
+        super().__init__(name=name)
+
+    def handle(self, message: Message) -> Message:
+        time.sleep(0.1)  # blokujące I/O
+        return Message(sender=self.name, content=f"sync: {message.content}")
+
+
+class SlowAsyncAgent(AsyncAgent):
+    def __init__(self, name: str):
+        super().__init__(name=name)
+
+    async def handle_async(self, message: Message) -> Message:
+        await asyncio.sleep(0.1)
+        return Message(sender=self.name, content=f"async: {message.content}")
+
+
+def make_orchestrator(agent: Agent) -> Orchestrator:
+    reg = AgentRegistry()
+    reg.register(agent)
+    return Orchestrator(reg, [RoutingRule("echo", agent.name)])
+
+
+def test_handle_async_adapts_sync_agent_and_records_trace():
+    orch = make_orchestrator(SlowSyncAgent("echo"))
+
+    reply = asyncio.run(orch.handle_user_text_async("echo test"))
+
+    assert reply.sender == "echo"
+    assert reply.content == "sync: echo test"
+    assert [t.action for t in orch.team_conversation] == ["route", "respond"]
+    assert len(orch.user_history) == 2
+
+
+def test_handle_async_uses_native_async_agent_and_registry_coordinator():
+    reg = AgentRegistry()
+    reg.register(CoordinatorAgent(name="coordinator"))
+    reg.register(SlowAsyncAgent("weather"))
+    orch = Orchestrator(reg, [], coordinator_name="coordinator")
+
+    reply = asyncio.run(orch.handle_user_text_async("jaka pogoda w Gdańsku?"))
+
+    assert reply.content.startswith("async:")
+    assert orch.team_conversation[0].action == "decision"
+
+
+def test_many_conversations_share_one_event_loop():
+    orchs = [make_orchestrator(SlowAsyncAgent("echo")) for _ in range(20)]
+
+    async def run_all():
+        return await asyncio.gather(*(o.handle_user_text_async("echo hi") for o in orchs))
+
+    t0 = time.perf_counter()
+    replies = asyncio.run(run_all())
+    elapsed = time.perf_counter() - t0
+
+    assert all(r.content == "async: echo hi" for r in replies)
+    # 20 x 0.1s sekwencyjnie = 2s; współbieżnie ~0.1s
+    assert elapsed < 1.0
+
+
+def test_call_tool_with_trace_async_adapts_sync_tool_and_wraps_errors():
+    def ok_tool(**kwargs):
+        return {"echo": kwargs}
+
+    async def bad_tool(**kwargs):
+        raise ValueError("boom")
+
+    result, trace = asyncio.run(
+        call_tool_with_trace_async(tool_name="ok", tool_callable=ok_tool, params={"x": 1}, correlation_id="cid-a")
+    )
+    assert result == {"echo": {"x": 1}}
+    assert trace.outcome == "success"
+    assert trace.correlation_id == "cid-a"
+
+    result, trace = asyncio.run(call_tool_with_trace_async(tool_name="bad", tool_callable=bad_tool, params={}))
+    assert result is None
+    assert trace.outcome == "error"
+    assert trace.error.message == "boom"
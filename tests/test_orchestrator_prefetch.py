@@ -0,0 +1,73 @@
+import time
+
+from organizer.agents import CoordinatorAgent, PlannerAgent
+from organizer.core import AgentRegistry, Orchestrator
+from organizer.core.prefetch import PlannedToolCall, ToolPrefetch
+
+
+class SlowTool:
+    def __init__(self, name, payload, delay=0.2):
+        self.name = name
+        self._payload = payload
+        self._delay = delay
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append((time.perf_counter(), kwargs))
+        time.sleep(self._delay)
+        return dict(self._payload)
+
+
+def make_tools():
+    weather = SlowTool("slow_weather", {"summary": "pogodnie", "temp_c": 20, "precip_prob": 10})
+    events = SlowTool(
+        "slow_events",
+        {"events": [{"title": "Koncert", "start": "18:00", "price_pln": 50, "indoor": True}]},
+    )
+    return weather, events
+
+
+def test_orchestrator_prefetches_needed_tools_concurrently():
+    weather, events = make_tools()
+    reg = AgentRegistry()
+    reg.register(CoordinatorAgent(name="coordinator"))
+    reg.register(PlannerAgent(weather_tool=weather, events_tool=events))
+    orch = Orchestrator(reg, [], coordinator_name="coordinator")
+
+    t0 = time.perf_counter()
+    reply = orch.handle_user_text("Zaplanuj mi dzień w Krakowie")
+    elapsed = time.perf_counter() - t0
+
+    assert "Koncert" in reply.content
+    assert len(weather.calls) == 1 and len(events.calls) == 1  # prefetch nie dubluje wywołań
+    assert abs(weather.calls[0][0] - events.calls[0][0]) < 0.1  # wystartowały razem
+    assert elapsed < 0.35  # max(0.2, 0.2), a nie suma
+
+    prefetched = [e for e in orch.team_events if e.type == "tool_call" and e.data.get("prefetch")]
+    assert {e.data["slot"] for e in prefetched} == {"weather_tool", "events_tool"}
+    assert prefetched[0].correlation_id == reply.correlation_id
+
+
+def test_prefetch_can_be_disabled():
+    weather, events = make_tools()
+    reg = AgentRegistry()
+    reg.register(CoordinatorAgent(name="coordinator"))
+    reg.register(PlannerAgent(weather_tool=weather, events_tool=events))
+    orch = Orchestrator(reg, [], coordinator_name="coordinator", prefetch_tools=False)
+
+    orch.handle_user_text("Zaplanuj mi dzień w Krakowie")
+
+    assert not [e for e in orch.team_events if e.data.get("prefetch")]
+    assert len(weather.calls) == 1
+
+
+def test_prefetch_result_falls_back_when_params_differ():
+    weather, _ = make_tools()
+    planned = PlannedToolCall(weather, {"location": "Kraków", "date": "tomorrow"})
+    prefetch = ToolPrefetch.start({"weather_tool": planned})
+
+    other = PlannedToolCall(weather, {"location": "Gdańsk", "date": "tomorrow"})
+    prefetch.result("weather_tool", other)
+    prefetch.result("weather_tool", planned)
+
+    assert sorted(c[1]["location"] for c in weather.calls) == ["Gdańsk", "Kraków"]
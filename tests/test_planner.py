@@ -1,3 +1,5 @@
+import time
+
 from organizer.agents import PlannerAgent
 from organizer.core.types import Message
 from organizer.core.preferences import Preferences
@@ -42,7 +44,7 @@ def test_rainy_weather_selects_only_indoor_events():
     )
 
     planner = PlannerAgent(weather_tool=weather, events_tool=events, preferences=Preferences(max_items=4))
-    reply = planner.handle(Message(sender="user", content="Ułóż mi plan w Krakowie"))
+    reply = planner.handle(Message(sender="user", content="Ułóż mi plan w Krakowie")).message
 
     assert reply.sender == "planner"
     assert "Outdoor Walk" not in reply.content
@@ -61,7 +63,7 @@ def test_good_weather_allows_outdoor_events():
     )
 
     planner = PlannerAgent(weather_tool=weather, events_tool=events, preferences=Preferences(max_items=4))
-    reply = planner.handle(Message(sender="user", content="Plan dnia w Gdańsku proszę"))
+    reply = planner.handle(Message(sender="user", content="Plan dnia w Gdańsku proszę")).message
 
     assert "Outdoor Market" in reply.content
     assert "Indoor Cinema" in reply.content
@@ -86,8 +88,41 @@ def test_planner_does_not_pick_overlapping_events():
         events_tool=events,
         preferences=Preferences(max_items=4, event_duration_hours=2),
     )
-    reply = planner.handle(Message(sender="user", content="Ułóż plan w Warszawie"))
+    reply = planner.handle(Message(sender="user", content="Ułóż plan w Warszawie")).message
 
     assert "Event A" in reply.content
     assert "Event C" in reply.content
     assert "Event B" not in reply.content
+
+
+class SlowTool:
+    def __init__(self, inner, delay: float):
+        self.name = inner.name
+        self._inner = inner
+        self._delay = delay
+
+    def __call__(self, **kwargs):
+        time.sleep(self._delay)
+        return self._inner(**kwargs)
+
+
+def test_planner_fetches_weather_and_events_concurrently_and_reports_branch_timings():
+    weather = SlowTool(FixedWeatherTool(precip_prob=0), delay=0.2)
+    events = SlowTool(
+        FixedEventsTool([{"title": "Event A", "city": "X", "date": "tomorrow", "start": "16:00", "indoor": True}]),
+        delay=0.2,
+    )
+    planner = PlannerAgent(weather_tool=weather, events_tool=events)
+
+    t0 = time.perf_counter()
+    result = planner.handle(Message(sender="user", content="Ułóż plan w Poznaniu"))
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.35
+    assert "Event A" in result.message.content
+
+    timings = {e.data["slot"]: e for e in result.events}
+    assert set(timings) == {"weather_tool", "events_tool"}
+    assert timings["weather_tool"].target == "fixed_weather"
+    assert timings["events_tool"].data["elapsed_ms"] >= 150
+    assert timings["events_tool"].data["prefetched"] is False
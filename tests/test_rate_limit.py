@@ -0,0 +1,225 @@
+import asyncio
+
+import pytest
+
+from organizer.core import (
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    RateLimitConfig,
+    RateLimiter,
+    RateLimiterRegistry,
+    RateLimitExceeded,
+    RetryExceededError,
+    RetryPolicy,
+    call_tool_with_retry,
+    call_tool_with_trace,
+    call_tool_with_trace_async,
+)
+
+
+class FakeTime:
+    """
+    Zegar + sleep: sleep przesuwa zegar, więc kolejka token bucket działa bez czekania.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class Throttled(Exception):
+    def __init__(self, retry_after: str | None = None):
+        super().__init__("429 Too Many Requests")
+        self.response = _Response(429, {"Retry-After": retry_after} if retry_after else {})
+
+
+class _Response:
+    def __init__(self, status_code: int, headers: dict):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = "slow down"
+
+
+def _limiter(t: FakeTime, **kwargs) -> RateLimiter:
+    base = dict(rate_per_second=2.0, burst=2.0, max_wait_seconds=5.0)
+    base.update(kwargs)
+    return RateLimiter("p", RateLimitConfig(**base), clock=t.clock, sleep=t.sleep)
+
+
+def test_burst_then_queue():
+    t = FakeTime()
+    limiter = _limiter(t)
+
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == pytest.approx(0.5)  # 2 req/s -> kolejny token po 0.5 s
+    assert t.slept == [pytest.approx(0.5)]
+
+
+def test_fail_fast_when_wait_exceeds_limit():
+    t = FakeTime()
+    limiter = _limiter(t, burst=1.0, max_wait_seconds=0.0)
+
+    limiter.acquire()
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.acquire()
+    assert exc_info.value.wait_seconds == pytest.approx(0.5)
+    assert limiter.rejected == 1
+    assert t.slept == []
+
+
+def test_throttle_halves_rate_and_success_recovers():
+    t = FakeTime()
+    limiter = _limiter(t, rate_per_second=4.0, increase_per_success=0.25)
+
+    limiter.on_throttled()
+    assert limiter.rate == 2.0
+    limiter.on_success()
+    assert limiter.rate == 3.0
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 4.0  # nie przekracza skonfigurowanego tempa
+
+
+def test_retry_after_blocks_acquire():
+    t = FakeTime()
+    limiter = _limiter(t)
+
+    limiter.on_throttled(retry_after_seconds=3.0)
+    assert limiter.acquire() == pytest.approx(3.0)
+
+
+def test_registry_limits_only_configured_providers():
+    registry = RateLimiterRegistry({"ticketmaster_events": RateLimitConfig()})
+    assert registry.get("ticketmaster_events") is registry.get("ticketmaster_events")
+    assert registry.get("open_meteo_weather") is None
+
+
+def test_trace_records_queue_wait_and_rate_limited_error():
+    t = FakeTime()
+    registry = RateLimiterRegistry(
+        {"ticketmaster_events": RateLimitConfig(rate_per_second=1.0, burst=1.0, max_wait_seconds=0.5)},
+        clock=t.clock,
+        sleep=t.sleep,
+    )
+    calls = {"n": 0}
+
+    def tool(**kwargs):
+        calls["n"] += 1
+        return "ok"
+
+    _, first = call_tool_with_trace(tool_name="ticketmaster_events", tool_callable=tool, params={}, rate_limiters=registry)
+    assert first.outcome == "success"
+    assert first.meta["queue_wait_ms"] == 0.0
+
+    result, second = call_tool_with_trace(
+        tool_name="ticketmaster_events", tool_callable=tool, params={}, rate_limiters=registry
+    )
+    assert result is None
+    assert calls["n"] == 1  # narzędzie nie zostało wywołane
+    assert second.error.type == "RATE_LIMITED"
+    assert second.error.retry_after_seconds == pytest.approx(1.0)
+
+    # provider bez limitu: brak queue_wait_ms w meta
+    _, other = call_tool_with_trace(tool_name="open_meteo_weather", tool_callable=tool, params={}, rate_limiters=registry)
+    assert "queue_wait_ms" not in other.meta
+
+
+def test_breaker_rejections_do_not_take_tokens():
+    t = FakeTime()
+    registry = RateLimiterRegistry(
+        {"p": RateLimitConfig(rate_per_second=0.01, burst=2.0, max_wait_seconds=0.0)}, clock=t.clock, sleep=t.sleep
+    )
+    breakers = CircuitBreakerRegistry(CircuitBreakerConfig(min_calls=1, window_size=1, open_seconds=10.0), clock=t.clock)
+
+    def down(**kwargs):
+        raise ConnectionError("provider down")
+
+    call_tool_with_trace(tool_name="p", tool_callable=down, params={}, breakers=breakers, rate_limiters=registry)
+    for _ in range(3):
+        _, trace = call_tool_with_trace(tool_name="p", tool_callable=down, params={}, breakers=breakers, rate_limiters=registry)
+        assert trace.error.type == "CIRCUIT_OPEN"
+
+    t.now = 10.0  # half-open: próba dostaje token, którego nie zjadły odrzucone wywołania
+    _, probe = call_tool_with_trace(
+        tool_name="p", tool_callable=lambda **k: "ok", params={}, breakers=breakers, rate_limiters=registry
+    )
+    assert probe.outcome == "success"
+    assert probe.meta["queue_wait_ms"] == 0.0
+
+
+def test_429_with_retry_after_slows_limiter_between_retries():
+    t = FakeTime()
+    registry = RateLimiterRegistry({"p": RateLimitConfig(rate_per_second=10.0, burst=10.0)}, clock=t.clock, sleep=t.sleep)
+    attempts = {"n": 0}
+
+    def tool(**kwargs):
+        attempts["n"] += 1
+        if attempts["n"] == 1:
+            raise Throttled(retry_after="2")
+        return "ok"
+
+    result, traces = call_tool_with_retry(
+        tool_name="p",
+        tool_callable=tool,
+        params={},
+        actor="test",
+        correlation_id="c",
+        policy=RetryPolicy(max_attempts=2, use_retry_budget=False, respect_retry_after=False, jitter="none"),
+        sleep_fn=lambda s: None,
+        rate_limiters=registry,
+    )
+    assert result == "ok"
+    assert traces[0].error.code == "429"
+    # druga próba czekała w kolejce limitera na koniec Retry-After
+    assert traces[1].meta["queue_wait_ms"] == pytest.approx(2000.0)
+    limiter = registry.get("p")
+    assert limiter.throttled == 1
+    assert limiter.rate < 10.0
+
+
+def test_rate_limited_is_not_retried():
+    t = FakeTime()
+    registry = RateLimiterRegistry(
+        {"p": RateLimitConfig(rate_per_second=1.0, burst=1.0, max_wait_seconds=0.0)}, clock=t.clock, sleep=t.sleep
+    )
+    registry.get("p").acquire()
+
+    with pytest.raises(RetryExceededError) as exc_info:
+        call_tool_with_retry(
+            tool_name="p",
+            tool_callable=lambda **k: "ok",
+            params={},
+            actor="test",
+            correlation_id="c",
+            policy=RetryPolicy(max_attempts=3, use_retry_budget=False),
+            rate_limiters=registry,
+        )
+    assert exc_info.value.last_error.type == "RATE_LIMITED"
+
+
+def test_async_acquire_waits_in_queue():
+    t = FakeTime()  # zegar stoi: kolejka liczona deterministycznie, asyncio.sleep czeka naprawdę (ms)
+    registry = RateLimiterRegistry({"p": RateLimitConfig(rate_per_second=50.0, burst=1.0)}, clock=t.clock)
+
+    async def tool(**kwargs):
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(
+            *(call_tool_with_trace_async(tool_name="p", tool_callable=tool, params={}, rate_limiters=registry) for _ in range(3))
+        )
+
+    results = asyncio.run(run())
+    waits = sorted(trace.meta["queue_wait_ms"] for _, trace in results)
+    assert waits[0] == 0.0
+    assert waits[1] == pytest.approx(20.0)
+    assert waits[2] == pytest.approx(40.0)
+    assert all(result == "ok" for result, _ in results)
@@ -51,3 +51,22 @@ def test_http400_invalid_date_format_suggests_iso_date():
 
     assert plan.action == "retry_with_params"
     assert plan.params_patch["date"] == "2026-01-03"
+
+
+def test_retry_budget_exhausted_does_not_retry():
+    agent = RecoveryAgent()
+
+    err = ToolError(
+        code="503",
+        type="RETRY_BUDGET_EXHAUSTED",
+        message="temporary failure (retry budget exhausted for provider 'open_meteo_weather')",
+        provider="open_meteo_weather",
+        request_params={"location": "Kraków", "date": "tomorrow"},
+        raw_response=None,
+        stack_trace_id="abc999",
+    )
+    task = Task(name="weather_lookup", target="open_meteo_weather", inputs={"location": "Kraków", "date": "tomorrow"})
+
+    plan = agent.propose_fix(error=err, last_task=task, last_inputs=task.inputs)
+
+    assert plan.action == "fail"
@@ -1,6 +1,10 @@
+import time
+
 import pytest
 
-from organizer.core import RetryPolicy, call_tool_with_retry, RetryExceededError
+from organizer.core import RetryBudget, RetryPolicy, call_tool_with_retry, RetryExceededError
+from organizer.core.deadline import deadline_scope
+from organizer.core.retry import shared_retry_budget
 
 
 def test_tool_succeeds_after_two_failures():
@@ -51,3 +55,151 @@ def test_retry_exceeded_raises_controlled_error():
     assert "Retry exceeded" in str(err)
     assert err.last_error is not None
     assert "always fails" in err.last_error.message
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code, headers)
+
+
+def test_exponential_backoff_with_full_and_decorrelated_jitter():
+    import random
+
+    assert [RetryPolicy(backoff_seconds=1.0).backoff(n) for n in (1, 2, 3)] == [1.0, 1.0, 1.0]  # domyślnie stały
+
+    none = RetryPolicy(backoff_seconds=1.0, backoff_multiplier=2.0, max_backoff_seconds=5.0)
+    assert [none.backoff(n) for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+
+    full = RetryPolicy(backoff_seconds=1.0, backoff_multiplier=2.0, jitter="full")
+    rng = random.Random(7)
+    delays = [full.backoff(3, rng=rng) for _ in range(50)]
+    assert all(0.0 <= d <= 4.0 for d in delays) and max(delays) > 1.0
+    assert len(set(delays)) > 1
+
+    deco = RetryPolicy(backoff_seconds=1.0, jitter="decorrelated", max_backoff_seconds=10.0)
+    d = deco.backoff(1, previous=None, rng=rng)
+    assert 1.0 <= d <= 3.0
+    assert 1.0 <= deco.backoff(2, previous=d, rng=rng) <= min(10.0, d * 3)
+
+
+def test_retry_after_from_429_is_honored():
+    calls = {"n": 0}
+    slept = []
+
+    def limited_tool(**kwargs):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise FakeHTTPError(429, {"Retry-After": "2"})
+        return {"ok": True}
+
+    result, traces = call_tool_with_retry(
+        tool_name="limited",
+        tool_callable=limited_tool,
+        params={},
+        actor="tool_runner",
+        correlation_id="cid-retry-3",
+        policy=RetryPolicy(backoff_seconds=0.1, jitter="none"),
+        sleep_fn=slept.append,
+        retry_budget=RetryBudget(),
+    )
+
+    assert result == {"ok": True}
+    assert traces[0].error.code == "429"
+    assert traces[0].error.type == "HTTP_ERROR"
+    assert traces[0].error.retry_after_seconds == 2.0
+    assert slept == [2.0]
+
+
+def test_retry_after_longer_than_cap_stops_retrying():
+    def tool(**kwargs):
+        raise FakeHTTPError(503, {"Retry-After": "120"})
+
+    with pytest.raises(RetryExceededError) as excinfo:
+        call_tool_with_retry(
+            tool_name="down", tool_callable=tool, params={}, actor="t", correlation_id="c",
+            policy=RetryPolicy(max_backoff_seconds=30.0), sleep_fn=lambda _: None, retry_budget=RetryBudget(),
+        )
+    assert excinfo.value.last_error.code == "503"
+
+
+def test_retry_budget_stops_retry_storm_and_reports_exhaustion():
+    budget = RetryBudget(ratio=0.1, max_tokens=2)
+    calls = {"n": 0}
+
+    def down(**kwargs):
+        calls["n"] += 1
+        raise ValueError("temporary failure")
+
+    errors = []
+    for _ in range(5):
+        with pytest.raises(RetryExceededError) as excinfo:
+            call_tool_with_retry(
+                tool_name="down", tool_callable=down, params={}, actor="t", correlation_id="c",
+                policy=RetryPolicy(max_attempts=3), sleep_fn=lambda _: None, retry_budget=budget,
+            )
+        errors.append(excinfo.value.last_error)
+
+    # 5 wywołań, ale tylko ~2 ponowienia z rezerwy (+ ułamki z ratio)
+    assert calls["n"] == 7
+    assert errors[-1].type == "RETRY_BUDGET_EXHAUSTED"
+    assert "retry budget exhausted" in errors[-1].message
+    assert budget.exhausted == 4
+    assert budget.tokens("other_provider") == 2
+
+
+def test_expired_deadline_is_not_retried_and_spends_no_budget():
+    budget = RetryBudget(max_tokens=2)
+
+    def slow(**kwargs):
+        time.sleep(0.2)
+        return "late"
+
+    with deadline_scope(0.05), pytest.raises(RetryExceededError) as excinfo:
+        call_tool_with_retry(
+            tool_name="slow", tool_callable=slow, params={}, actor="t", correlation_id="c",
+            policy=RetryPolicy(max_attempts=3), sleep_fn=lambda _: None, retry_budget=budget,
+        )
+    assert excinfo.value.last_error.type == "TIMEOUT"
+    assert budget.tokens("slow") == 2  # bez ponowienia: token nie zabrany (tylko + ratio za wywołanie)
+
+
+def test_backoff_longer_than_remaining_budget_stops_retrying():
+    slept = []
+    calls = {"n": 0}
+
+    def down(**kwargs):
+        calls["n"] += 1
+        raise ValueError("temporary failure")
+
+    with deadline_scope(1.0), pytest.raises(RetryExceededError):
+        call_tool_with_retry(
+            tool_name="down", tool_callable=down, params={}, actor="t", correlation_id="c",
+            policy=RetryPolicy(max_attempts=3, backoff_seconds=5.0, jitter="none"), sleep_fn=slept.append,
+        )
+    assert calls["n"] == 1
+    assert slept == []  # nie śpimy w budżet, po którym nie zostanie czasu na próbę
+
+
+def test_shared_retry_budget_is_used_by_default():
+    def down(**kwargs):
+        raise ValueError("temporary failure")
+
+    before = shared_retry_budget().tokens("default_budget_probe")
+    for policy, expected in (
+        (RetryPolicy(max_attempts=3), min(10.0, before + 0.1) - 2),
+        (RetryPolicy(max_attempts=3, use_retry_budget=False), min(10.0, before + 0.1) - 2),
+    ):
+        with pytest.raises(RetryExceededError):
+            call_tool_with_retry(
+                tool_name="default_budget_probe", tool_callable=down, params={}, actor="t", correlation_id="c",
+                policy=policy, sleep_fn=lambda _: None,
+            )
+        assert shared_retry_budget().tokens("default_budget_probe") == pytest.approx(expected)
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+
+from organizer.cli import build_session_manager
+from organizer.core import AgentRegistry, RoutingRule, SessionManager
+from organizer.core.agent import Agent
+from organizer.core.types import Message
+
+
+class EchoAgent(Agent):
+    def __init__(self):
+        super().__init__(name="echo")
+
+    def handle(self, message: Message) -> Message:
+        return Message(sender=self.name, content=f"echo: {message.content}")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_manager(**kwargs) -> SessionManager:
+    reg = AgentRegistry()
+    reg.register(EchoAgent())
+    return SessionManager(reg, [RoutingRule("echo", "echo")], **kwargs)
+
+
+def test_sessions_have_isolated_history_and_share_registry():
+    mgr = make_manager()
+
+    mgr.handle_user_text("alice", "echo 1")
+    mgr.handle_user_text("alice", "echo 2")
+    mgr.handle_user_text("bob", "echo 3")
+
+    assert len(mgr.get("alice").user_history) == 4
+    assert len(mgr.get("bob").user_history) == 2
+    assert mgr.get("bob").user_history[0].content == "echo 3"
+    assert mgr.get("alice") is not mgr.get("bob")
+    assert mgr.get("alice")._registry is mgr.get("bob")._registry is mgr.registry
+
+
+def test_lru_eviction_keeps_session_count_bounded():
+    mgr = make_manager(max_sessions=3, idle_timeout_seconds=None)
+
+    for i in range(10):
+        mgr.handle_user_text(f"user-{i}", "echo")
+    mgr.get("user-7")  # odświeżenie -> nie wypada jako pierwszy
+    mgr.get("user-new")
+
+    assert len(mgr) == 3
+    assert set(mgr.session_ids()) == {"user-9", "user-7", "user-new"}
+    assert mgr.evicted_lru == 8
+
+
+def test_idle_sessions_are_evicted():
+    clock = FakeClock()
+    mgr = make_manager(idle_timeout_seconds=60, clock=clock)
+
+    mgr.handle_user_text("old", "echo")
+    clock.now = 30
+    mgr.handle_user_text("fresh", "echo")
+    clock.now = 70
+
+    assert mgr.evict_idle() == 1
+    assert "old" not in mgr
+    assert "fresh" in mgr
+
+    clock.now = 1000
+    mgr.get("another")
+    assert mgr.session_ids() == ["another"]
+    assert mgr.evicted_idle == 2
+
+
+def test_async_sessions_and_cli_builder():
+    mgr = build_session_manager(use_llm=False)
+
+    async def run():
+        return await asyncio.gather(
+            mgr.handle_user_text_async("u1", "Jaka będzie pogoda w Warszawa?"),
+            mgr.handle_user_text_async("u2", "Znajdź nocleg w Gdańsku"),
+        )
+
+    r1, r2 = asyncio.run(run())
+    assert r1.sender == "weather"
+    assert r2.sender == "stays"
+    assert len(mgr) == 2
+
+
+def test_sync_and_async_turns_of_one_session_do_not_interleave():
+    active, overlaps = [], []
+
+    class SlowAgent(Agent):
+        def __init__(self):
+            super().__init__(name="slow")
+
+        def handle(self, message: Message) -> Message:
+            active.append(message.content)
+            if len(active) > 1:
+                overlaps.append(list(active))
+            time.sleep(0.05)
+            active.remove(message.content)
+            return Message(sender=self.name, content="ok")
+
+    reg = AgentRegistry()
+    reg.register(SlowAgent())
+    mgr = SessionManager(reg, [RoutingRule("slow", "slow")])
+
+    sync_turn = threading.Thread(target=mgr.handle_user_text, args=("alice", "slow sync"))
+    sync_turn.start()
+    time.sleep(0.01)
+
+    async def run():
+        return await asyncio.gather(*(mgr.handle_user_text_async("alice", f"slow async {i}") for i in range(2)))
+
+    replies = asyncio.run(run())
+    sync_turn.join(5)
+
+    assert [r.content for r in replies] == ["ok", "ok"]
+    assert overlaps == []
+    assert len(mgr.get("alice").user_history) == 6
+
+
+def test_sessions_with_a_turn_in_flight_are_not_evicted():
+    clock = FakeClock()
+    started, release = threading.Event(), threading.Event()
+
+    class BlockingAgent(Agent):
+        def __init__(self):
+            super().__init__(name="block")
+
+        def handle(self, message: Message) -> Message:
+            started.set()
+            release.wait(5)
+            return Message(sender=self.name, content="ok")
+
+    reg = AgentRegistry()
+    reg.register(BlockingAgent())
+    reg.register(EchoAgent())
+    mgr = SessionManager(reg, [RoutingRule("block", "block"), RoutingRule("echo", "echo")],
+                         max_sessions=1, idle_timeout_seconds=60, clock=clock)
+
+    turn = threading.Thread(target=mgr.handle_user_text, args=("alice", "block"))
+    turn.start()
+    assert started.wait(5)
+    alice = mgr.get("alice")
+
+    clock.now = 100  # alice "bezczynna" i najstarsza, ale runda trwa
+    mgr.handle_user_text("bob", "echo")
+    assert mgr.evict_idle() == 0
+    assert mgr.get("alice") is alice
+
+    release.set()
+    turn.join(5)
+    assert len(alice.user_history) == 2
+
+    mgr.handle_user_text("carol", "echo")  # po rundzie alice znów podlega LRU
+    assert "alice" not in mgr and len(mgr) == 1
@@ -0,0 +1,279 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from organizer.core import (
+    CoalescedTool,
+    RateLimitConfig,
+    RateLimiterRegistry,
+    RetryPolicy,
+    SingleFlight,
+    call_tool_with_retry,
+    call_tool_with_trace,
+)
+from organizer.core.tool_runner import call_tool_with_trace_async
+
+
+class BlockingTool:
+    """
+    Narzędzie, które czeka na release — pozwala zebrać równoległe wywołania w locie.
+    """
+    name = "blocking_tool"
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.fail = fail
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return {"city": kwargs["city"]}
+
+
+def _run_concurrently(n, fn, flight, release):
+    results = [None] * n
+
+    def worker(i):
+        results[i] = fn(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    threads[0].start()
+    # wątek 0 musi zostać liderem, zanim wystartują pozostałe
+    give_up = time.monotonic() + 5
+    while flight.in_flight() == 0 and time.monotonic() < give_up:
+        time.sleep(0.001)
+    for t in threads[1:]:
+        t.start()
+    # czekamy, aż wszyscy poza liderem dołączą do wywołania w locie
+    while flight.coalesced < n - 1 and time.monotonic() < give_up:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    tool = BlockingTool()
+
+    def call(i):
+        return call_tool_with_trace(
+            tool_name=tool.name,
+            tool_callable=tool,
+            params={"city": "Kraków"},
+            correlation_id=f"cid-{i}",
+            singleflight=flight,
+        )
+
+    results = _run_concurrently(4, call, flight, tool.release)
+
+    assert tool.calls == 1
+    assert all(r == {"city": "Kraków"} for r, _ in results)
+    traces = [t for _, t in results]
+    assert [t.correlation_id for t in traces] == ["cid-0", "cid-1", "cid-2", "cid-3"]
+    assert [t.meta.get("coalesced", False) for t in traces] == [False, True, True, True]
+    assert all(t.outcome == "success" for t in traces)
+    assert flight.in_flight() == 0
+
+
+def test_followers_get_their_own_error_trace():
+    flight = SingleFlight()
+    tool = BlockingTool(fail=True)
+
+    def call(i):
+        return call_tool_with_trace(
+            tool_name=tool.name, tool_callable=tool, params={"city": "Kraków"}, correlation_id=f"c{i}", singleflight=flight
+        )
+
+    results = _run_concurrently(3, call, flight, tool.release)
+
+    assert tool.calls == 1
+    assert all(r is None and t.outcome == "error" for r, t in results)
+    assert [t.meta.get("coalesced", False) for _, t in results] == [False, True, True]
+    assert all(t.error.message == "provider down" for _, t in results)
+
+
+def test_followers_do_not_take_rate_limit_tokens():
+    flight = SingleFlight()
+    tool = BlockingTool()
+    registry = RateLimiterRegistry({tool.name: RateLimitConfig(rate_per_second=0.1, burst=1.0, max_wait_seconds=0.0)})
+
+    def call(i):
+        return call_tool_with_trace(
+            tool_name=tool.name, tool_callable=tool, params={"city": "Kraków"}, singleflight=flight,
+            rate_limiters=registry,
+        )
+
+    results = _run_concurrently(4, call, flight, tool.release)
+
+    assert all(t.outcome == "success" for _, t in results)  # jeden token na jedno wywołanie providera
+    assert [t.meta.get("queue_wait_ms") for _, t in results] == [0.0, None, None, None]
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+
+    def tool(**kwargs):
+        calls.append(kwargs)
+        return len(calls)
+
+    for _ in range(2):
+        result, traces = call_tool_with_retry(
+            tool_name="t", tool_callable=tool, params={"a": 1}, actor="x", correlation_id="c",
+            policy=RetryPolicy(), singleflight=flight,
+        )
+    assert result == 2
+    assert traces[0].meta == {}
+
+
+def test_coalesced_tool_wrapper_marks_shared_calls():
+    flight = SingleFlight()
+    inner = BlockingTool()
+    tool = CoalescedTool(inner, flight)
+    assert tool.name == "blocking_tool"
+
+    results = _run_concurrently(
+        3,
+        lambda i: call_tool_with_trace(tool_name=tool.name, tool_callable=tool, params={"city": "Gdańsk"}),
+        flight,
+        inner.release,
+    )
+
+    assert inner.calls == 1
+    assert sorted(t.meta.get("coalesced", False) for _, t in results) == [False, True, True]
+
+
+def test_async_calls_are_coalesced_per_loop():
+    flight = SingleFlight()
+    calls = []
+
+    async def tool(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    async def main():
+        return await asyncio.gather(
+            *[
+                call_tool_with_trace_async(
+                    tool_name="async_tool", tool_callable=tool, params={"x": 1}, correlation_id=f"c{i}",
+                    singleflight=flight,
+                )
+                for i in range(3)
+            ]
+        )
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert [t.meta.get("coalesced", False) for _, t in results] == [False, True, True]
+    assert len({t.correlation_id for _, t in results}) == 3
+
+
+def test_async_leader_error_reaches_followers():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("nope")
+
+    async def main():
+        return await asyncio.gather(
+            flight.do_async("k", boom), flight.do_async("k", boom), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+
+    with pytest.raises(ValueError):
+        asyncio.run(flight.do_async("k", boom))
+
+
+def test_sync_followers_get_their_own_exception_copy():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    errors = [None] * 3
+
+    def boom():
+        started.set()
+        release.wait(5)
+        raise ValueError("nope")
+
+    def worker(i):
+        try:
+            flight.do("k", boom)
+        except ValueError as exc:
+            errors[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    give_up = time.monotonic() + 5
+    while flight.coalesced < 2 and time.monotonic() < give_up:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    leader, *followers = errors
+    assert len({id(e) for e in errors}) == 3
+    assert all(type(e) is ValueError and str(e) == "nope" and e.__cause__ is leader for e in followers)
+
+
+def test_cancelled_async_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async("k", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async("k", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == ("ok", True)
+    assert calls == [1]
+    assert flight.in_flight() == 0
+
+
+def test_shared_async_call_is_cancelled_with_its_last_waiter():
+    flight = SingleFlight()
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        waiters = [asyncio.ensure_future(flight.do_async("k", slow)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for w in waiters:
+            w.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cancelled == [1]
+    assert flight.in_flight() == 0
@@ -0,0 +1,106 @@
+from organizer.core import StackTraceStore, ToolError, call_tool_with_trace, stack_trace_of
+from organizer.core.stack_traces import frame_signature
+from organizer.core.task import Task
+from organizer.tools.real.openai_recovery import OpenAIRecoveryTool
+
+
+def _failing_tool(**kwargs):
+    raise ConnectionError(f"provider down for {kwargs.get('city')}")
+
+
+def _other_failing_tool(**kwargs):
+    raise KeyError("missing")
+
+
+def test_identical_failures_share_one_deduplicated_entry():
+    ids = set()
+    for city in ("Kraków", "Gdańsk", "Poznań"):
+        _, trace = call_tool_with_trace(tool_name="p", tool_callable=_failing_tool, params={"city": city})
+        ids.add(trace.error.stack_trace_id)
+        assert trace.error.stack_trace is None  # treść nie podróżuje w ToolError
+
+    assert len(ids) == 1  # komunikat inny, sygnatura ramek ta sama
+
+    store = StackTraceStore()
+    for _ in range(3):
+        try:
+            _failing_tool(city="x")
+        except ConnectionError as exc:
+            store.capture(exc)
+    assert len(store) == 1
+    assert store.captured == 1
+    assert store.deduplicated == 2
+
+
+def test_different_call_sites_get_different_ids():
+    sigs = set()
+    for fn in (_failing_tool, _other_failing_tool):
+        try:
+            fn()
+        except Exception as exc:
+            sigs.add(frame_signature(exc))
+    assert len(sigs) == 2
+
+
+def test_trace_text_is_materialized_on_demand():
+    _, trace = call_tool_with_trace(tool_name="p", tool_callable=_failing_tool, params={"city": "Kraków"})
+
+    text = stack_trace_of(trace.error)
+    assert text is not None
+    assert text.startswith("Traceback (most recent call last)")
+    assert "_failing_tool" in text
+    assert "ConnectionError" in text
+    assert stack_trace_of(trace.error) is text  # drugi odczyt z pamięci podręcznej
+
+
+def test_store_is_bounded():
+    store = StackTraceStore(max_entries=2)
+
+    def raise_at(n):
+        # każda gałąź to inna linia -> inna sygnatura
+        if n == 0:
+            raise ValueError(n)
+        if n == 1:
+            raise ValueError(n)
+        raise ValueError(n)
+
+    ids = []
+    for n in range(3):
+        try:
+            raise_at(n)
+        except ValueError as exc:
+            ids.append(store.capture(exc))
+
+    assert len(store) == 2
+    assert store.evictions == 1
+    assert store.get(ids[0]) is None
+    assert store.get(ids[2]) is not None
+
+
+def test_explicit_stack_trace_wins_over_store():
+    err = ToolError(
+        code="EXCEPTION",
+        type="EXCEPTION",
+        message="x",
+        provider="p",
+        request_params={},
+        raw_response=None,
+        stack_trace_id="unknown",
+        stack_trace="Traceback: explicit",
+    )
+    assert stack_trace_of(err) == "Traceback: explicit"
+    assert stack_trace_of(ToolError(**{**err.__dict__, "stack_trace": None})) is None
+
+
+def test_openai_recovery_receives_materialized_trace():
+    _, trace = call_tool_with_trace(tool_name="p", tool_callable=_failing_tool, params={"city": "Kraków"})
+    seen = {}
+
+    def completion(messages):
+        seen["content"] = messages[-1]["content"]
+        return '{"action":"fail","tool":null,"params":{},"reason":"down"}'
+
+    tool = OpenAIRecoveryTool(completion_fn=completion)
+    task = Task(name="weather_lookup", target="p", inputs={"city": "Kraków"})
+    tool.propose_fix(error=trace.error, last_task=task, last_inputs={"city": "Kraków"})
+    assert "_failing_tool" in seen["content"]
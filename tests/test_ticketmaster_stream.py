@@ -0,0 +1,158 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+from organizer.agents import PlannerAgent
+from organizer.core.preferences import Preferences
+from organizer.core.types import Message
+from organizer.tools.real import ticketmaster
+from organizer.tools.real.http import SharedHttpClient
+from organizer.tools.real.ticketmaster import TicketmasterEventsTool
+
+
+class FixedWeatherTool:
+    name = "fixed_weather"
+
+    def __call__(self, *, location: str, date: str):
+        return {"location": location, "date": date, "summary": "pogodnie", "temp_c": 20, "precip_prob": 10}
+
+
+def _page(page: int, total_pages: int, hours: list[int]) -> dict:
+    events = [
+        {"name": f"Event p{page} {h}:00", "dates": {"start": {"localDate": "2026-01-10", "localTime": f"{h:02d}:00:00"}}}
+        for h in hours
+    ]
+    return {"_embedded": {"events": events}, "page": {"number": page, "totalPages": total_pages}}
+
+
+def _tool(pages: dict[int, dict], requested: list[int], gate: threading.Event | None = None) -> TicketmasterEventsTool:
+    def handler(request):
+        page = int(request.url.params["page"])
+        requested.append(page)
+        assert request.url.params["sort"] == "date,asc"
+        if gate is not None and page > 0:
+            gate.wait(5)
+        return httpx.Response(200, json=pages[page])
+
+    return TicketmasterEventsTool(http=SharedHttpClient(transport=httpx.MockTransport(handler)))
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("TICKETMASTER_API_KEY", "test-key")
+
+
+def test_iter_events_streams_all_pages_in_order():
+    pages = {0: _page(0, 3, [10, 11]), 1: _page(1, 3, [12]), 2: _page(2, 3, [13, 14])}
+    requested: list[int] = []
+
+    events = list(_tool(pages, requested).iter_events(city="Kraków", date="2026-01-10", page_size=2))
+
+    assert [e["start"] for e in events] == ["10:00", "11:00", "12:00", "13:00", "14:00"]
+    assert events[0]["city"] == "Kraków"
+    assert sorted(requested) == [0, 1, 2]
+
+
+def test_early_termination_stops_fetching_pages():
+    pages = {i: _page(i, 10, [10 + i]) for i in range(10)}
+    requested: list[int] = []
+
+    stream = _tool(pages, requested).iter_events(city="Kraków", date="2026-01-10", page_size=1, max_pages=10)
+    first = next(stream)
+    stream.close()
+
+    assert first["start"] == "10:00"
+    assert max(requested) <= 1  # najwyżej prefetch jednej strony do przodu
+
+
+def test_close_before_first_next_cancels_first_page(monkeypatch):
+    # pula zajęta: zadania czekają w kolejce, aż test je "wykona"
+    queued: list[tuple[Future, Callable[..., Any], tuple[Any, ...]]] = []
+
+    def queue(fn, /, *args):
+        fut: Future = Future()
+        queued.append((fut, fn, args))
+        return fut
+
+    monkeypatch.setattr(ticketmaster, "submit", queue)
+    requested: list[int] = []
+
+    stream = _tool({0: _page(0, 1, [10])}, requested).iter_events(city="Kraków", date="2026-01-10")
+    stream.close()
+    for fut, fn, args in queued:
+        if fut.set_running_or_notify_cancel():
+            fut.set_result(fn(*args))
+
+    assert len(queued) == 1 and queued[0][0].cancelled()
+    assert requested == []
+
+
+def test_call_contract_is_unchanged():
+    requested: list[int] = []
+    payload = _tool({0: _page(0, 5, [18, 20])}, requested)(city="Kraków", date="2026-01-10")
+
+    assert payload["source"] == "ticketmaster"
+    assert [e["start"] for e in payload["events"]] == ["18:00", "20:00"]
+    assert requested == [0]  # __call__ pobiera tylko pierwszą stronę
+
+
+def test_planner_stops_pulling_once_plan_is_full():
+    # strona 0 ma dość eventów bez nakładania; kolejne strony nie są potrzebne
+    pages = {0: _page(0, 5, [10, 12, 14, 16]), **{i: _page(i, 5, [20]) for i in range(1, 5)}}
+    requested: list[int] = []
+    gate = threading.Event()  # kolejne strony "wiszą" — planista nie może na nie czekać
+    planner = PlannerAgent(
+        weather_tool=FixedWeatherTool(),
+        events_tool=_tool(pages, requested, gate),
+        preferences=Preferences(max_items=2),
+    )
+
+    assert "events_tool" not in planner.prefetch_plan(Message(sender="user", content="Plan w Krakowie"))
+
+    result = planner.handle(Message(sender="user", content="Ułóż mi plan w Krakowie"))
+    gate.set()
+
+    assert "Event p0 10:00" in result.message.content
+    assert "Event p0 12:00" in result.message.content
+    assert "Event p0 14:00" not in result.message.content
+    stream_event = next(e for e in result.events if e.data.get("streamed"))
+    assert stream_event.target == "ticketmaster_events"
+    assert stream_event.data["events_seen"] == 2
+
+
+def test_planner_closes_stream_when_weather_fails():
+    class Pages:
+        closed = False
+
+        def __iter__(self):
+            return iter([{"title": "Event", "start": "10:00", "indoor": True}])
+
+        def close(self):
+            self.closed = True
+
+    class BrokenWeatherTool:
+        name = "broken_weather"
+
+        def __call__(self, *, location: str, date: str):
+            raise RuntimeError("weather down")
+
+    class StreamingEventsTool:
+        name = "streaming_events"
+        pages = Pages()
+
+        def __call__(self, **kwargs):
+            return {"events": []}
+
+        def iter_events(self, **kwargs):
+            return self.pages
+
+    events_tool = StreamingEventsTool()
+    planner = PlannerAgent(weather_tool=BrokenWeatherTool(), events_tool=events_tool)
+
+    with pytest.raises(RuntimeError, match="weather down"):
+        planner.handle(Message(sender="user", content="Ułóż mi plan w Krakowie"))
+
+    assert events_tool.pages.closed  # prefetch kolejnej strony anulowany mimo wyjątku
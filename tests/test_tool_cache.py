@@ -0,0 +1,162 @@
+import asyncio
+
+from organizer.cli import build_orchestrator
+from organizer.core import CachedTool, ToolResultCache, call_tool_with_retry, call_tool_with_trace, RetryPolicy
+from organizer.core.concurrency import submit
+from organizer.core.deadline import deadline_scope, remaining_seconds
+from organizer.core.tool_cache import canonical_params
+from organizer.core.tool_runner import call_tool_with_trace_async
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingTool:
+    name = "counting_tool"
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        return {"n": self.calls, **kwargs}
+
+
+def test_canonical_params_ignores_kwarg_order():
+    assert canonical_params({"b": 2, "a": 1}) == canonical_params({"a": 1, "b": 2})
+
+
+def test_per_tool_ttl_and_hit_miss_counters():
+    clock = FakeClock()
+    cache = ToolResultCache(default_ttl_seconds=10, clock=clock)
+    tool = CachedTool(CountingTool(), cache, ttl_seconds=5)
+
+    assert tool(city="Kraków", date="2026-01-10")["n"] == 1
+    assert tool(date="2026-01-10", city="Kraków")["n"] == 1  # ten sam klucz
+    assert tool(city="Gdańsk", date="2026-01-10")["n"] == 2
+    clock.now = 5.0
+    assert tool(city="Kraków", date="2026-01-10")["n"] == 3  # TTL narzędzia = 5 s
+
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert cache.ttl_for("counting_tool") == 5
+    assert cache.ttl_for("other") == 10
+
+
+def test_lru_eviction_is_bounded():
+    cache = ToolResultCache(max_entries=2, clock=FakeClock())
+    tool = CachedTool(CountingTool(), cache)
+
+    tool(x=1)
+    tool(x=2)
+    tool(x=1)  # x=1 świeżo użyte -> wyrzucamy x=2
+    tool(x=3)
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert tool(x=1)["n"] == 1
+    assert tool(x=2)["n"] == 4
+
+
+def test_stale_while_revalidate_serves_old_value_and_refreshes_once():
+    clock = FakeClock()
+    pending = []
+    cache = ToolResultCache(
+        default_ttl_seconds=10,
+        stale_seconds=5,
+        clock=clock,
+        submit_fn=lambda fn, *a: pending.append((fn, a)),
+    )
+    inner = CountingTool()
+    tool = CachedTool(inner, cache)
+
+    tool(x=1)
+    clock.now = 12.0
+    assert tool.call_with_status(x=1) == ({"n": 1, "x": 1}, "stale")
+    assert tool.call_with_status(x=1)[1] == "stale"
+    assert len(pending) == 1  # jedno odświeżenie na klucz
+
+    fn, args = pending.pop()
+    fn(*args)
+    assert tool.call_with_status(x=1) == ({"n": 2, "x": 1}, "hit")
+    assert (cache.stale_hits, cache.refreshes) == (2, 1)
+
+    clock.now = 100.0
+    assert tool.call_with_status(x=1)[1] == "miss"
+
+
+def test_background_refresh_does_not_inherit_the_round_deadline():
+    clock = FakeClock()
+    futures = []
+    cache = ToolResultCache(
+        default_ttl_seconds=10, stale_seconds=5, clock=clock, submit_fn=lambda *a: futures.append(submit(*a))
+    )
+    seen = []
+
+    class DeadlineProbe:
+        name = "deadline_probe"
+
+        def __call__(self, **kwargs):
+            seen.append(remaining_seconds())
+            return {"ok": True}
+
+    tool = CachedTool(DeadlineProbe(), cache)
+    tool(x=1)
+    clock.now = 12.0
+    with deadline_scope(0.05):
+        assert tool.call_with_status(x=1)[1] == "stale"
+    futures[0].result(timeout=5)
+
+    assert seen == [None, None]  # odświeżenie nie jest ucinane deadline'em zakończonej rundy
+
+
+def test_errors_are_not_cached():
+    calls = []
+
+    class Flaky:
+        name = "flaky"
+
+        def __call__(self, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return {"ok": True}
+
+    tool = CachedTool(Flaky(), ToolResultCache())
+    _, trace = call_tool_with_trace(tool_name="flaky", tool_callable=tool, params={"a": 1})
+    assert trace.outcome == "error"
+
+    result, trace = call_tool_with_trace(tool_name="flaky", tool_callable=tool, params={"a": 1})
+    assert (result, trace.outcome) == ({"ok": True}, "success")
+
+
+def test_cache_hit_is_distinct_trace_outcome():
+    tool = CachedTool(CountingTool(), ToolResultCache())
+
+    _, first = call_tool_with_trace(tool_name=tool.name, tool_callable=tool, params={"x": 1})
+    result, second = call_tool_with_trace(tool_name=tool.name, tool_callable=tool, params={"x": 1})
+    _, third = asyncio.run(call_tool_with_trace_async(tool_name=tool.name, tool_callable=tool, params={"x": 1}))
+
+    assert (first.outcome, second.outcome, third.outcome) == ("success", "cache_hit", "cache_hit")
+    assert second.succeeded and result["n"] == 1
+
+    # retry traktuje trafienie w cache jako sukces
+    result, traces = call_tool_with_retry(
+        tool_name=tool.name, tool_callable=tool, params={"x": 1}, actor="t", correlation_id="c", policy=RetryPolicy()
+    )
+    assert [t.outcome for t in traces] == ["cache_hit"]
+
+
+def test_build_orchestrator_with_tool_cache_reuses_tool_results():
+    cache = ToolResultCache()
+    orch = build_orchestrator(use_llm=False, tool_cache=cache)
+
+    first = orch.handle_user_text("Jaka pogoda w Krakowie jutro?").content
+    second = orch.handle_user_text("Jaka pogoda w Krakowie jutro?").content
+
+    assert first == second
+    assert cache.hits >= 1